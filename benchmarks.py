@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+
+# Benchmarks for `tables_editor.py`.
+#
+# Run with:
+#
+#       python benchmarks.py [BENCHMARK_NAME ...]
+#
+# where each *BENCHMARK_NAME* is one of the keys of *benchmarks_table* at the end of this file.
+# With no arguments, every benchmark is run.  Each benchmark builds its own synthetic data, so
+# none of them needs the Digi-Key tables to be present.
+#
+# Some benchmarks also check their results and return the number of checks that failed.  The
+# exit status is 1 if any check failed, so the `codec` checks can be run on their own with:
+#
+#       python benchmarks.py codec
+
+# Import some libraries:
+import csv
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import codec
+import lxml.etree as etree
+import tables_editor as te
+
+
+# codec_benchmark():
+def codec_benchmark():
+    """ Check that the *codec* conversions agree with the character at a time conversions they
+        replaced and that they round trip random texts, and then time both over the names of
+        5,000 tables and searches.  Return the number of failed checks.
+    """
+    # Build some random *texts* that lean heavily on the characters that need escaping:
+    random.seed(1)
+    alphabet = "abcXYZ019 _%;&<>!\"#$'()*/=?[]\\`{|}~.,:-+µΩ"
+    texts = ["".join(random.choice(alphabet) for index in range(random.randrange(24)))
+             for text_index in range(20000)]
+
+    # The new conversions must round trip every text and produce the same file names as
+    # before unless a `%` is followed by two hexadecimal digits.  The old conversions could
+    # not decode a title with a `%` in it at all.  (Plain `if` tests are used rather than
+    # `assert`'s so that the checks are still made under `python -O`.):
+    failures_count = 0
+
+    def check(is_ok, check_name, text, result):
+        if not is_ok:
+            print("codec: {0} failed for {1!r} => {2!r}".format(check_name, text, result))
+        return 0 if is_ok else 1
+
+    for text in texts:
+        file_name = codec.title2file_name(text)
+        failures_count += check(codec.file_name2title(file_name) == text,
+                                "file name round trip", text, file_name)
+        if codec.FILE_NAME_PERCENT_RE.search(text) is None:
+            failures_count += check(file_name == legacy_title2file_name(text),
+                                    "legacy file name", text, file_name)
+        if '%' not in text:
+            failures_count += check(legacy_file_name2title(file_name) == text,
+                                    "legacy title", text, file_name)
+        safe_attribute = codec.text2safe_attribute(text)
+        failures_count += check(codec.safe_attribute2text(safe_attribute) == text,
+                                "safe attribute round trip", text, safe_attribute)
+        legacy_safe_attribute = legacy_text2safe_attribute(text)
+        failures_count += check(
+          legacy_safe_attribute.replace("&semi", "&semi;") == safe_attribute,
+          "legacy safe attribute", text, safe_attribute)
+        failures_count += check(codec.safe_attribute2text(legacy_safe_attribute) == text,
+                                "legacy safe attribute decode", text, legacy_safe_attribute)
+
+    # Time the old and the new conversions over a list of *names* that repeats the way path
+    # computations do:
+    names = ["Chip Resistor - Surface Mount {0}, 1/{1}W (0603) [{2}Ω]".
+             format(index, index % 8, index % 5) for index in range(5000)]
+
+    def convert(title2file_name, file_name2title, text2safe_attribute, safe_attribute2text):
+        start_time = time.perf_counter()
+        for repeat in range(4):
+            for name in names:
+                file_name2title(title2file_name(name))
+                safe_attribute2text(text2safe_attribute(name))
+        return time.perf_counter() - start_time
+
+    legacy_time = convert(legacy_title2file_name, legacy_file_name2title,
+                          legacy_text2safe_attribute, legacy_safe_attribute2text)
+    uncached_time = convert(codec.title2file_name.__wrapped__, codec.file_name2title.__wrapped__,
+                            codec.text2safe_attribute.__wrapped__,
+                            codec.safe_attribute2text.__wrapped__)
+    cached_time = convert(codec.title2file_name, codec.file_name2title,
+                          codec.text2safe_attribute, codec.safe_attribute2text)
+    print("codec: {0:.3f}s character at a time, {1:.3f}s uncached, {2:.3f}s memoized".
+          format(legacy_time, uncached_time, cached_time))
+    print("codec: {0} texts checked, {1} failures".format(len(texts), failures_count))
+    return failures_count
+
+
+# legacy_file_name2title():
+def legacy_file_name2title(file_name):
+    """ Return *file_name* converted into a title one character at a time. """
+    characters = list()
+    index = 0
+    file_name_size = len(file_name)
+    while index < file_name_size:
+        character = file_name[index]
+        if character == '_':
+            character = ' '
+            index += 1
+        elif character == '%':
+            character = chr(int(file_name[index+1:index+3], 16))
+            index += 3
+        else:
+            index += 1
+        characters.append(character)
+    return "".join(characters)
+
+
+# legacy_safe_attribute2text():
+def legacy_safe_attribute2text(safe_attribute):
+    """ Return *safe_attribute* converted into text one character at a time. """
+    characters = list()
+    safe_attribute_size = len(safe_attribute)
+    index = 0
+    while index < safe_attribute_size:
+        character = safe_attribute[index]
+        if character == '&':
+            remainder = safe_attribute[index:]
+            for entity, entity_character in (("&amp;", '&'), ("&lt;", '<'), ("&gt;", '>'),
+                                             ("&semi;", ';')):
+                if remainder.startswith(entity):
+                    character = entity_character
+                    index += len(entity)
+                    break
+            else:
+                assert False, "remainder='{0}'".format(remainder)
+        else:
+            index += 1
+        characters.append(character)
+    return "".join(characters)
+
+
+# legacy_text2safe_attribute():
+def legacy_text2safe_attribute(text):
+    """ Return *text* converted into a safe attribute one character at a time. """
+    entities = {'&': "&amp;", '<': "&lt;", '>': "&gt;", ';': "&semi"}
+    return "".join([entities.get(character, character) for character in text])
+
+
+# legacy_title2file_name():
+def legacy_title2file_name(title):
+    """ Return *title* converted into a file name one character at a time. """
+    translate_characters = "!\"#$&'()*/;<=>?[]\\_`{|}~"
+    characters = list()
+    for character in title:
+        if character in translate_characters:
+            character = "%{0:02x}".format(ord(character))
+        elif character == ' ':
+            character = '_'
+        characters.append(character)
+    return "".join(characters)
+
+
+# parameter_specifications_get():
+def parameter_specifications_get():
+    """ Return a list of (*header*, *type*, *enumeration_names*) triples that look like the
+        columns of the generated Digi-Key tables.
+    """
+    parameter_specifications = [
+      ("Datasheets", "URL", None),
+      ("Image", "URL", None),
+      ("Digi-Key Part Number", "String", None),
+      ("Manufacturer Part Number", "String", None),
+      ("Manufacturer", "String", None),
+      ("Description", "String", None),
+      ("Quantity Available", "Integer", None),
+      ("Unit Price (USD)", "Float", None),
+      ("@ qty", "Integer", None),
+      ("Minimum Quantity", "Integer", None),
+      ("Packaging", "enumeration", ["Tape & Reel (TR)", "Cut Tape (CT)", "Digi-Reel", "Bulk"]),
+      ("Series", "String", None),
+      ("Part Status", "enumeration", ["Active", "Obsolete", "Not For New Designs"]),
+      ("Operating Temperature", "Range", None),
+      ("Mounting Type", "enumeration", ["Surface Mount", "Through Hole"]),
+      ("Package / Case", "String", None),
+      ("Supplier Device Package", "String", None),
+      ("Size / Dimension", "String", None),
+      ("Height - Seated (Max)", "IUnits", None),
+      ("Tolerance", "Percent", None),
+      ("Power (Watts)", "IUnits", None),
+      ("Resistance", "IUnits", None),
+      ("Capacitance", "IUnits", None),
+      ("Inductance", "IUnits", None),
+      ("Voltage - Rated", "IUnits", None),
+      ("Current Rating", "IUnits", None),
+      ("Temperature Coefficient", "String", None),
+      ("Composition", "String", None),
+      ("Features", "String", None),
+      ("Ratings", "String", None),
+      ("Number of Terminations", "Integer", None),
+      ("Failure Rate", "String", None),
+    ]
+    for index in range(32):
+        parameter_specifications.append(("Attribute {0}".format(index), "String", None))
+    return parameter_specifications
+
+
+# synthetic_table_texts_get():
+def synthetic_table_texts_get(tables_count, seed=1):
+    """ Return a list of *tables_count* table XML texts that draw their parameters from the
+        same pool of Digi-Key like columns, just like a real catalog does.
+    """
+    # Verify argument types:
+    assert isinstance(tables_count, int) and tables_count >= 1
+
+    # Each table uses a random subset of the common columns:
+    random.seed(seed)
+    parameter_specifications = parameter_specifications_get()
+    table_texts = list()
+    for table_index in range(tables_count):
+        table_name = "Table{0}".format(table_index)
+        lines = [
+          '<?xml version="1.0"?>',
+          '<Table name="{0}" csv_file_name="{0}.csv" title="Table {1}" url="">'.
+          format(table_name, table_index),
+          '  <TableComments>',
+          '    <TableComment language="EN">',
+          '    </TableComment>',
+          '  </TableComments>',
+          '  <Parameters>']
+        columns = sorted(random.sample(range(len(parameter_specifications)), 28))
+        for csv_index, column in enumerate(columns):
+            header, type, enumeration_names = parameter_specifications[column]
+            name = "".join([word.capitalize() for word in header.split()
+                            if word.isalnum()]) or "Parameter{0}".format(column)
+            lines.append('    <Parameter name="{0}" type="{1}" csv="{2}" csv_index="{3}">'.
+                         format(name, type, te.XMLWriter.attribute_escape(header), csv_index))
+            lines.append('      <ParameterComments>')
+            lines.append('        <ParameterComment language="EN" longHeading="{0}">'.
+                         format(name))
+            lines.append('        </ParameterComment>')
+            lines.append('      </ParameterComments>')
+            if enumeration_names is not None:
+                lines.append('      <Enumerations>')
+                for enumeration_name in enumeration_names:
+                    lines.append('        <Enumeration name="{0}">'.
+                                 format(te.XMLWriter.attribute_escape(enumeration_name)))
+                    lines.append('          <EnumerationComment language="EN">')
+                    lines.append('          </EnumerationComment>')
+                    lines.append('        </Enumeration>')
+                lines.append('      </Enumerations>')
+            lines.append('    </Parameter>')
+        lines.append('  </Parameters>')
+        lines.append('</Table>')
+        table_texts.append("\n".join(lines) + "\n")
+    return table_texts
+
+
+# legacy_object_copy():
+def legacy_object_copy(value, legacy_classes):
+    """ Return a copy of *value* (recursing into lists) where each object with `__slots__` is
+        replaced by an instance of a plain class of the same name that keeps its attributes in
+        a per-instance `__dict__`, the way every model class did before it was given
+        `__slots__`.  *legacy_classes* maps each slotted class to its plain class.
+    """
+    # Verify argument types:
+    assert isinstance(legacy_classes, dict)
+
+    # Only lists and slotted objects need copying:
+    if isinstance(value, list):
+        return [legacy_object_copy(item, legacy_classes) for item in value]
+    value_class = type(value)
+    slot_names = [slot_name for mro_class in value_class.__mro__
+                  for slot_name in getattr(mro_class, "__slots__", ())]
+    if isinstance(value, str) or len(slot_names) == 0:
+        return value
+
+    # One plain class per slotted class keeps the instance dictionaries key sharing:
+    legacy_class = legacy_classes.get(value_class)
+    if legacy_class is None:
+        legacy_class = type(value_class.__name__, (), dict())
+        legacy_classes[value_class] = legacy_class
+    legacy_object = legacy_class()
+    for slot_name in slot_names:
+        if hasattr(value, slot_name):
+            setattr(legacy_object, slot_name,
+                    legacy_object_copy(getattr(value, slot_name), legacy_classes))
+    return legacy_object
+
+
+# memory_benchmark():
+def memory_benchmark():
+    """ Report the number of bytes that each fully loaded *Table* occupies in a synthetic
+        5,000 table catalog, both as the tables are now and as they were before the model
+        classes had `__slots__` and repeated strings were interned.
+    """
+    # Build the XML texts before any memory is traced:
+    tables_count = 5000
+    table_texts = synthetic_table_texts_get(tables_count)
+
+    # Parse every table and measure the memory that stays allocated afterwards.  The legacy
+    # layout is measured first (with *value_intern* turned off and the comments and parameters
+    # copied into dict backed objects), so that none of its strings are interned:
+    def tables_measure(is_legacy):
+        legacy_classes = dict()
+        gc.collect()
+        tracemalloc.start()
+        tables = list()
+        for table_index, table_text in enumerate(table_texts):
+            table_tree = etree.fromstring(table_text.encode("utf-8"))
+            file_name = "/tmp/Table{0}.xml".format(table_index)
+            table = te.Table(file_name=file_name, table_tree=table_tree, csv_file_name="")
+            if is_legacy:
+                table.comments = legacy_object_copy(table.comments, legacy_classes)
+                table.parameters = legacy_object_copy(table.parameters, legacy_classes)
+            tables.append(table)
+            del table_tree
+        gc.collect()
+        traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        parameters_count = sum([len(table.parameters) for table in tables])
+        return traced_bytes, parameters_count
+
+    value_intern = te.value_intern
+    te.value_intern = lambda value: value
+    try:
+        legacy_bytes, parameters_count = tables_measure(True)
+    finally:
+        te.value_intern = value_intern
+    traced_bytes, parameters_count = tables_measure(False)
+
+    print("memory: {0} tables, {1} parameters, {2:.0f} bytes per table before "
+          "(dict backed and not interned), {3:.0f} bytes per table now, {4:.1f}MB in total".
+          format(tables_count, parameters_count, legacy_bytes / tables_count,
+                 traced_bytes / tables_count, traced_bytes / (1024 * 1024)))
+
+
+# quick_find_benchmark():
+def quick_find_benchmark():
+    """ Time each keystroke of typing a title into the quick find box of a 5,000 table
+        collection.
+    """
+    # Make up titles from Digi-Key like words:
+    random.seed(1)
+    words = ["Chip", "Resistors", "Surface", "Mount", "Through", "Hole", "Ceramic", "Capacitors",
+             "Film", "Aluminum", "Electrolytic", "Tantalum", "Fixed", "Inductors", "Ferrite",
+             "Beads", "Crystals", "Oscillators", "Diodes", "Rectifiers", "Single", "Arrays",
+             "Transistors", "FETs", "MOSFETs", "Bipolar", "BJT", "Connectors", "Headers", "Pins"]
+    titles = list()
+    for index in range(5000):
+        title = " ".join(random.sample(words, 3)) + " - {0}".format(index)
+        titles.append(("/tables/Table{0}.xml".format(index), title, True))
+
+    # Build the index and type one character at a time:
+    start_time = time.perf_counter()
+    title_index = te.TitleIndex(titles)
+    build_time = time.perf_counter() - start_time
+    text = "ceramic capacitors surface"
+    keystroke_times = list()
+    for size in range(1, len(text) + 1):
+        start_time = time.perf_counter()
+        matches = title_index.find(text[:size])
+        keystroke_times.append(time.perf_counter() - start_time)
+    print("quick_find: {0} titles, {1:.1f}ms to build, {2:.2f}ms worst keystroke, {3} matches".
+          format(len(titles), build_time * 1000, max(keystroke_times) * 1000, len(matches)))
+
+
+# results_estimate_benchmark():
+def results_estimate_benchmark():
+    """ Check that the sampled result count estimate applies the search query and the filters
+        exactly like the full count does, and time both on a 100,000 row CSV file.  Return the
+        number of failed checks.
+    """
+    # Build a small table whose parameters are the columns of a synthetic CSV file:
+    parameter_lines = list()
+    for csv_index, (name, type) in enumerate(
+      (("Resistance", "IUnits"), ("PackageCase", "String"), ("Manufacturer", "String"))):
+        parameter_lines.append(
+          '<Parameter name="{0}" type="{1}" csv="{0}" csv_index="{2}"><ParameterComments>'
+          '<ParameterComment language="EN" longHeading="{0}">\n</ParameterComment>'
+          '</ParameterComments>'
+          '</Parameter>'.format(name, type, csv_index))
+    table_tree = etree.fromstring(
+      '<Table name="Resistors" csv_file_name="" title="Resistors" url="">'
+      '<TableComments><TableComment language="EN">\n</TableComment></TableComments>'
+      '<Parameters>{0}</Parameters></Table>'.format("".join(parameter_lines)))
+    table = te.Table(file_name="/tmp/Resistors.xml", table_tree=table_tree, csv_file_name="")
+    random.seed(1)
+    rows = [["Resistance", "PackageCase", "Manufacturer"]]
+    for row_index in range(100000):
+        rows.append([random.choice(["10", "1k", "4.7k", "10k", "100k", "1M", "-"]),
+                     random.choice(["0402", "0603", "0805", "1206"]),
+                     random.choice(["Yageo", "Vishay Dale", "Panasonic"])])
+
+    # The *TablesEditor* results methods only need a handful of attributes, so they are borrowed
+    # by a stand in class rather than building the whole user interface:
+    class ResultsEditor:
+        results_query_indexes_get = te.TablesEditor.results_query_indexes_get
+        results_row_ids_get = te.TablesEditor.results_row_ids_get
+        results_rows_load = te.TablesEditor.results_rows_load
+        results_sample_matches_count = te.TablesEditor.results_sample_matches_count
+
+    temporary_directory = tempfile.mkdtemp()
+    failures_count = 0
+    try:
+        csv_file_name = os.path.join(temporary_directory, "download.csv")
+        with open(csv_file_name, "w", newline="") as csv_file:
+            csv.writer(csv_file).writerows(rows)
+        results_editor = ResultsEditor()
+        results_editor.results_cache = te.ResultsCache(os.path.join(temporary_directory, "rc"))
+        results_editor.results_csv_file_name = csv_file_name
+        results_editor.results_csv_mtime = None
+        results_editor.results_query_indexes = None
+        results_editor.results_rows_load()
+
+        # With the whole table as the sample, the estimate must be the exact count:
+        search = te.Search(name="@ALL", comments=[te.SearchComment(language="EN", lines=list())],
+                           table=table, parent_name="", url="")
+        search.filters_refresh()
+        search.filters[2].use = True
+        search.filters[2].select = "Yageo|Panasonic"
+        for query_text in ("", "Resistance in 1k..10k", 'PackageCase = "0603"'):
+            search.query_set(query_text)
+            sample_row_ids = results_editor.results_sample_row_ids
+            results_editor.results_sample_row_ids = list(range(1, len(rows)))
+            start_time = time.perf_counter()
+            exact_count = len(results_editor.results_row_ids_get(search, cache_store=False))
+            exact_time = time.perf_counter() - start_time
+            whole_count = results_editor.results_sample_matches_count(search)
+            results_editor.results_sample_row_ids = sample_row_ids
+            start_time = time.perf_counter()
+            sample_count = results_editor.results_sample_matches_count(search)
+            sample_time = time.perf_counter() - start_time
+            if whole_count != exact_count:
+                print("results_estimate: {0!r} estimated {1} but matched {2}".
+                      format(query_text, whole_count, exact_count))
+                failures_count += 1
+            print("results_estimate: {0!r} {1} matches in {2:.1f}ms, "
+                  "about {3} from {4} sampled rows in {5:.1f}ms".
+                  format(query_text, exact_count, exact_time * 1000,
+                         round(sample_count * (len(rows) - 1) / len(sample_row_ids)),
+                         len(sample_row_ids), sample_time * 1000))
+    finally:
+        shutil.rmtree(temporary_directory)
+    return failures_count
+
+
+# search_sort_benchmark():
+def search_sort_benchmark():
+    """ Check the order that *Table.fix_up*() gives searches with ISO unit names and time it
+        on 2,000 searches in templates nested 50 deep against a key that walks the parent chain
+        and reparses the name every time.
+    """
+    table_tree = etree.fromstring(synthetic_table_texts_get(1)[0].encode("utf-8"))
+    table = te.Table(file_name="/tmp/Table0.xml", table_tree=table_tree, csv_file_name="")
+
+    def search_create(name, parent_name):
+        comments = [te.SearchComment(language="EN", lines=list())]
+        return te.Search(name=name, comments=comments, table=table,
+                         parent_name=parent_name, url="")
+
+    # Searches that are named by a value are sorted by the value (including equal values):
+    search_create("@ALL", "")
+    names = ["10uF", ".3nF", "10nF", "1pF", "Other", ".01pF", "300pF", "100nF", ".1uF", "4.7kF"]
+    for name in names:
+        search_create(name, "@ALL")
+    table.fix_up()
+    sorted_names = [search.name for search in table.children]
+    assert sorted_names == ["@ALL", "Other", ".01pF", "1pF", ".3nF", "300pF", "10nF", "100nF",
+                            ".1uF", "10uF", "4.7kF"], sorted_names
+
+    # Build 40 template chains that are 50 deep, each with a value search at the bottom:
+    del table.children[:]
+    search_create("@ALL", "")
+    for chain_index in range(40):
+        parent_name = "@ALL"
+        for depth in range(49):
+            template_name = "@T{0}_{1}".format(chain_index, depth)
+            search_create(template_name, parent_name)
+            parent_name = template_name
+        search_create("{0}nF".format(chain_index), parent_name)
+    table.fix_up()
+    searches = table.children
+
+    def chain_key(search):
+        depth = 0
+        nested_search = search
+        while nested_search.search_parent is not None:
+            depth += 1
+            nested_search = nested_search.search_parent
+        return (depth,) + te.Search.name2number_rest(search.name)
+
+    before_time = time.perf_counter()
+    for repeat in range(10):
+        sorted(searches, key=chain_key)
+    after_time = time.perf_counter()
+    for repeat in range(10):
+        table.fix_up()
+    end_time = time.perf_counter()
+    print("search_sort: {0} searches, {1:.3f}s with parent walks, {2:.3f}s with fix_up".
+          format(len(searches), after_time - before_time, end_time - after_time))
+
+
+# synthetic_tree_create():
+def synthetic_tree_create(root_path, directories_count=20, sub_directories_count=10,
+                          tables_count=20):
+    """ Create a two level tree of directories below *root_path* where each leaf directory
+        holds *tables_count* small table files along with their `.csv` files.
+    """
+    # Verify argument types:
+    assert isinstance(root_path, str)
+
+    table_text = ('<?xml version="1.0"?>\n<Table name="T" csv_file_name="T.csv" title="T" url="">'
+                  '\n  <TableComments>\n  </TableComments>\n  <Parameters>\n  </Parameters>'
+                  '\n</Table>\n')
+    for directory_index in range(directories_count):
+        for sub_directory_index in range(sub_directories_count):
+            path = os.path.join(root_path, "Directory_{0}".format(directory_index),
+                                "Sub_Directory_{0}".format(sub_directory_index))
+            os.makedirs(path)
+            for table_index in range(tables_count):
+                base_name = os.path.join(path, "Table_{0}".format(table_index))
+                with open(base_name + ".xml", "w") as table_file:
+                    table_file.write(table_text)
+                with open(base_name + ".csv", "w") as csv_file:
+                    csv_file.write("")
+
+
+# system_calls_count():
+def system_calls_count(function, *arguments):
+    """ Return the number of *os.stat*(), *os.listdir*() and *os.scandir*() calls made while
+        running *function*(**arguments*).
+    """
+    counts = [0]
+    originals = dict()
+
+    def counted(name):
+        original = getattr(os, name)
+        originals[name] = original
+
+        def counted_function(*arguments, **keywords):
+            counts[0] += 1
+            return original(*arguments, **keywords)
+        return counted_function
+
+    for name in ("stat", "listdir", "scandir"):
+        setattr(os, name, counted(name))
+    try:
+        function(*arguments)
+    finally:
+        for name, original in originals.items():
+            setattr(os, name, original)
+    return counts[0]
+
+
+# tree_expand():
+def tree_expand(root_path):
+    """ Expand every *Directory* below *root_path* the way *TreeModel.fetchMore*() does. """
+    te.DirectorySnapshot.snapshots.clear()
+    pending_directories = [te.Directory("Root", root_path, "Root")]
+    while len(pending_directories) >= 1:
+        directory = pending_directories.pop()
+        for node in directory.children_scan():
+            if isinstance(node, te.Directory):
+                pending_directories.append(node)
+
+
+# tree_expand_listdir():
+def tree_expand_listdir(root_path):
+    """ Make the directory system calls that *Node.__init__*() and *TreeModel.fetchMore*()
+        made before *DirectorySnapshot* existed (i.e. *os.path.isdir*() plus *os.listdir*() to
+        create a node, and then *os.listdir*() plus *os.path.isdir*() per entry to expand it).
+    """
+    os.path.isdir(root_path) and os.listdir(root_path)
+    pending_paths = [root_path]
+    while len(pending_paths) >= 1:
+        path = pending_paths.pop()
+        for file_name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, file_name)
+            if file_path.endswith(".xml"):
+                te.Table.header_tree_get(file_path)
+            elif os.path.isdir(file_path):
+                os.path.isdir(file_path) and os.listdir(file_path)
+                pending_paths.append(file_path)
+
+
+# system_calls_benchmark():
+def system_calls_benchmark():
+    """ Count the directory system calls needed to expand a synthetic tree of 200 directories
+        holding 4,000 tables with and without *DirectorySnapshot*.
+    """
+    root_path = tempfile.mkdtemp(prefix="tables_benchmark_")
+    try:
+        synthetic_tree_create(root_path)
+        before_count = system_calls_count(tree_expand_listdir, root_path)
+        after_count = system_calls_count(tree_expand, root_path)
+        print("system_calls: {0} without snapshots, {1} with snapshots".
+              format(before_count, after_count))
+    finally:
+        shutil.rmtree(root_path)
+
+
+# tree_scroll_benchmark():
+def tree_scroll_benchmark():
+    """ Time the *Node.row*() lookups that Qt makes while a 40 row window is scrolled over a
+        directory with 1,000 children, and compare them to a *list.index*() scan.
+    """
+    # Build a *root* node with one *directory* node that holds 1,000 *children*:
+    root = te.Node("Root", "")
+    directory = te.Node("Directory", "", parent=root)
+    children = [te.Node("Child {0}".format(index), "") for index in range(1000)]
+    directory.children_insert(0, children)
+
+    # Each scroll step asks for the index of each visible row and then for its parent:
+    def scroll(row_get):
+        for step in range(len(children) - 40):
+            for row in range(step, step + 40):
+                child = directory.child(row)
+                assert row_get(child) == row
+                row_get(child.parent)
+
+    before_time = time.perf_counter()
+    scroll(lambda node: 0 if node.parent is None else node.parent.children.index(node))
+    after_time = time.perf_counter()
+    scroll(te.Node.row)
+    end_time = time.perf_counter()
+    print("tree_scroll: {0:.3f}s with list scans, {1:.3f}s with positions".
+          format(after_time - before_time, end_time - after_time))
+
+
+# main():
+def main():
+    # Run each requested benchmark (or all of them).  A benchmark that checks its results
+    # returns the number of failed checks and the others return *None*:
+    benchmark_names = sys.argv[1:]
+    if len(benchmark_names) == 0:
+        benchmark_names = sorted(benchmarks_table.keys())
+    failures_count = 0
+    for benchmark_name in benchmark_names:
+        assert benchmark_name in benchmarks_table, (
+          "'{0}' is not one of {1}".format(benchmark_name, sorted(benchmarks_table.keys())))
+        benchmark_failures_count = benchmarks_table[benchmark_name]()
+        if benchmark_failures_count is not None:
+            failures_count += benchmark_failures_count
+    return 0 if failures_count == 0 else 1
+
+
+benchmarks_table = {
+  "codec": codec_benchmark,
+  "memory": memory_benchmark,
+  "quick_find": quick_find_benchmark,
+  "results_estimate": results_estimate_benchmark,
+  "search_sort": search_sort_benchmark,
+  "system_calls": system_calls_benchmark,
+  "tree_scroll": tree_scroll_benchmark,
+}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+#<-------------------------------------------- 100 characters ------------------------------------>|
+
+# Conversions between titles and file names and between text and "safe" XML attribute values.
+#
+# These conversions are performed for every node, table and search name whenever a path is
+# computed, so rather than sweeping one character at a time, each one runs a `str.replace`() for
+# each translation table entry that actually occurs (which is only a handful in a real name) and
+# falls back to a precompiled regular expression for the rare cases.  The results for recently
+# seen names are memoized.
+#
+# The coding standards are the same as `tables_editor.py`.  Lint with:
+#
+#       flake8 --max-line-length=100 codec.py | fgrep -v :3:1:
+
+# Import some libraries:
+import re
+from functools import lru_cache
+
+# The number of recent names remembered by each conversion:
+CACHE_SIZE = 16384
+
+# Title characters that are replaced by `%XX` in a file name.  A space becomes an underscore, so
+# an underscore is always `%5f` in a file name.  A `%` is left alone unless it could be mistaken
+# for a `%XX` escape, which keeps the file names of existing titles unchanged:
+FILE_NAME_CHARACTERS = "!\"#$&'()*/;<=>?[]\\_`{|}~"
+FILE_NAME_TRANSLATE_TABLE = tuple([(character, "%{0:02x}".format(ord(character)))
+                                   for character in FILE_NAME_CHARACTERS])
+FILE_NAME_PERCENT_RE = re.compile(r"%(?=[0-9a-fA-F]{2})")
+FILE_NAME_ESCAPE_RE = re.compile(r"%([0-9a-fA-F]{2})")
+
+# Text characters that are replaced by an entity in a safe attribute.  A `;` becomes `&semi;`,
+# but it is handled separately since every entity ends with one.  Older versions wrote `&semi`
+# without the trailing `;`, so both spellings are accepted when decoding:
+SAFE_ATTRIBUTE_TRANSLATE_TABLE = (('&', "&amp;"), ('<', "&lt;"), ('>', "&gt;"))
+SAFE_ATTRIBUTE_ENTITY_RE = re.compile(r"&(amp;|lt;|gt;|semi;?)?")
+SAFE_ATTRIBUTE_ENTITIES = {"amp;": '&', "lt;": '<', "gt;": '>', "semi;": ';', "semi": ';'}
+
+
+# file_name2title():
+@lru_cache(maxsize=CACHE_SIZE)
+def file_name2title(file_name):
+    """ Return the title that *file_name* was made from by *title2file_name*(). """
+    # Verify argument types:
+    assert isinstance(file_name, str)
+
+    # Underscores are always spaces:
+    title = file_name.replace('_', ' ')
+
+    # Each `%XX` is a single character.  Decoding never produces a hexadecimal digit, so the
+    # translation table entries can be undone one at a time.  Whatever is left over (an escaped
+    # `%` or an escape written by hand) is decoded by *FILE_NAME_ESCAPE_RE*:
+    if '%' in title:
+        for character, escape in FILE_NAME_TRANSLATE_TABLE:
+            if escape in title:
+                title = title.replace(escape, character)
+        if '%' in title:
+            title = FILE_NAME_ESCAPE_RE.sub(lambda match: chr(int(match.group(1), 16)), title)
+    return title
+
+
+# safe_attribute2text():
+@lru_cache(maxsize=CACHE_SIZE)
+def safe_attribute2text(safe_attribute):
+    """ Return the text that *safe_attribute* was made from by *text2safe_attribute*(). """
+    # Verify argument types:
+    assert isinstance(safe_attribute, str)
+
+    # Only an `&` starts an entity:
+    text = safe_attribute
+    if '&' in text:
+        text = SAFE_ATTRIBUTE_ENTITY_RE.sub(safe_attribute_entity_decode, text)
+    return text
+
+
+# safe_attribute_entity_decode():
+def safe_attribute_entity_decode(match):
+    """ Return the character for the entity in *match* from *SAFE_ATTRIBUTE_ENTITY_RE*. """
+    entity = match.group(1)
+    assert entity is not None, "remainder='{0}'".format(match.string[match.start():])
+    return SAFE_ATTRIBUTE_ENTITIES[entity]
+
+
+# text2safe_attribute():
+@lru_cache(maxsize=CACHE_SIZE)
+def text2safe_attribute(text):
+    """ Return *text* with each `&`, `<`, `>` and `;` replaced by an entity. """
+    # Verify argument types:
+    assert isinstance(text, str)
+
+    # Each entity ends with a `;`, so the text is split at its `;`'s before any entity is added.
+    # The `&` entry is first, so no entity is escaped a second time:
+    safe_pieces = list()
+    for piece in text.split(';'):
+        for character, entity in SAFE_ATTRIBUTE_TRANSLATE_TABLE:
+            if character in piece:
+                piece = piece.replace(character, entity)
+        safe_pieces.append(piece)
+    safe_attribute = "&semi;".join(safe_pieces)
+    return safe_attribute
+
+
+# title2file_name():
+@lru_cache(maxsize=CACHE_SIZE)
+def title2file_name(title):
+    """ Return a file name for *title* that *file_name2title*() converts back into *title*. """
+    # Verify argument types:
+    assert isinstance(title, str)
+
+    # Only a `%` that is followed by two hexadecimal digits needs to be escaped itself.  It is
+    # done first since the translation table entries introduce new `%`'s:
+    file_name = title
+    if '%' in file_name:
+        file_name = FILE_NAME_PERCENT_RE.sub("%25", file_name)
+    for character, escape in FILE_NAME_TRANSLATE_TABLE:
+        if character in file_name:
+            file_name = file_name.replace(character, escape)
+    return file_name.replace(' ', '_')
@@ -62,6 +62,17 @@ class Digikey:
         digikey.directories_create(root_directory)
         root_directory.csv_read_and_process(digikey.csvs_directory, bind=True)
 
+        # Build the catalog wide trigram index over the string columns of every table:
+        tables = list()
+        root_directory.tables_append(tables)
+        te.TrigramIndex.build(tables, digikey.csvs_directory,
+                              te.TablesEditor.trigram_index_file_name_get())
+
+        # Bring the catalog up to date with the tables that were just (re)written:
+        catalog = te.Catalog(te.TablesEditor.catalog_file_name_get())
+        catalog.directory_sync(digikey.tables_directory)
+        catalog.close()
+
     # Digikey.directories_create():
     def directories_create(self, directory):
         assert isinstance(directory, DigikeyDirectory)
@@ -586,12 +597,26 @@ class DigikeyDirectory(te.Directory):
     def sort(self):
         digikey_directory = self
         digikey_directory.children.sort(key=lambda table: table.title)
+        digikey_directory.children_renumber()
 
     # DigikeyDirectory.table_get():
     def table_get(self):
         digikey_directory = self
         return digikey_directory.file_name2title()
 
+    # DigikeyDirectory.tables_append():
+    def tables_append(self, tables):
+        # Verify argument types:
+        assert isinstance(tables, list)
+
+        # Recursively append every *DigikeyTable* in *digikey_directory* (i.e. *self*) to *tables*:
+        digikey_directory = self
+        for sub_node in digikey_directory.children:
+            if isinstance(sub_node, DigikeyDirectory):
+                sub_node.tables_append(tables)
+            elif isinstance(sub_node, DigikeyTable):
+                tables.append(sub_node)
+
 
 class DigikeyTable(te.Table):
     # DigikeyTable.__init__():
@@ -681,11 +706,12 @@ class DigikeyTable(te.Table):
         # table = self
         # file_name = table.file_name
         # assert False, "file_name='{0}'".format(file_name)
-        super().save(tracing=next_tracing)
+        written = super().save(tracing=next_tracing)
 
         # Wrap any requested *tracing*:
         if tracing is not None:
             print("{0}DigikeyTable.save(*)".format(tracing))
+        return written
 
     # DigikeyTable.title_get():
     def title_get(self):
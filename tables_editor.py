@@ -41,82 +41,41 @@
 
 # Import some libraries:
 import re
+import bisect
+import codec
+import concurrent.futures
 import csv
+import hashlib
+import heapq
+import io
+import json
+import mmap
 import os
+import pickle
+import random
+import sqlite3
+import stat
+import struct
 import sys
+import tempfile
+import time
 import pyperclip
 import webbrowser
 # import xmlschema
 import lxml.etree as etree
-import copy  # Is this used any more?
+from array import array
+from fractions import Fraction
 from functools import partial
 from PySide2.QtUiTools import QUiLoader
 from PySide2.QtWidgets import (QApplication, QComboBox, QLineEdit, QMainWindow,
-                               QPlainTextEdit, QPushButton,
+                               QPlainTextEdit, QPushButton, QStyledItemDelegate,
                                QTableWidget, QTableWidgetItem,
                                QTreeView, QFileSystemModel,
                                # QTreeWidget, QTreeWidgetItem,
                                QWidget)
 # from PySide2.QtCore import (SelectionFlag, )
-from PySide2.QtCore import (QAbstractItemModel, QDir, QFile, QItemSelectionModel, QModelIndex, Qt)
-
-
-def text2safe_attribute(text):
-    # Verify argument types:
-    assert isinstance(text, str)
-
-    # Sweep across *text* one *character* at a time performing any neccesary conversions:
-    new_characters = list()
-    for character in text:
-        new_character = character
-        if character == '&':
-            new_character = "&amp;"
-        elif character == '<':
-            new_character = "&lt;"
-        elif character == '>':
-            new_character = "&gt;"
-        elif character == ';':
-            new_character = "&semi"
-        new_characters.append(new_character)
-    safe_attribute = "".join(new_characters)
-    return safe_attribute
-
-
-def safe_attribute2text(safe_attribute):
-    # Verify argument types:
-    assert isinstance(safe_attribute, str)
-
-    # Sweep across *safe_attribute* one *character* at a time performing any neccesary conversions:
-    # print("safe_attribute='{0}'".format(safe_attribute))
-    new_characters = list()
-    safe_attribute_size = len(safe_attribute)
-    character_index = 0
-    while character_index < safe_attribute_size:
-        character = safe_attribute[character_index]
-        # print("character[{0}]='{1}'".format(character_index, character))
-        new_character = character
-        if character == '&':
-            remainder = safe_attribute[character_index:]
-            # print("remainder='{0}'".format(remainder))
-            if remainder.startswith("&amp;"):
-                new_character = '&'
-                character_index += 5
-            elif remainder.startswith("&lt;"):
-                new_character = '<'
-                character_index += 4
-            elif remainder.startswith("&gt;"):
-                new_character = '>'
-                character_index += 4
-            elif remainder.startswith("&semi;"):
-                new_character = ';'
-                character_index += 6
-            else:
-                assert False, "remainder='{0}'".format(remainder)
-        else:
-            character_index += 1
-        new_characters.append(new_character)
-    text = "".join(new_characters)
-    return text
+from PySide2.QtCore import (QAbstractItemModel, QDir, QFile, QFileSystemWatcher,
+                            QItemSelectionModel, QModelIndex, Qt, QTimer)
 
 
 def name2file_name(name):
@@ -133,6 +92,569 @@ def file_name2name(file_name):
     return file_name
 
 
+# *file_stream_replace*() compares files this many bytes at a time:
+FILE_COMPARE_CHUNK_SIZE = 65536
+
+
+def file_text_replace(file_name, text):
+    """ Replace the contents of *file_name* with *text* and return *True*.  Nothing is written
+        and *False* is returned when *file_name* already contains exactly *text*.  The new
+        contents are written to a temporary file in the same directory that is then renamed
+        over *file_name*, so a reader never sees a partially written file.
+    """
+    # Verify argument types:
+    assert isinstance(file_name, str)
+    assert isinstance(text, str)
+
+    # Skip the write when *file_name* already holds *content*.  A size mismatch is detected
+    # without reading the file at all:
+    content = text.encode()
+    file_mode = 0o644
+    if os.path.isfile(file_name):
+        file_stat = os.stat(file_name)
+        file_mode = file_stat.st_mode & 0o777
+        if file_stat.st_size == len(content):
+            with open(file_name, "rb") as old_file:
+                if old_file.read() == content:
+                    return False
+
+    # Write *content* into a temporary file next to *file_name* and rename it into place:
+    directory = os.path.dirname(os.path.abspath(file_name))
+    temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(
+        dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(temporary_file_descriptor, "wb") as temporary_file:
+            temporary_file.write(content)
+        os.chmod(temporary_file_name, file_mode)
+        os.replace(temporary_file_name, file_name)
+    except BaseException:
+        os.unlink(temporary_file_name)
+        raise
+    return True
+
+
+def file_stream_replace(file_name, file_write):
+    """ Replace the contents of *file_name* with the text that *file_write*(*output_file*)
+        writes to *output_file* and return *True*.  Like *file_text_replace*(), *False* is
+        returned (and *file_name* is left alone) when the contents would not change.  The text
+        is streamed into a temporary file in the same directory and compared with *file_name*
+        a chunk at a time, so the text is never held in memory all at once.
+    """
+    # Verify argument types:
+    assert isinstance(file_name, str)
+    assert callable(file_write)
+
+    # Stream the new contents into a temporary file next to *file_name*:
+    directory = os.path.dirname(os.path.abspath(file_name))
+    temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(
+        dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(temporary_file_descriptor, "w",
+                       encoding="utf-8", newline="") as temporary_file:
+            file_write(temporary_file)
+
+        # Discard the temporary file if *file_name* already holds the same bytes.  A size
+        # mismatch is detected without reading either file:
+        file_mode = 0o644
+        if os.path.isfile(file_name):
+            file_stat = os.stat(file_name)
+            file_mode = file_stat.st_mode & 0o777
+            if file_stat.st_size == os.stat(temporary_file_name).st_size:
+                with open(file_name, "rb") as old_file, \
+                  open(temporary_file_name, "rb") as new_file:
+                    while True:
+                        old_chunk = old_file.read(FILE_COMPARE_CHUNK_SIZE)
+                        if old_chunk != new_file.read(FILE_COMPARE_CHUNK_SIZE):
+                            break
+                        if old_chunk == b"":
+                            os.unlink(temporary_file_name)
+                            return False
+
+        # Rename the temporary file into place:
+        os.chmod(temporary_file_name, file_mode)
+        os.replace(temporary_file_name, file_name)
+    except BaseException:
+        os.unlink(temporary_file_name)
+        raise
+    return True
+
+
+# *structure_generation* is replaced every time a *Comment*, *Enumeration*, *Parameter* or
+# *Table* is marked dirty.  Since children do not point back at their parents, the cached
+# structural hash of an aggregate object is only trusted while its generation *is* the current
+# one.  (An identity check also means that a hash pickled by another process is never trusted.)
+structure_generation = object()
+
+
+def structure_changed():
+    """ Invalidate every cached structural hash. """
+    global structure_generation
+    structure_generation = object()
+
+
+def values2fingerprint(values):
+    """ Return a short digest of *values*, a tuple of strings, numbers, booleans, *None*, other
+        fingerprints, and lists or tuples of those.  Equal *values* give equal fingerprints.
+    """
+    # Verify argument types:
+    assert isinstance(values, tuple)
+
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).digest()
+
+
+def value_intern(value):
+    """ Return *value* with any string replaced by its interned copy.
+
+        The same few strings (types like "String", the language "EN", parameter names and
+        headings) recur thousands of times across the tables, and every XML parse or CSV bind
+        would otherwise create a fresh copy of each one.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Catalog:
+    """ A *Catalog* object is a single SQLite index of every directory, *Table*, *Parameter*,
+    *Enumeration*, and *Search* found below a tables root directory and a searches root
+    directory.  It lets the tree model list a directory and lets catalog wide questions
+    (e.g. "all tables with a *Tolerance* parameter") be answered without walking or parsing
+    thousands of XML files.
+
+    *Catalog.directory_sync*() and *Catalog.searches_sync*() only reparse files whose size or
+    modification time differs from what was recorded.  Code that saves a single file keeps
+    the catalog current via *Catalog.table_update*() or *Catalog.search_update*().
+    """
+
+    # Bump *SCHEMA_VERSION* whenever *SCHEMA* changes; an out of date catalog is rebuilt empty:
+    SCHEMA_VERSION = 2
+    SCHEMA = """
+      CREATE TABLE directories (
+        path TEXT PRIMARY KEY,
+        parent_path TEXT NOT NULL,
+        name TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL);
+      CREATE INDEX directories_parent_path ON directories (parent_path);
+      CREATE TABLE tables (
+        id INTEGER PRIMARY KEY,
+        path TEXT UNIQUE NOT NULL,
+        directory_path TEXT NOT NULL,
+        name TEXT NOT NULL,
+        title TEXT,
+        url TEXT,
+        csv_file_name TEXT,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL);
+      CREATE INDEX tables_directory_path ON tables (directory_path);
+      CREATE INDEX tables_name ON tables (name);
+      CREATE TABLE parameters (
+        id INTEGER PRIMARY KEY,
+        table_id INTEGER NOT NULL REFERENCES tables (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        csv TEXT,
+        csv_index INTEGER,
+        optional INTEGER NOT NULL,
+        default_value TEXT);
+      CREATE INDEX parameters_name ON parameters (name);
+      CREATE INDEX parameters_table_id ON parameters (table_id);
+      CREATE TABLE enumerations (
+        parameter_id INTEGER NOT NULL REFERENCES parameters (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        name TEXT NOT NULL);
+      CREATE INDEX enumerations_parameter_id ON enumerations (parameter_id);
+      CREATE TABLE searches (
+        path TEXT PRIMARY KEY,
+        directory_path TEXT NOT NULL,
+        name TEXT NOT NULL,
+        parent_name TEXT,
+        table_name TEXT,
+        url TEXT,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL);
+      CREATE INDEX searches_table_name ON searches (table_name);
+    """
+
+    # Catalog.__init__():
+    def __init__(self, database_file_name):
+        # Verify argument types:
+        assert isinstance(database_file_name, str)
+
+        # Open the *connection* and (re)create the schema if it is missing or out of date:
+        directory = os.path.dirname(os.path.abspath(database_file_name))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(database_file_name)
+        connection.execute("PRAGMA foreign_keys = ON")
+        user_version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if user_version != Catalog.SCHEMA_VERSION:
+            for table_name in ("enumerations", "parameters", "searches", "tables", "directories"):
+                connection.execute("DROP TABLE IF EXISTS {0}".format(table_name))
+            connection.executescript(Catalog.SCHEMA)
+            connection.execute("PRAGMA user_version = {0}".format(Catalog.SCHEMA_VERSION))
+            connection.commit()
+
+        # Load up *catalog* (i.e. *self*):
+        catalog = self
+        catalog.connection = connection
+        catalog.database_file_name = database_file_name
+
+    # Catalog.close():
+    def close(self):
+        catalog = self
+        catalog.connection.close()
+
+    # Catalog.directories_get():
+    def directories_get(self, parent_path):
+        """ Return a list of (*path*, *name*) tuples for the directories in *parent_path*. """
+        # Verify argument types:
+        assert isinstance(parent_path, str)
+
+        catalog = self
+        return catalog.connection.execute(
+          "SELECT path, name FROM directories WHERE parent_path = ? ORDER BY name",
+          (os.path.abspath(parent_path),)).fetchall()
+
+    # Catalog.directory_is_indexed():
+    def directory_is_indexed(self, path):
+        """ Return *True* if the catalog has indexed the directory named *path* and the
+            directory has not been modified since.
+        """
+        # Verify argument types:
+        assert isinstance(path, str)
+
+        # Adding, removing or renaming an entry in a directory changes its modification time:
+        catalog = self
+        path = os.path.abspath(path)
+        row = catalog.connection.execute(
+          "SELECT mtime_ns FROM directories WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return False
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        return mtime_ns == row[0]
+
+    # Catalog.directory_sync():
+    def directory_sync(self, root_path, tracing=None):
+        """ Bring the catalog up to date with the directories and table `.xml` files below
+            *root_path* and return the number of tables that had to be (re)indexed.
+        """
+        # Verify argument types:
+        assert isinstance(root_path, str)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Grab what is already known about *root_path* from the catalog:
+        catalog = self
+        connection = catalog.connection
+        root_path = os.path.abspath(root_path)
+        prefix = root_path + os.sep
+        known_tables = dict()
+        for path, mtime_ns, size in connection.execute(
+          "SELECT path, mtime_ns, size FROM tables WHERE substr(path, 1, ?) = ?",
+          (len(prefix), prefix)):
+            known_tables[path] = (mtime_ns, size)
+        known_directories = dict(connection.execute(
+          "SELECT path, mtime_ns FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+          (root_path, len(prefix), prefix)).fetchall())
+
+        # Walk *root_path* (skipping dot files and directories) and only reindex the tables
+        # whose size or modification time changed.  The modification time of each directory
+        # is recorded so that *directory_is_indexed*() can tell when it has changed since:
+        seen_directories = {root_path: (os.path.dirname(root_path),
+                                        os.stat(root_path).st_mtime_ns)}
+        seen_tables = set()
+        indexed_count = 0
+        pending_paths = [root_path]
+        while len(pending_paths) >= 1:
+            directory_path = pending_paths.pop()
+            with os.scandir(directory_path) as directory_entries:
+                for directory_entry in directory_entries:
+                    name = directory_entry.name
+                    if name.startswith('.'):
+                        continue
+                    path = directory_entry.path
+                    if directory_entry.is_dir():
+                        seen_directories[path] = (directory_path,
+                                                  directory_entry.stat().st_mtime_ns)
+                        pending_paths.append(path)
+                    elif name.endswith(".xml") and directory_entry.is_file():
+                        seen_tables.add(path)
+                        table_stat = directory_entry.stat()
+                        if known_tables.get(path) != (table_stat.st_mtime_ns, table_stat.st_size):
+                            catalog.table_index(path, table_stat)
+                            indexed_count += 1
+
+        # Record new and changed directories and forget about anything that has disappeared:
+        for path, (parent_path, mtime_ns) in seen_directories.items():
+            if known_directories.get(path) != mtime_ns:
+                connection.execute(
+                  "INSERT OR REPLACE INTO directories (path, parent_path, name, mtime_ns) "
+                  "VALUES (?, ?, ?, ?)", (path, parent_path, os.path.basename(path), mtime_ns))
+        for path in set(known_directories) - set(seen_directories):
+            connection.execute("DELETE FROM directories WHERE path = ?", (path,))
+        for path in set(known_tables) - seen_tables:
+            connection.execute("DELETE FROM tables WHERE path = ?", (path,))
+        connection.commit()
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}Catalog.directory_sync('{1}')=>{2} of {3} tables indexed".
+                  format(tracing, root_path, indexed_count, len(seen_tables)))
+        return indexed_count
+
+    @staticmethod
+    # Catalog.existing_open():
+    def existing_open(database_file_name):
+        """ Return the *Catalog* in *database_file_name* or *None* if it does not exist yet.
+            (Only `--catalog-sync` creates a catalog.)
+        """
+        # Verify argument types:
+        assert isinstance(database_file_name, str)
+
+        return Catalog(database_file_name) if os.path.isfile(database_file_name) else None
+
+    # Catalog.parameter_tables_find():
+    def parameter_tables_find(self, parameter_name):
+        """ Return a list of (*table_file_name*, *table_name*) tuples for each table that has
+            a parameter named *parameter_name*.
+        """
+        # Verify argument types:
+        assert isinstance(parameter_name, str)
+
+        catalog = self
+        return catalog.connection.execute(
+          "SELECT DISTINCT tables.path, tables.name FROM parameters "
+          "JOIN tables ON tables.id = parameters.table_id "
+          "WHERE parameters.name = ? ORDER BY tables.path", (parameter_name,)).fetchall()
+
+    # Catalog.search_index():
+    def search_index(self, search_file_name, search_stat):
+        # Verify argument types:
+        assert isinstance(search_file_name, str)
+        assert isinstance(search_stat, os.stat_result)
+
+        # Only the attributes of the `<Search>` element are indexed:
+        catalog = self
+        search_tree = etree.parse(search_file_name).getroot()
+        attributes_table = search_tree.attrib
+        catalog.connection.execute(
+          "INSERT OR REPLACE INTO searches "
+          "(path, directory_path, name, parent_name, table_name, url, mtime_ns, size) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+          (search_file_name, os.path.dirname(search_file_name), attributes_table.get("name"),
+           attributes_table.get("parent"), attributes_table.get("table"),
+           attributes_table.get("url"), search_stat.st_mtime_ns, search_stat.st_size))
+
+    # Catalog.search_store_index():
+    def search_store_index(self, search_store_file_name, search_store_stat):
+        """ Index every search in the *SearchStore* named *search_store_file_name* and return
+            the list of catalog paths (*search_store_file_name*#*key*) used for them.
+        """
+        # Verify argument types:
+        assert isinstance(search_store_file_name, str)
+        assert isinstance(search_store_stat, os.stat_result)
+
+        # Forget whatever was previously recorded for *search_store_file_name*:
+        catalog = self
+        connection = catalog.connection
+        prefix = search_store_file_name + "#"
+        connection.execute("DELETE FROM searches WHERE substr(path, 1, ?) = ?",
+                           (len(prefix), prefix))
+
+        # Only the attributes of each `<Search>` element are indexed:
+        search_directory = search_store_file_name[:-len(SearchStore.SUFFIX)]
+        search_store = SearchStore(search_store_file_name)
+        paths = list()
+        for key, search_xml_text in sorted(search_store.xml_texts_get().items()):
+            path = prefix + key
+            attributes_table = etree.fromstring(search_xml_text).attrib
+            connection.execute(
+              "INSERT OR REPLACE INTO searches "
+              "(path, directory_path, name, parent_name, table_name, url, mtime_ns, size) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+              (path, search_directory, attributes_table.get("name"),
+               attributes_table.get("parent"), attributes_table.get("table"),
+               attributes_table.get("url"), search_store_stat.st_mtime_ns,
+               search_store_stat.st_size))
+            paths.append(path)
+        return paths
+
+    # Catalog.search_update():
+    def search_update(self, search_file_name):
+        # Verify argument types:
+        assert isinstance(search_file_name, str)
+
+        # Reindex the just saved *search_file_name*, which is either a single search or
+        # a whole *SearchStore*:
+        catalog = self
+        search_file_name = os.path.abspath(search_file_name)
+        search_stat = os.stat(search_file_name)
+        if search_file_name.endswith(SearchStore.SUFFIX):
+            catalog.search_store_index(search_file_name, search_stat)
+        else:
+            catalog.search_index(search_file_name, search_stat)
+        catalog.connection.commit()
+
+    # Catalog.searches_get():
+    def searches_get(self, table_name):
+        """ Return a list of (*search_file_name*, *search_name*, *parent_name*, *url*) tuples
+            for each search of the table named *table_name*.
+        """
+        # Verify argument types:
+        assert isinstance(table_name, str)
+
+        catalog = self
+        return catalog.connection.execute(
+          "SELECT path, name, parent_name, url FROM searches "
+          "WHERE table_name = ? ORDER BY path", (table_name,)).fetchall()
+
+    # Catalog.searches_sync():
+    def searches_sync(self, search_root_directory, tracing=None):
+        """ Bring the catalog up to date with every search `.xml` file and *SearchStore* file
+            below *search_root_directory* and return the number of searches that were
+            (re)indexed.
+        """
+        # Verify argument types:
+        assert isinstance(search_root_directory, str)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Grab what is already known about *search_root_directory* from the catalog:
+        catalog = self
+        connection = catalog.connection
+        prefix = os.path.abspath(search_root_directory) + os.sep
+        known_searches = dict()
+        known_search_stores = dict()
+        search_store_separator = SearchStore.SUFFIX + "#"
+        for path, mtime_ns, size in connection.execute(
+          "SELECT path, mtime_ns, size FROM searches WHERE substr(path, 1, ?) = ?",
+          (len(prefix), prefix)):
+            known_searches[path] = (mtime_ns, size)
+            search_store_file_name, separator, key = path.partition(search_store_separator)
+            if separator != "":
+                search_store_file_name += SearchStore.SUFFIX
+                known_search_stores.setdefault(search_store_file_name, list()).append(path)
+
+        # Walk *search_root_directory* and reindex each changed search:
+        seen_searches = set()
+        indexed_count = 0
+        pending_paths = [os.path.abspath(search_root_directory)]
+        while len(pending_paths) >= 1:
+            with os.scandir(pending_paths.pop()) as directory_entries:
+                for directory_entry in directory_entries:
+                    name = directory_entry.name
+                    path = directory_entry.path
+                    if name.startswith('.'):
+                        continue
+                    elif directory_entry.is_dir():
+                        pending_paths.append(path)
+                    elif name.endswith(".xml") and directory_entry.is_file():
+                        seen_searches.add(path)
+                        search_stat = directory_entry.stat()
+                        if (known_searches.get(path) !=
+                                (search_stat.st_mtime_ns, search_stat.st_size)):
+                            catalog.search_index(path, search_stat)
+                            indexed_count += 1
+                    elif name.endswith(SearchStore.SUFFIX) and directory_entry.is_file():
+                        # All of the searches in a *SearchStore* share its size and
+                        # modification time, so they are reindexed together:
+                        search_store_stat = directory_entry.stat()
+                        search_store_paths = known_search_stores.get(path, list())
+                        if (len(search_store_paths) == 0 or
+                                known_searches[search_store_paths[0]] !=
+                                (search_store_stat.st_mtime_ns, search_store_stat.st_size)):
+                            search_store_paths = catalog.search_store_index(path,
+                                                                            search_store_stat)
+                            indexed_count += len(search_store_paths)
+                        seen_searches.update(search_store_paths)
+
+        # Forget about searches that have disappeared:
+        for path in set(known_searches) - seen_searches:
+            connection.execute("DELETE FROM searches WHERE path = ?", (path,))
+        connection.commit()
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}Catalog.searches_sync('{1}')=>{2} of {3} searches indexed".
+                  format(tracing, search_root_directory, indexed_count, len(seen_searches)))
+        return indexed_count
+
+    # Catalog.table_index():
+    def table_index(self, table_file_name, table_stat, table=None):
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+        assert isinstance(table_stat, os.stat_result)
+        assert isinstance(table, Table) or table is None
+
+        # Parse *table_file_name* unless the caller already has the *table*:
+        if table is None:
+            table_tree = etree.parse(table_file_name).getroot()
+            table = Table(file_name=table_file_name, table_tree=table_tree)
+
+        # Replace any previous rows for *table_file_name*.  Deleting the *tables* row cascades
+        # down through its *parameters* and *enumerations*:
+        catalog = self
+        connection = catalog.connection
+        connection.execute("DELETE FROM tables WHERE path = ?", (table_file_name,))
+        cursor = connection.execute(
+          "INSERT INTO tables "
+          "(path, directory_path, name, title, url, csv_file_name, mtime_ns, size) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+          (table_file_name, os.path.dirname(table_file_name), table.name, table.title,
+           table.url, table.csv_file_name, table_stat.st_mtime_ns, table_stat.st_size))
+        table_id = cursor.lastrowid
+        for position, parameter in enumerate(table.parameters):
+            cursor = connection.execute(
+              "INSERT INTO parameters "
+              "(table_id, position, name, type, csv, csv_index, optional, default_value) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+              (table_id, position, parameter.name, parameter.type, parameter.csv,
+               parameter.csv_index, int(parameter.optional), parameter.default))
+            parameter_id = cursor.lastrowid
+            connection.executemany(
+              "INSERT INTO enumerations (parameter_id, position, name) VALUES (?, ?, ?)",
+              [(parameter_id, enumeration_position, enumeration.name)
+               for enumeration_position, enumeration in enumerate(parameter.enumerations)])
+
+    # Catalog.table_update():
+    def table_update(self, table_file_name, table=None):
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+        assert isinstance(table, Table) or table is None
+
+        # Reindex the just saved *table_file_name* (using *table* when it is available):
+        catalog = self
+        table_file_name = os.path.abspath(table_file_name)
+        catalog.table_index(table_file_name, os.stat(table_file_name), table)
+        catalog.connection.commit()
+
+    # Catalog.tables_get():
+    def tables_get(self, directory_path):
+        """ Return a list of (*path*, *name*, *title*, *url*, *csv_file_name*) tuples for each
+            table in *directory_path*.
+        """
+        # Verify argument types:
+        assert isinstance(directory_path, str)
+
+        catalog = self
+        return catalog.connection.execute(
+          "SELECT path, name, title, url, csv_file_name FROM tables "
+          "WHERE directory_path = ? ORDER BY path",
+          (os.path.abspath(directory_path),)).fetchall()
+
+    # Catalog.titles_get():
+    def titles_get(self):
+        """ Return a list of (*path*, *title*, *is_table*) tuples for every table and directory
+            in the catalog.  The title of a directory is its (still encoded) file name.
+        """
+        catalog = self
+        connection = catalog.connection
+        titles = [(path, title, True) for path, title in
+                  connection.execute("SELECT path, title FROM tables").fetchall()]
+        titles.extend([(path, name, False) for path, name in
+                       connection.execute("SELECT path, name FROM directories").fetchall()])
+        return titles
+
+
 class ComboEdit:
     """ A *ComboEdit* object repesents the GUI controls for manuipulating a combo box widget.
     """
@@ -390,9 +912,10 @@ class ComboEdit:
         current_item = combo_edit.current_item_get()
         for index, item in enumerate(items):
             if item == current_item:
-                # Delete the *current_item* from *items*:
+                # Delete the *current_item* from *items* and mark whatever owns *items* dirty:
                 del items[index]
                 items_size = len(items)
+                tables_editor.items_dirty_mark(combo_edit.name)
 
                 # Update *current_item* in *combo_edit*:
                 if 0 <= index < items_size:
@@ -644,6 +1167,7 @@ class ComboEdit:
         combo_edit = self
         items = combo_edit.items
         items.append(new_item)
+        combo_edit.tables_editor.items_dirty_mark(combo_edit.name)
         combo_edit.current_item_set(new_item, tracing=next_tracing)
 
         # Wrap up any requested *tracing*:
@@ -785,8 +1309,9 @@ class ComboEdit:
         new_item_name = line_edit.text()
 
         current_item = combo_edit.current_item_get()
-        if current_item is not None:
+        if current_item is not None and current_item.name != new_item_name:
             current_item.name = new_item_name
+            current_item.dirty_mark()
 
         # Update the GUI:
         tables_editor.update(tracing=next_tracing)
@@ -814,6 +1339,9 @@ class ComboEdit:
 
 class Comment:
 
+    # There are a great many comments, so they do without a per instance *__dict__*:
+    __slots__ = ("dirty", "fingerprint", "language", "lines", "position")
+
     # Comment.__init__():
     def __init__(self, tag_name, **arguments_table):
         # Verify argument types:
@@ -841,15 +1369,18 @@ class Comment:
             text = comment_tree.text.strip()
             lines = text.split('\n')
             for index, line in enumerate(lines):
-                lines[index] = line.strip().replace("<", "&lt;").replace(">", "&gt;")
+                lines[index] = line.strip()
         else:
             language = arguments_table["language"]
             lines = arguments_table["lines"]
 
-        # Load up *table_comment* (i.e. *self*):
+        # Load up *table_comment* (i.e. *self*).  A *comment* read from a file starts out
+        # clean, whereas a newly created one still needs to be saved:
         comment = self
+        comment.dirty = not is_comment_tree
+        comment.fingerprint = None
         comment.position = 0
-        comment.language = language
+        comment.language = value_intern(language)
         comment.lines = lines
         # print("Comment(): comment.lines=", tag_name, lines)
 
@@ -858,8 +1389,15 @@ class Comment:
         # Verify argument types:
         assert isinstance(comment2, Comment)
 
-        # Compare each field in *comment1* (i.e. *self*) with the corresponding field in *comment2*:
+        # The cached fingerprints cover every field (and the class), so different fingerprints
+        # mean different comments of the same class.  A *Comment* and a *ParameterComment* are
+        # still compared field by field:
         comment1 = self
+        if (type(comment1) is type(comment2) and
+                comment1.fingerprint_get() != comment2.fingerprint_get()):
+            return False
+
+        # Compare each field in *comment1* (i.e. *self*) with the corresponding field in *comment2*:
         language_equal = (comment1.language == comment2.language)
         lines_equal = (comment1.lines == comment2.lines)
         all_equal = (language_equal and lines_equal)
@@ -867,9 +1405,132 @@ class Comment:
         # print("lines_equal={0}".format(lines_equal))
         return all_equal
 
+    # Comment.__hash__():
+    def __hash__(self):
+        # Only hash the fields that *Comment.__eq__*() compares, since comments of different
+        # classes can be equal:
+        comment = self
+        return hash((comment.language, tuple(comment.lines)))
+
+    # Comment.dirty_clear():
+    def dirty_clear(self):
+        comment = self
+        comment.dirty = False
+
+    # Comment.dirty_mark():
+    def dirty_mark(self):
+        # Mark *comment* (i.e. *self*) as changed, which also discards its cached fingerprint:
+        comment = self
+        comment.dirty = True
+        comment.fingerprint = None
+        structure_changed()
+
+    # Comment.fingerprint_get():
+    def fingerprint_get(self):
+        # The fingerprint of *comment* (i.e. *self*) is computed once and then cached until the
+        # next time *comment* is changed:
+        comment = self
+        fingerprint = comment.fingerprint
+        if fingerprint is None:
+            fingerprint = values2fingerprint(comment.fingerprint_values_get())
+            comment.fingerprint = fingerprint
+        return fingerprint
+
+    # Comment.fingerprint_values_get():
+    def fingerprint_values_get(self):
+        comment = self
+        return (type(comment).__name__, comment.language, comment.lines)
+
+    # Comment.is_dirty():
+    def is_dirty(self):
+        comment = self
+        return comment.dirty
+
+    # Comment.lines_set():
+    def lines_set(self, lines):
+        # Verify argument types:
+        assert isinstance(lines, list)
+
+        # Only mark *comment* (i.e. *self*) dirty when *lines* actually changes:
+        comment = self
+        if comment.lines != lines:
+            comment.lines = lines
+            comment.dirty_mark()
+
+
+class DirectorySnapshot:
+    """ A *DirectorySnapshot* object records the entries of one directory (and whether each
+    entry is itself a directory) from a single *os.scandir*() pass.
+
+    Snapshots are shared through *DirectorySnapshot.get*(), so the same directory is listed
+    once no matter how many times the tree asks about it.  A snapshot is only reused while the
+    modification time of its directory is unchanged (adding, removing or renaming an entry
+    always changes it), which costs a single *os.stat*() call.
+    """
+
+    # The snapshots of every directory seen so far keyed by path:
+    snapshots = dict()
+
+    # DirectorySnapshot.__init__():
+    def __init__(self, path, mtime_ns):
+        # Verify argument types:
+        assert isinstance(path, str)
+        assert isinstance(mtime_ns, int)
+
+        # Most file systems report the type of each entry with the listing itself, so
+        # *DirEntry.is_dir*() rarely needs another system call:
+        entries = list()
+        with os.scandir(path) as directory_entries:
+            for directory_entry in directory_entries:
+                try:
+                    is_dir = directory_entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((directory_entry.name, is_dir))
+        entries.sort()
+
+        # Load up *directory_snapshot* (i.e. *self*):
+        directory_snapshot = self
+        directory_snapshot.entries = entries
+        directory_snapshot.mtime_ns = mtime_ns
+        directory_snapshot.path = path
+
+    @staticmethod
+    # DirectorySnapshot.get():
+    def get(path):
+        """ Return the current *DirectorySnapshot* for *path* or *None* if *path* is not
+            a directory.
+        """
+        # Verify argument types:
+        assert isinstance(path, str)
+
+        # Look up the modification time of *path*:
+        try:
+            directory_stat = os.stat(path)
+        except (OSError, ValueError):
+            directory_stat = None
+        directory_snapshot = None
+        snapshots = DirectorySnapshot.snapshots
+        if directory_stat is None or not stat.S_ISDIR(directory_stat.st_mode):
+            snapshots.pop(path, None)
+        else:
+            # Reuse the previous snapshot unless the directory changed since it was taken:
+            mtime_ns = directory_stat.st_mtime_ns
+            directory_snapshot = snapshots.get(path)
+            if directory_snapshot is None or directory_snapshot.mtime_ns != mtime_ns:
+                try:
+                    directory_snapshot = DirectorySnapshot(path, mtime_ns)
+                    snapshots[path] = directory_snapshot
+                except OSError:
+                    directory_snapshot = None
+                    snapshots.pop(path, None)
+        return directory_snapshot
+
 
 class Enumeration:
 
+    __slots__ = ("comments", "dirty", "hash_generation", "hash_value", "name")
+
     # Enumeration.__init__():
     def __init__(self, **arguments_table):
         is_enumeration_tree = "enumeration_tree" in arguments_table
@@ -902,7 +1563,10 @@ class Enumeration:
 
         # Load value into *enumeration* (i.e. *self*):
         enumeration = self
-        enumeration.name = name
+        enumeration.dirty = not is_enumeration_tree
+        enumeration.hash_generation = None
+        enumeration.hash_value = 0
+        enumeration.name = value_intern(name)
         enumeration.comments = comments
 
     # Enumeration.__eq__():
@@ -911,26 +1575,65 @@ class Enumeration:
         assert isinstance(enumeration2, Enumeration)
 
         enumeration1 = self
+        if hash(enumeration1) != hash(enumeration2):
+            return False
         name_equal = (enumeration1.name == enumeration2.name)
         comments_equal = (enumeration1.comments == enumeration2.comments)
         return name_equal and comments_equal
 
-    # Enumeration.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
+    # Enumeration.__hash__():
+    def __hash__(self):
+        # The structural hash covers the fields compared by *Enumeration.__eq__*() and is cached
+        # until the next structure change:
+        enumeration = self
+        if enumeration.hash_generation is not structure_generation:
+            enumeration.hash_value = hash((enumeration.name, tuple(enumeration.comments)))
+            enumeration.hash_generation = structure_generation
+        return enumeration.hash_value
+
+    # Enumeration.dirty_clear():
+    def dirty_clear(self):
+        enumeration = self
+        enumeration.dirty = False
+        for comment in enumeration.comments:
+            comment.dirty_clear()
+
+    # Enumeration.dirty_mark():
+    def dirty_mark(self):
+        enumeration = self
+        enumeration.dirty = True
+        structure_changed()
+
+    # Enumeration.fingerprint_get():
+    def fingerprint_get(self):
+        enumeration = self
+        return values2fingerprint(("Enumeration", enumeration.name,
+                                   [comment.fingerprint_get() for comment in enumeration.comments]))
+
+    # Enumeration.is_dirty():
+    def is_dirty(self):
+        # *enumeration* (i.e. *self*) is dirty if it or any of its *comments* has changed:
+        enumeration = self
+        return enumeration.dirty or any(comment.dirty for comment in enumeration.comments)
+
+    # Enumeration.xml_write():
+    def xml_write(self, xml_writer, indent):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
-        # Append an `<Enumeration>` element to *xml_lines*:
+        # Write an `<Enumeration>` element to *xml_writer*:
         enumeration = self
-        xml_lines.append('{0}<Enumeration name="{1}">'.format(indent, enumeration.name))
+        xml_writer.element_start(indent, "Enumeration", (("name", enumeration.name),))
         for comment in enumeration.comments:
-            comment.xml_lines_append(xml_lines, indent + "  ")
-        xml_lines.append('{0}</Enumeration>'.format(indent))
+            comment.xml_write(xml_writer, indent + "  ")
+        xml_writer.element_end(indent, "Enumeration")
 
 
 class EnumerationComment(Comment):
 
+    __slots__ = ()
+
     # EnumerationComment.__init__():
     def __init__(self, **arguments_table):
         # print("=>EnumerationComment.__init__()")
@@ -944,23 +1647,27 @@ class EnumerationComment(Comment):
         assert isinstance(enumeration_comment2, EnumerationComment)
         return super.__eq__(enumeration_comment2)
 
-    # EnumerationComment.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
+    # EnumerationComment.xml_write():
+    def xml_write(self, xml_writer, indent):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
-        # Append and `<EnumerationComment>` an element to *xml_lines*:
+        # Write an `<EnumerationComment>` element to *xml_writer*:
         enumeration_comment = self
-        xml_lines.append(
-          '{0}<EnumerationComment language="{1}">'.format(indent, enumeration_comment.language))
+        xml_writer.element_start(indent, "EnumerationComment",
+                                 (("language", enumeration_comment.language),))
+        line_indent = indent + "  "
         for line in enumeration_comment.lines:
-            xml_lines.append('{0}  {1}'.format(indent, line))
-        xml_lines.append('{0}</EnumerationComment>'.format(indent))
+            xml_writer.text_line(line_indent, line)
+        xml_writer.element_end(indent, "EnumerationComment")
 
 
 class Filter:
 
+    __slots__ = ("dirty", "header_item", "parameter", "reg_ex", "select", "select_item", "use",
+                 "use_item")
+
     # Filter.__init__():
     def __init__(self, **arguments_table):
         # Verify argument types:
@@ -1036,63 +1743,145 @@ class Filter:
 
         # Load up *filter* (i.e. *self*):
         filter = self
+        filter.dirty = not is_filter_tree
         filter.parameter = parameter
         filter.reg_ex = None
-        filter.select = select
+        filter.select = value_intern(select)
         filter.select_item = None
         filter.use = use
         filter.use_item = None
 
-    # Filter.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent, tracing=None):
+    # Filter.dirty_clear():
+    def dirty_clear(self):
+        filter = self
+        filter.dirty = False
+
+    # Filter.dirty_mark():
+    def dirty_mark(self):
+        filter = self
+        filter.dirty = True
+
+    # Filter.fingerprint_get():
+    def fingerprint_get(self):
+        filter = self
+        return values2fingerprint(("Filter", filter.parameter.name, filter.use, filter.select))
+
+    # Filter.is_dirty():
+    def is_dirty(self):
+        filter = self
+        return filter.dirty
+
+    # Filter.select_set():
+    def select_set(self, select):
+        # Verify argument types:
+        assert isinstance(select, str)
+
+        # Only mark *filter* (i.e. *self*) dirty when *select* actually changes:
+        filter = self
+        if filter.select != select:
+            filter.select = select
+            filter.dirty_mark()
+
+    # Filter.use_set():
+    def use_set(self, use):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(use, bool)
+
+        # Only mark *filter* (i.e. *self*) dirty when *use* actually changes:
+        filter = self
+        if filter.use != use:
+            filter.use = use
+            filter.dirty_mark()
+
+    # Filter.xml_write():
+    def xml_write(self, xml_writer, indent, tracing=None):
+        # Verify argument types:
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
         assert isinstance(tracing, str) or tracing is None
 
         # Perform any requested *tracing*:
         # next_tracing = None if tracing is None else tracing + " "
         if tracing is not None:
-            print("{0}=>Filter.xml_lines_append()".format(tracing))
+            print("{0}=>Filter.xml_write()".format(tracing))
 
-        # Start appending the `<Filter...>` element to *xml_lines*:
+        # Start writing the `<Filter...>` element to *xml_writer*:
         filter = self
         parameter = filter.parameter
         use = filter.use
         select = filter.select
-        xml_lines.append(
-          '{0}<Filter name="{1}" use="{2}" select="{3}">'.
-          format(indent, parameter.name, use, select))
+        xml_writer.element_start(indent, "Filter",
+                                 (("name", parameter.name), ("use", use), ("select", select)))
         if tracing is not None:
             print("{0}Name='{1}' Use='{2}' Select='{3}'".
                   format(tracing, parameter.name, filter.use, select))
 
-        # Append any *enumerations*:
+        # Write out any *enumerations*:
         enumerations = parameter.enumerations
         if len(enumerations) >= 1:
-            xml_lines.append('{0}  <FilterEnumerations>'.format(indent))
+            enumerations_indent = indent + "  "
+            enumeration_indent = indent + "    "
+            xml_writer.element_start(enumerations_indent, "FilterEnumerations")
             for enumeration in enumerations:
-                xml_lines.append('{0}    <FilterEnumeration name="{1}" match="{2}"/>'.
-                                 format(indent, enumeration.name, False))
-            xml_lines.append('{0}  </FilterEnumerations>'.format(indent))
+                xml_writer.element_empty(enumeration_indent, "FilterEnumeration",
+                                         (("name", enumeration.name), ("match", False)))
+            xml_writer.element_end(enumerations_indent, "FilterEnumerations")
 
         # Wrap up `<Filter...>` element:
-        xml_lines.append('{0}</Filter>'.format(indent))
+        xml_writer.element_end(indent, "Filter")
 
         # Wrap up any requested *Tracing*:
         if tracing is not None:
-            print("{0}<=Filter.xml_lines_append()".format(tracing))
+            print("{0}<=Filter.xml_write()".format(tracing))
+
+
+class FilterSelectDelegate(QStyledItemDelegate):
+    """ A *FilterSelectDelegate* object reports each keystroke in a [Select] cell of the
+    filters table back to *TablesEditor.filter_select_edited*() so that an approximate result
+    count can be shown while the user is still typing.
+    """
+
+    # FilterSelectDelegate.__init__():
+    def __init__(self, tables_editor):
+        # Verify argument types:
+        assert isinstance(tables_editor, TablesEditor)
+
+        # Initialize the *QStyledItemDelegate* super class and stash *tables_editor*:
+        super().__init__()
+        filter_select_delegate = self
+        filter_select_delegate.tables_editor = tables_editor
+
+    # FilterSelectDelegate.createEditor():
+    def createEditor(self, parent, option, model_index):
+        # Create the normal *editor* and hook up its keystrokes:
+        filter_select_delegate = self
+        editor = super().createEditor(parent, option, model_index)
+        if isinstance(editor, QLineEdit):
+            filter = model_index.data(Qt.UserRole)
+            if isinstance(filter, Filter):
+                tables_editor = filter_select_delegate.tables_editor
+                editor.textEdited.connect(partial(TablesEditor.filter_select_edited,
+                                                  tables_editor, filter))
+        return editor
 
 
 class Node:
-    """ Represents a single *Node* in a *QTreeView* tree. """
+    """ Represents a single *Node* in a *QTreeView* tree.
+
+    Every child node remembers its *position* in the *children* list of its parent, so that
+    *Node.row*() (which Qt calls constantly while painting and scrolling) never scans a list.
+    Code that changes the *children* list of a node directly (e.g. by sorting it) must call
+    *Node.children_renumber*() afterwards.
+    """
 
     # Node.__init__():
-    def __init__(self, name, path, parent=None):
+    def __init__(self, name, path, parent=None, is_dir=None, is_traversed=None):
         # Verify argument types:
         assert isinstance(name, str)
         assert isinstance(path, str)
         assert isinstance(parent, Node) or parent is None
+        assert isinstance(is_dir, bool) or is_dir is None
+        assert isinstance(is_traversed, bool) or is_traversed is None
 
         # print("=>Node.__init__(*, '{0}', '...', '{2}')".
         #  format(name, path, "None" if parent is None else parent.name))
@@ -1103,9 +1892,14 @@ class Node:
         if isinstance(node, Table):
             is_dir = True
             is_traversed = False
+        elif is_dir is not None and is_traversed is not None:
+            # The caller already knows (e.g. from the tree snapshot), so nothing is read:
+            pass
         else:
-            is_dir = os.path.isdir(path)
-            is_traversed = not is_dir or is_dir and len(list(os.listdir(path))) == 0
+            # The same snapshot is reused when *node* is expanded by *TreeModel.fetchMore*():
+            directory_snapshot = DirectorySnapshot.get(path)
+            is_dir = directory_snapshot is not None
+            is_traversed = not is_dir or len(directory_snapshot.entries) == 0
 
         # Load up *node* (i.e. *self*):
         node.children = []
@@ -1114,6 +1908,7 @@ class Node:
         node.is_traversed = is_traversed
         node.parent = parent
         node.path = path
+        node.position = 0
 
         # Force *node* to be in *parent*:
         if parent is not None:
@@ -1131,8 +1926,10 @@ class Node:
         node = self
         # print("=>Node.add_child('{0}', '{1}') =>{2}".
         #  format(node.name, child.name, len(node.children)))
-        node.children.append(child)
+        children = node.children
         child.parent = node
+        child.position = len(children)
+        children.append(child)
         # print("<=Node.add_child('{0}', '{1}') =>{2}".
         #  format(node.name, child.name, len(node.children)))
 
@@ -1146,6 +1943,53 @@ class Node:
         result = children[row] if 0 <= row < len(children) else None
         return result
 
+    # Node.children_insert():
+    def children_insert(self, position, children):
+        """ Insert *children* into the children of *node* (i.e. *self*) at *position* and
+            renumber the following children in a single pass.
+        """
+        # Verify argument types:
+        assert isinstance(position, int)
+        assert isinstance(children, list)
+
+        node = self
+        node_children = node.children
+        inserted = 0 <= position <= len(node_children)
+        if inserted:
+            for child in children:
+                assert isinstance(child, Node)
+                child.parent = node
+            node_children[position:position] = children
+            node.children_renumber(position)
+        return inserted
+
+    # Node.children_remove():
+    def children_remove(self, position, count):
+        """ Remove *count* children of *node* (i.e. *self*) starting at *position*. """
+        # Verify argument types:
+        assert isinstance(position, int) and position >= 0
+        assert isinstance(count, int) and count >= 0
+
+        node = self
+        children = node.children
+        assert position + count <= len(children)
+        for child in children[position:position + count]:
+            child.parent = None
+            child.position = 0
+        del children[position:position + count]
+        node.children_renumber(position)
+
+    # Node.children_renumber():
+    def children_renumber(self, start=0):
+        """ Update the *position* of each child of *node* (i.e. *self*) from *start* on. """
+        # Verify argument types:
+        assert isinstance(start, int)
+
+        node = self
+        children = node.children
+        for position in range(start, len(children)):
+            children[position].position = position
+
     # Node.child_count():
     def child_count(self):
         node = self
@@ -1172,28 +2016,7 @@ class Node:
         # Verify argument types:
         assert isinstance(file_name, str)
 
-        # Decode *file_name* into a list of *characters*:
-        characters = list()
-        index = 0
-        file_name_size = len(file_name)
-        while index < file_name_size:
-            character = file_name[index]
-            if character == '_':
-                # Underscores are always translated to spaces:
-                character = ' '
-                index += 1
-            elif character == '%':
-                # `%XX` is converted into a single *character*:
-                character = chr(int(file_name[index+1:index+3], 16))
-                index += 3
-            else:
-                # Everything else just taken as is:
-                index += 1
-            characters.append(character)
-
-        # Join *characters* back into a single *title* string:
-        title = "".join(characters)
-        return title
+        return codec.file_name2title(file_name)
 
     # Node.insert_child():
     def insert_child(self, position, child):
@@ -1202,12 +2025,7 @@ class Node:
         assert isinstance(child, Node)
 
         node = self
-        children = node.children
-        inserted = 0 <= position <= len(children)
-        if inserted:
-            children.insert(position, child)
-            child.parent = node
-        return inserted
+        return node.children_insert(position, [child])
 
     # Node.remove():
     def remove(self, remove_node):
@@ -1216,14 +2034,14 @@ class Node:
 
         node = self
         children = node.children
-        for child_index, child_node in enumerate(children):
-            if child_node is remove_node:
-                del children[child_index]
-                remove_node.parent = None
-                break
-        else:
-            assert False, ("Node '{0}' not in '{1}' remove failed".
-                           format(remove_node.name, node.name))
+        position = remove_node.position
+        assert (remove_node.parent is node and position < len(children) and
+                children[position] is remove_node), ("Node '{0}' not in '{1}' remove failed".
+                                                     format(remove_node.name, node.name))
+        del children[position]
+        remove_node.parent = None
+        remove_node.position = 0
+        node.children_renumber(position)
 
     # Node.title_get():
     def title_get(self):
@@ -1237,41 +2055,25 @@ class Node:
         # Verify argument types:
         assert isinstance(title, str)
 
-        node = self
-        characters = list()
-        # ok_characters = "-,:.%+"
-        translate_characters = "!\"#$&'()*/;<=>?[]\\_`{|}~"
-        for character in title:
-            if character in translate_characters:
-                character = "%{0:02x}".format(ord(character))
-            elif character == ' ':
-                character = '_'
-            characters.append(character)
-        file_name = "".join(characters)
-
-        # Set to *True* to a little debugging:
-        if False:
-            converted_title = node.file_name2title(file_name)
-            assert title == converted_title, ("'{0}' '{1}' '{2}'".
-                                              format(title, file_name, converted_title))
-        return file_name
+        return codec.title2file_name(title)
 
     # Node.row():
     def row(self):
         node = self
-        parent = node.parent
-        result = 0 if parent is None else parent.children.index(node)
+        result = 0 if node.parent is None else node.position
         return result
 
 
 class Directory(Node):
     # Directory.__init__():
-    def __init__(self, name, path, title, parent=None):
+    def __init__(self, name, path, title, parent=None, is_dir=None, is_traversed=None):
         # Verify argument types:
         assert isinstance(name, str)
         assert isinstance(path, str)
         assert isinstance(title, str)
         assert isinstance(parent, Node) or parent is None
+        assert isinstance(is_dir, bool) or is_dir is None
+        assert isinstance(is_traversed, bool) or is_traversed is None
 
         # print("=>Directory.__init__(*, '{0}', '...', '{2}')".
         #  format(name, path, "None" if parent is None else parent.name))
@@ -1281,7 +2083,7 @@ class Directory(Node):
         assert not base_name.startswith('.'), "Directory '{0}' starts with '.'".format(path)
 
         # Initlialize the *Node* super class:
-        super().__init__(name, path, parent)
+        super().__init__(name, path, parent, is_dir, is_traversed)
         directory = self
         directory.title = title
 
@@ -1292,7 +2094,32 @@ class Directory(Node):
     def append(self, node):
         assert isinstance(node, Node)
         directory = self
-        directory.children.append(node)
+        children = directory.children
+        node.position = len(children)
+        children.append(node)
+
+    # Directory.children_scan():
+    def children_scan(self, table_cache=None):
+        """ Return a list of the new *Table* and *Directory* nodes for the entries in the
+            directory of *directory* (i.e. *self*).  Only the `<Table>` attributes of each table
+            file are read now.  The rest of each table is loaded (via the optional
+            *table_cache*) the first time it is needed.
+        """
+        # Verify argument types:
+        assert isinstance(table_cache, TableCache) or table_cache is None
+
+        # A single (usually already cached) directory snapshot gives both the entry names
+        # and which of them are directories:
+        directory = self
+        path = directory.path
+        directory_snapshot = DirectorySnapshot.get(path)
+        entries = list() if directory_snapshot is None else directory_snapshot.entries
+        nodes = list()
+        for file_name, is_dir in entries:
+            node = directory.entry_node_create(file_name, is_dir, table_cache)
+            if node is not None:
+                nodes.append(node)
+        return nodes
 
     # Directory.clicked():
     def clicked(self, tables_editor, tracing=None):
@@ -1310,6 +2137,29 @@ class Directory(Node):
         if tracing is not None:
             print("{0}<=Directory.clicked()".format(tracing))
 
+    # Directory.entry_node_create():
+    def entry_node_create(self, file_name, is_dir, table_cache=None):
+        """ Return a new *Table* or *Directory* node for the *file_name* entry of *directory*
+            (i.e. *self*) or *None* if the entry does not belong in the tree.
+        """
+        # Verify argument types:
+        assert isinstance(file_name, str)
+        assert isinstance(is_dir, bool)
+        assert isinstance(table_cache, TableCache) or table_cache is None
+
+        directory = self
+        file_path = os.path.join(directory.path, file_name)
+        node = None
+        if file_path.endswith(".xml"):
+            header_tree = Table.header_tree_get(file_path)
+            node = Table(file_name=file_path, header_tree=header_tree, table_cache=table_cache)
+        elif is_dir and not file_name.startswith('.'):
+            title = directory.file_name2title(file_name)
+            # Note: Adding *directory* to Directory causes the top level of
+            # the *Collection* object to be entered twice.  Very strange!!!
+            node = Directory(file_name, file_path, title)
+        return node
+
     # Directory.title_get():
     def title_get(self):
         directory = self
@@ -1348,6 +2198,12 @@ class Collection(Directory):
 
 class Parameter:
 
+    # *long_heading* and *short_heading* are only set by *TablesEditor.parameters_long_set*()
+    # and *TablesEditor.parameters_short_set*():
+    __slots__ = ("comments", "csv", "csv_index", "default", "dirty", "enumerations",
+                 "hash_generation", "hash_value", "long_heading", "name", "optional",
+                 "short_heading", "type", "use")
+
     # Parameter.__init__():
     def __init__(self, **arguments_table):
         is_parameter_tree = "parameter_tree" in arguments_table
@@ -1392,20 +2248,24 @@ class Parameter:
             csv_index = (
               int(attributes_table["csv_index"]) if "csv_index" in attributes_table else -1)
             default = attributes_table["default"] if "default" in attributes_table else None
+            # Older versions wrote each comment in its own `<ParameterComments>`, so the
+            # comments of every leading `<ParameterComments>` are collected:
             parameter_tree_elements = list(parameter_tree)
             assert len(parameter_tree_elements) >= 1
-            comments_tree = parameter_tree_elements[0]
-            assert comments_tree.tag == "ParameterComments"
-            assert len(comments_tree.attrib) == 0
+            assert parameter_tree_elements[0].tag == "ParameterComments"
             comments = list()
-            for comment_tree in comments_tree:
-                comment = ParameterComment(comment_tree=comment_tree)
-                comments.append(comment)
+            while (len(parameter_tree_elements) >= 1 and
+                   parameter_tree_elements[0].tag == "ParameterComments"):
+                comments_tree = parameter_tree_elements.pop(0)
+                assert len(comments_tree.attrib) == 0
+                for comment_tree in comments_tree:
+                    comment = ParameterComment(comment_tree=comment_tree)
+                    comments.append(comment)
 
             enumerations = list()
             if type == "enumeration":
-                assert len(parameter_tree_elements) == 2
-                enumerations_tree = parameter_tree_elements[1]
+                assert len(parameter_tree_elements) == 1
+                enumerations_tree = parameter_tree_elements[0]
                 assert len(enumerations_tree.attrib) == 0
                 assert enumerations_tree.tag == "Enumerations"
                 assert len(enumerations_tree) >= 1
@@ -1413,7 +2273,7 @@ class Parameter:
                     enumeration = Enumeration(enumeration_tree=enumeration_tree)
                     enumerations.append(enumeration)
             else:
-                assert len(parameter_tree_elements) == 1
+                assert len(parameter_tree_elements) == 0
         else:
             name = arguments_table["name"]
             type = arguments_table["type"]
@@ -1429,13 +2289,16 @@ class Parameter:
         super().__init__()
         parameter = self
         parameter.comments = comments
-        parameter.csv = csv
+        parameter.csv = value_intern(csv)
         parameter.csv_index = csv_index
-        parameter.default = default
+        parameter.default = value_intern(default)
+        parameter.dirty = not is_parameter_tree
+        parameter.hash_generation = None
+        parameter.hash_value = 0
         parameter.enumerations = enumerations
-        parameter.name = name
+        parameter.name = value_intern(name)
         parameter.optional = optional
-        parameter.type = type
+        parameter.type = value_intern(type)
         parameter.use = False
         # print("Parameter('{0}'): optional={1}".format(name, optional))
         # print("Parameter(name='{0}', type='{1}', csv='{1}')".format(name, type, parameter.csv))
@@ -1447,9 +2310,14 @@ class Parameter:
         # Verify argument types:
         assert isinstance(parameter2, Parameter)
 
+        # Parameters with different structural hashes can not be equal, so the full comparison
+        # below is only done when the hashes match:
+        parameter1 = self
+        if hash(parameter1) != hash(parameter2):
+            return False
+
         # Compare each field of *parameter1* (i.e. *self*) with the corresponding field
         # of *parameter2*:
-        parameter1 = self
         name_equal = (parameter1.name == parameter2.name)
         default_equal = (parameter1.default == parameter2.default)
         type_equal = (parameter1.type == parameter2.type)
@@ -1471,9 +2339,93 @@ class Parameter:
 
         return all_equal
 
-    # Parameter.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
-        assert isinstance(xml_lines, list)
+    # Parameter.__hash__():
+    def __hash__(self):
+        # The structural hash covers the fields compared by *Parameter.__eq__*() and is cached
+        # until the next structure change.  This also lets identical parameter definitions
+        # (which recur across many tables) be deduplicated with a *set* or *dict*:
+        parameter = self
+        if parameter.hash_generation is not structure_generation:
+            parameter.hash_value = hash((
+              parameter.name, parameter.default, parameter.type, parameter.optional,
+              tuple(parameter.comments), tuple(parameter.enumerations)))
+            parameter.hash_generation = structure_generation
+        return parameter.hash_value
+
+    # Parameter.dirty_clear():
+    def dirty_clear(self):
+        parameter = self
+        parameter.dirty = False
+        for comment in parameter.comments:
+            comment.dirty_clear()
+        for enumeration in parameter.enumerations:
+            enumeration.dirty_clear()
+
+    # Parameter.dirty_mark():
+    def dirty_mark(self):
+        parameter = self
+        parameter.dirty = True
+        structure_changed()
+
+    # Parameter.fingerprint_get():
+    def fingerprint_get(self):
+        # Combine the fields of *parameter* (i.e. *self*) with the (cached) fingerprints of
+        # its *comments* and *enumerations*:
+        parameter = self
+        return values2fingerprint((
+          "Parameter", parameter.name, parameter.type, parameter.csv, parameter.csv_index,
+          parameter.optional, parameter.default,
+          [comment.fingerprint_get() for comment in parameter.comments],
+          [enumeration.fingerprint_get() for enumeration in parameter.enumerations]))
+
+    # Parameter.is_dirty():
+    def is_dirty(self):
+        # *parameter* (i.e. *self*) is dirty if it, any of its *comments*, or any of its
+        # *enumerations* has changed:
+        parameter = self
+        return (parameter.dirty or
+                any(comment.dirty for comment in parameter.comments) or
+                any(enumeration.is_dirty() for enumeration in parameter.enumerations))
+
+    # Parameter.is_lexical():
+    def is_lexical(self):
+        # Return *True* if values of the *parameter* (i.e. *self*) type are only text:
+        parameter = self
+        return parameter.type.lower() in ("empty", "enumeration", "string", "url")
+
+    # Parameter.sort_keys_get():
+    def sort_keys_get(self, values):
+        """ Return a list of sort keys for *values* (a list of CSV column strings) that places
+            numbers (by unit normalized magnitude) first, then text (case insensitive), and
+            finally empty values (i.e. "" or "-").
+        """
+        # Verify argument types:
+        assert isinstance(values, list)
+
+        # Lexical *parameter* (i.e. *self*) types never attempt a magnitude conversion:
+        parameter = self
+        is_lexical = parameter.is_lexical()
+
+        # Memoize the *sort_key* for each distinct *value* since CSV columns tend to have
+        # a great deal of repetition:
+        magnitude_get = Units.magnitude_get
+        empty_sort_key = (2, 0.0, "")
+        sort_keys_table = {"": empty_sort_key, "-": empty_sort_key}
+        sort_keys = list()
+        for value in values:
+            sort_key = sort_keys_table.get(value)
+            if sort_key is None:
+                magnitude = None if is_lexical else magnitude_get(value)
+                sort_key = ((1, 0.0, value.casefold()) if magnitude is None
+                            else (0, magnitude, value))
+                sort_keys_table[value] = sort_key
+            sort_keys.append(sort_key)
+        return sort_keys
+
+    # Parameter.xml_write():
+    def xml_write(self, xml_writer, indent):
+        # Verify argument types:
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
         # Grab some values from *parameter* (i.e. *self*):
@@ -1482,36 +2434,40 @@ class Parameter:
         optional = parameter.optional
 
         # Start the *parameter* XML add in *optional* and *default* if needed:
-        xml_line = '{0}<Parameter name="{1}" type="{2}" csv="{3}" csv_index="{4}"'.format(
-          indent, parameter.name, parameter.type, parameter.csv, parameter.csv_index)
-        if optional:
-            xml_line += ' optional="true"'
-        if default is not None:
-            xml_line += ' default="{0}"'.format(default)
-        xml_line += '>'
-        xml_lines.append(xml_line)
-
-        # Append all of the comments*:
+        xml_writer.element_start(indent, "Parameter", (
+          ("name", parameter.name),
+          ("type", parameter.type),
+          ("csv", parameter.csv),
+          ("csv_index", parameter.csv_index),
+          ("optional", "true" if optional else None),
+          ("default", default)))
+
+        # Write out all of the *comments* in a single `<ParameterComments>`:
         comments = parameter.comments
+        comments_indent = indent + "  "
+        comment_indent = indent + "    "
+        xml_writer.element_start(comments_indent, "ParameterComments")
         for comment in comments:
-            xml_lines.append('{0}  <ParameterComments>'.format(indent))
-            comment.xml_lines_append(xml_lines)
-            xml_lines.append('{0}  </ParameterComments>'.format(indent))
+            comment.xml_write(xml_writer, comment_indent)
+        xml_writer.element_end(comments_indent, "ParameterComments")
 
-        # Append all of the *enumerations*:
+        # Write out all of the *enumerations*:
         enumerations = parameter.enumerations
         if len(enumerations) >= 1:
-            xml_lines.append('{0}  <Enumerations>'.format(indent))
+            enumerations_indent = indent + "  "
+            xml_writer.element_start(enumerations_indent, "Enumerations")
             for enumeration in enumerations:
-                enumeration.xml_lines_append(xml_lines, indent + "    ")
-            xml_lines.append('{0}  </Enumerations>'.format(indent))
+                enumeration.xml_write(xml_writer, indent + "    ")
+            xml_writer.element_end(enumerations_indent, "Enumerations")
 
         # Close out the *parameter*:
-        xml_lines.append('{0}</Parameter>'.format(indent))
+        xml_writer.element_end(indent, "Parameter")
 
 
 class ParameterComment(Comment):
 
+    __slots__ = ("long_heading", "short_heading")
+
     # ParameterComment.__init__():
     def __init__(self, **arguments_table):
         # Verify argument types:
@@ -1557,8 +2513,8 @@ class ParameterComment(Comment):
         assert isinstance(parameter_comment.lines, list)
 
         # Initialize the remaining two fields that are specific to a *parameter_comment*:
-        parameter_comment.long_heading = long_heading
-        parameter_comment.short_heading = short_heading
+        parameter_comment.long_heading = value_intern(long_heading)
+        parameter_comment.short_heading = value_intern(short_heading)
 
     # ParameterComment.__equ__():
     def __eq__(self, parameter_comment2):
@@ -1566,6 +2522,8 @@ class ParameterComment(Comment):
         assert isinstance(parameter_comment2, ParameterComment)
 
         parameter_comment1 = self
+        if parameter_comment1.fingerprint_get() != parameter_comment2.fingerprint_get():
+            return False
         language_equal = parameter_comment1.language == parameter_comment2.language
         lines_equal = parameter_comment1.lines == parameter_comment2.lines
         long_equal = parameter_comment1.long_heading == parameter_comment2.long_heading
@@ -1573,48 +2531,1092 @@ class ParameterComment(Comment):
         all_equal = language_equal and lines_equal and long_equal and short_equal
         return all_equal
 
-    # ParameterComment.xml_lines_append():
-    def xml_lines_append(self, xml_lines):
+    # ParameterComment.__hash__():
+    # (Defining *__eq__*() clears the inherited *__hash__*(), so it is restored here.)
+    __hash__ = Comment.__hash__
+
+    # ParameterComment.fingerprint_values_get():
+    def fingerprint_values_get(self):
+        # Override *Comment.fingerprint_values_get*() to include the two headings:
+        parameter_comment = self
+        return (super().fingerprint_values_get() +
+                (parameter_comment.long_heading, parameter_comment.short_heading))
+
+    # ParameterComment.xml_write():
+    def xml_write(self, xml_writer, indent):
+        # Verify argument types:
+        assert isinstance(xml_writer, XMLWriter)
+        assert isinstance(indent, str)
+
+        # Write the `<ParameterComment ...>` element to *xml_writer*:
         parameter_comment = self
-        xml_line = '        <ParameterComment language="{0}" longHeading="{1}"'.format(
-          parameter_comment.language, parameter_comment.long_heading)
-        short_heading = parameter_comment.short_heading
-        if short_heading is not None:
-            xml_line += ' shortHeading="{0}"'.format(short_heading)
-        xml_line += '>'
-        xml_lines.append(xml_line)
+        xml_writer.element_start(indent, "ParameterComment", (
+          ("language", parameter_comment.language),
+          ("longHeading", parameter_comment.long_heading),
+          ("shortHeading", parameter_comment.short_heading)))
+        line_indent = indent + "  "
         for line in parameter_comment.lines:
-            xml_lines.append('          {0}'.format(line))
-        xml_lines.append('        </ParameterComment>')
+            xml_writer.text_line(line_indent, line)
+        xml_writer.element_end(indent, "ParameterComment")
 
 
-# Search:
-class Search(Node):
+class Placeholder(Node):
+    """ A *Placeholder* is the "loading..." row that *TreeModel.fetchMore*() shows under a
+    node while its children are read in the background.
+    """
 
-    # FIXME: This tale belongs in *Units*:
-    ISO_MULTIPLIER_TABLE = {
-      "M": 1.0e6,
-      "K": 1.0e3,
-      "m": 1.0e-3,
-      "u": 1.0e-6,
-      "n": 1.0e-9,
-      "p": 1.0e-12,
-    }
+    # Placeholder.__init__():
+    def __init__(self):
+        # Initialize the *Node* super class:
+        super().__init__("Loading\u2026", "")
 
-    # Search.__init__():
-    def __init__(self, **arguments_table):
+    # Placeholder.clicked():
+    def clicked(self, tables_editor, tracing=None):
         # Verify argument types:
-        is_search_tree = "search_tree" in arguments_table
-        required_arguments_size = 1 if "tracing" in arguments_table else 0
-        if is_search_tree:
-            assert "table" in arguments_table
-            table = arguments_table["table"]
-            assert isinstance(table, Table)
-            required_arguments_size += 2
-        else:
-            required_arguments_size += 5
-            assert "name" in arguments_table
-            assert "comments" in arguments_table
+        assert isinstance(tables_editor, TablesEditor)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Clicking on a *placeholder* does nothing:
+        if tracing is not None:
+            print("{0}<=>Placeholder.clicked()".format(tracing))
+
+    # Placeholder.title_get():
+    def title_get(self):
+        placeholder = self
+        return placeholder.name
+
+    # Placeholder.type_letter_get():
+    def type_letter_get(self):
+        return ""
+
+
+class Query:
+    """ A *Query* object is a search expression written in a small textual query language that
+    has been compiled against the parameters of a *Table*.  For example:
+
+        Resistance in 1k..10k and PackageCase = "0603" and UnitPriceUSD < 0.02
+
+    The language is:
+    * *query* := *and_query* { `or` *and_query* }
+    * *and_query* := *not_query* { `and` *not_query* }
+    * *not_query* := `not` *not_query* | `(` *query* `)` | *clause*
+    * *clause* := *name* *operator* *value* | *name* `in` [*value*] `..` [*value*] |
+      *name* `in` `(` *value* { `,` *value* } `)` | *name* `~` *value*
+    * *operator* := `=` | `!=` | `<` | `<=` | `>` | `>=`
+    * *value* := a double quoted string or a bare word (e.g. `4.7kOhm`, `0603`, `0.02`.)
+
+    Numbers with units are normalized with *Units.magnitude_get*().  The compiled *plan* is a
+    tree of tuples:
+    * `("and", [plan, ...])`, `("or", [plan, ...])`, `("not", plan)`
+    * `("equal", parameter, value)`: Case insensitive text equality.
+    * `("range", parameter, low, low_inclusive, high, high_inclusive)`: Magnitude range where
+      either of *low* and *high* may be *None*.
+    * `("match", parameter, select)`: Regular expression match (with an implied `$`.)
+
+    The plan is what is stored in the search `.xml` file, so a query is only parsed once.
+    """
+
+    KEYWORDS = ("and", "in", "not", "or")
+
+    TOKEN_RE = re.compile(
+      "[ \\t\\r\\n]*(?:(\\.\\.)|(<=|>=|!=|=|<|>|~|\\(|\\)|,)|\"((?:[^\"\\\\]|\\\\.)*)\"|"
+      "((?:[^ \\t\\r\\n()<>=!~,\".]|\\.(?!\\.))+))")
+
+    # Query.__init__():
+    def __init__(self, **arguments_table):
+        # Verify argument types:
+        is_query_tree = "query_tree" in arguments_table
+        assert len(arguments_table) == 2
+        assert "table" in arguments_table
+        table = arguments_table["table"]
+        assert isinstance(table, Table)
+
+        # Dispatch on *is_query_tree*:
+        query = self
+        query.parameters_table = {parameter.name.lower(): parameter
+                                  for parameter in table.parameters}
+        if is_query_tree:
+            # Reload the previously compiled *plan* from *query_tree*:
+            query_tree = arguments_table["query_tree"]
+            assert isinstance(query_tree, etree._Element)
+            assert query_tree.tag == "Query"
+            attributes_table = query_tree.attrib
+            assert "text" in attributes_table
+            text = attributes_table["text"]
+            plan_trees = list(query_tree)
+            assert len(plan_trees) == 1
+            plan = query.plan_tree2plan(plan_trees[0])
+        else:
+            # Compile *text* into *plan*:
+            assert "text" in arguments_table
+            text = arguments_table["text"]
+            assert isinstance(text, str)
+            query.tokens = query.tokenize(text)
+            query.tokens_index = 0
+            plan = query.or_parse()
+            if query.tokens_index < len(query.tokens):
+                query.syntax_error("Unexpected '{0}'".format(query.tokens[query.tokens_index][1]))
+            del query.tokens
+
+        # Load up the rest of *query*:
+        query.plan = plan
+        query.table = table
+        query.text = text
+
+    # Query.and_parse():
+    def and_parse(self):
+        query = self
+        plans = [query.not_parse()]
+        while (query.token_peek() or "").lower() == "and":
+            query.token_next("'and'")
+            plans.append(query.not_parse())
+        return plans[0] if len(plans) == 1 else ("and", plans)
+
+    # Query.clause_parse():
+    def clause_parse(self):
+        # Grab the parameter *name* and the *operator*:
+        query = self
+        kind, name = query.token_next("a parameter name")
+        if kind != "word" or name.lower() in Query.KEYWORDS:
+            query.syntax_error("Expected a parameter name instead of '{0}'".format(name))
+        parameter = query.parameters_table.get(name.lower())
+        if parameter is None:
+            query.syntax_error("'{0}' is not a parameter (expected one of {1})".format(
+              name, ", ".join(sorted([parameter.name
+                                      for parameter in query.parameters_table.values()]))))
+        if parameter.csv_index < 0:
+            query.syntax_error("'{0}' is not bound to a CSV column".format(parameter.name))
+        kind, operator = query.token_next("an operator")
+        if kind == "word":
+            operator = operator.lower()
+
+        # Dispatch on *operator*:
+        if operator in ("=", "!="):
+            plan = query.equal_plan_get(parameter, query.value_parse())
+            if operator == "!=":
+                plan = ("not", plan)
+        elif operator in ("<", "<=", ">", ">="):
+            magnitude = query.magnitude_parse(parameter)
+            inclusive = operator.endswith('=')
+            if operator.startswith('<'):
+                plan = ("range", parameter, None, False, magnitude, inclusive)
+            else:
+                plan = ("range", parameter, magnitude, inclusive, None, False)
+        elif operator == "in":
+            if query.token_peek() == "(":
+                # `in (VALUE, ...)`:
+                query.token_next("'('")
+                plans = [query.equal_plan_get(parameter, query.value_parse())]
+                while query.token_peek() == ",":
+                    query.token_next("','")
+                    plans.append(query.equal_plan_get(parameter, query.value_parse()))
+                query.token_expect(")")
+                plan = plans[0] if len(plans) == 1 else ("or", plans)
+            else:
+                # `in [LOW]..[HIGH]`:
+                low = None if query.token_peek() == ".." else query.magnitude_parse(parameter)
+                query.token_expect("..")
+                high = (query.magnitude_parse(parameter)
+                        if query.token_peek() not in (None, ")") and
+                        query.token_peek().lower() not in Query.KEYWORDS else None)
+                plan = ("range", parameter, low, low is not None, high, high is not None)
+        elif operator == "~":
+            select = query.value_parse()
+            try:
+                re.compile(select + "$")
+            except re.error as error:
+                query.syntax_error("Bad regular expression '{0}': {1}".format(select, error))
+            plan = ("match", parameter, select)
+        else:
+            query.syntax_error("Expected an operator after '{0}' instead of '{1}'".
+                               format(name, operator))
+        return plan
+
+    # Query.equal_plan_get():
+    def equal_plan_get(self, parameter, value):
+        # Verify argument types:
+        assert isinstance(parameter, Parameter)
+        assert isinstance(value, str)
+
+        # Numeric parameters compare magnitudes (e.g. "10k" = "10000") and everything else
+        # is a case insensitive text comparison:
+        magnitude = None if parameter.is_lexical() else Units.magnitude_get(value)
+        if magnitude is None:
+            plan = ("equal", parameter, value.casefold())
+        else:
+            plan = ("range", parameter, magnitude, True, magnitude, True)
+        return plan
+
+    # Query.execute():
+    def execute(self, query_indexes):
+        """ Return a bitmap (an *int*) of the row ids in *query_indexes* that match
+            the *Query* object (i.e. *self*.)
+        """
+        # Verify argument types:
+        assert isinstance(query_indexes, QueryIndexes)
+
+        query = self
+        return query_indexes.plan_execute(query.plan)
+
+    # Query.explain():
+    def explain(self, query_indexes=None):
+        """ Return a list of lines that describe the *Query* object (i.e. *self*) plan and
+            (when *query_indexes* is specified) which index each clause uses along with the
+            number of rows that it matches.
+        """
+        # Verify argument types:
+        assert isinstance(query_indexes, QueryIndexes) or query_indexes is None
+
+        query = self
+        lines = list()
+        Query.plan_explain(query.plan, query_indexes, "", lines)
+        return lines
+
+    # Query.magnitude_parse():
+    def magnitude_parse(self, parameter):
+        # Verify argument types:
+        assert isinstance(parameter, Parameter)
+
+        # Range comparisons only make sense for numeric *parameter*'s:
+        query = self
+        value = query.value_parse()
+        if parameter.is_lexical():
+            query.syntax_error("'{0}' has type '{1}' and can not be compared with '{2}'".
+                               format(parameter.name, parameter.type, value))
+        magnitude = Units.magnitude_get(value)
+        if magnitude is None:
+            query.syntax_error("'{0}' is not a number".format(value))
+        return magnitude
+
+    # Query.not_parse():
+    def not_parse(self):
+        query = self
+        token = query.token_peek()
+        if token is not None and token.lower() == "not":
+            query.token_next("'not'")
+            plan = ("not", query.not_parse())
+        elif token == "(":
+            query.token_next("'('")
+            plan = query.or_parse()
+            query.token_expect(")")
+        else:
+            plan = query.clause_parse()
+        return plan
+
+    # Query.or_parse():
+    def or_parse(self):
+        query = self
+        plans = [query.and_parse()]
+        while (query.token_peek() or "").lower() == "or":
+            query.token_next("'or'")
+            plans.append(query.and_parse())
+        return plans[0] if len(plans) == 1 else ("or", plans)
+
+    # Query.plan_explain():
+    @staticmethod
+    def plan_explain(plan, query_indexes, indent, lines):
+        # Verify argument types:
+        assert isinstance(plan, tuple)
+        assert isinstance(query_indexes, QueryIndexes) or query_indexes is None
+        assert isinstance(indent, str)
+        assert isinstance(lines, list)
+
+        # Describe *plan* (and how many rows it matches if *query_indexes* is present):
+        kind = plan[0]
+        if kind in ("and", "or", "not"):
+            line = kind
+        else:
+            line = Query.plan_text_get(plan)
+        if query_indexes is not None:
+            if kind in ("and", "or", "not"):
+                line += " (combined bitmaps"
+            else:
+                line += " ({0} index".format(query_indexes.index_kind_get(plan))
+            line += ", {0} rows)".format(
+              QueryIndexes.bitmap_count(query_indexes.plan_execute(plan)))
+        lines.append(indent + line)
+
+        # Now explain any sub *plans*:
+        next_indent = indent + "  "
+        if kind in ("and", "or"):
+            for sub_plan in plan[1]:
+                Query.plan_explain(sub_plan, query_indexes, next_indent, lines)
+        elif kind == "not":
+            Query.plan_explain(plan[1], query_indexes, next_indent, lines)
+
+    # Query.plan_text_get():
+    @staticmethod
+    def plan_text_get(plan):
+        # Verify argument types:
+        assert isinstance(plan, tuple)
+
+        # Return a canonical textual description of a single *plan* node:
+        kind = plan[0]
+        if kind == "equal":
+            text = '{0} = "{1}"'.format(plan[1].name, plan[2])
+        elif kind == "match":
+            text = '{0} ~ "{1}"'.format(plan[1].name, plan[2])
+        elif kind == "range":
+            parameter, low, low_inclusive, high, high_inclusive = plan[1:]
+            text = "{0} in {1}{2}, {3}{4}".format(
+              parameter.name, '[' if low_inclusive else '(', "-inf" if low is None else low,
+              "+inf" if high is None else high, ']' if high_inclusive else ')')
+        else:
+            text = kind
+        return text
+
+    # Query.plan_tree2plan():
+    def plan_tree2plan(self, plan_tree):
+        # Verify argument types:
+        assert isinstance(plan_tree, etree._Element)
+
+        # Dispatch on the *plan_tree* tag:
+        query = self
+        tag = plan_tree.tag
+        attributes_table = plan_tree.attrib
+        if tag in ("And", "Or"):
+            plan = (tag.lower(), [query.plan_tree2plan(sub_tree) for sub_tree in plan_tree])
+        elif tag == "Not":
+            sub_trees = list(plan_tree)
+            assert len(sub_trees) == 1
+            plan = ("not", query.plan_tree2plan(sub_trees[0]))
+        else:
+            name = attributes_table["name"]
+            parameter = query.parameters_table.get(name.lower())
+            assert isinstance(parameter, Parameter), "No parameter named '{0}'".format(name)
+            if tag == "Equal":
+                plan = ("equal", parameter, attributes_table["value"])
+            elif tag == "Match":
+                plan = ("match", parameter, attributes_table["select"])
+            elif tag == "Range":
+                low = float(attributes_table["low"]) if "low" in attributes_table else None
+                high = float(attributes_table["high"]) if "high" in attributes_table else None
+                plan = ("range", parameter,
+                        low, attributes_table.get("low_inclusive") == "True",
+                        high, attributes_table.get("high_inclusive") == "True")
+            else:
+                assert False, "Unrecognized query plan tag '{0}'".format(tag)
+        return plan
+
+    # Query.plan_xml_write():
+    @staticmethod
+    def plan_xml_write(plan, xml_writer, indent):
+        # Verify argument types:
+        assert isinstance(plan, tuple)
+        assert isinstance(xml_writer, XMLWriter)
+        assert isinstance(indent, str)
+
+        # Dispatch on the *plan* kind:
+        kind = plan[0]
+        if kind in ("and", "or", "not"):
+            tag = kind.capitalize()
+            xml_writer.element_start(indent, tag)
+            sub_plans = plan[1] if kind in ("and", "or") else [plan[1]]
+            for sub_plan in sub_plans:
+                Query.plan_xml_write(sub_plan, xml_writer, indent + "  ")
+            xml_writer.element_end(indent, tag)
+        elif kind == "equal":
+            xml_writer.element_empty(indent, "Equal", (("name", plan[1].name), ("value", plan[2])))
+        elif kind == "match":
+            xml_writer.element_empty(indent, "Match", (("name", plan[1].name), ("select", plan[2])))
+        elif kind == "range":
+            parameter, low, low_inclusive, high, high_inclusive = plan[1:]
+            xml_writer.element_empty(indent, "Range", (
+              ("name", parameter.name),
+              ("low", low),
+              ("low_inclusive", None if low is None else low_inclusive),
+              ("high", high),
+              ("high_inclusive", None if high is None else high_inclusive)))
+        else:
+            assert False, "Unrecognized query plan kind '{0}'".format(kind)
+
+    # Query.syntax_error():
+    def syntax_error(self, message):
+        # Verify argument types:
+        assert isinstance(message, str)
+
+        query = self
+        raise ValueError("Query '{0}': {1}".format(query.text, message))
+
+    # Query.token_expect():
+    def token_expect(self, expected_token):
+        # Verify argument types:
+        assert isinstance(expected_token, str)
+
+        query = self
+        kind, token = query.token_next("'{0}'".format(expected_token))
+        if token != expected_token:
+            query.syntax_error("Expected '{0}' instead of '{1}'".format(expected_token, token))
+
+    # Query.token_next():
+    def token_next(self, expected):
+        # Verify argument types:
+        assert isinstance(expected, str)
+
+        query = self
+        tokens = query.tokens
+        tokens_index = query.tokens_index
+        if tokens_index >= len(tokens):
+            query.syntax_error("Expected {0} at the end".format(expected))
+        query.tokens_index = tokens_index + 1
+        return tokens[tokens_index]
+
+    # Query.token_peek():
+    def token_peek(self):
+        query = self
+        tokens = query.tokens
+        tokens_index = query.tokens_index
+        return tokens[tokens_index][1] if tokens_index < len(tokens) else None
+
+    # Query.tokenize():
+    def tokenize(self, text):
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        # Break *text* into a list of (*kind*, *token*) *tokens*:
+        query = self
+        query.text = text
+        tokens = list()
+        token_re = Query.TOKEN_RE
+        text_size = len(text)
+        index = 0
+        while len(text[index:].strip()) > 0:
+            token_match = token_re.match(text, index)
+            if token_match is None:
+                raise ValueError("Query '{0}': Unexpected text '{1}'".format(
+                  text, text[index:index + 10].strip()))
+            dots, punctuation, quoted, word = token_match.group(1, 2, 3, 4)
+            if dots is not None:
+                tokens.append(("punctuation", dots))
+            elif punctuation is not None:
+                tokens.append(("punctuation", punctuation))
+            elif quoted is not None:
+                tokens.append(("string", re.sub("\\\\(.)", "\\1", quoted)))
+            else:
+                tokens.append(("word", word))
+            index = token_match.end()
+            assert index <= text_size
+        return tokens
+
+    # Query.value_parse():
+    def value_parse(self):
+        query = self
+        kind, value = query.token_next("a value")
+        if kind == "punctuation":
+            query.syntax_error("Expected a value instead of '{0}'".format(value))
+        return value
+
+    # Query.xml_write():
+    def xml_write(self, xml_writer, indent):
+        # Verify argument types:
+        assert isinstance(xml_writer, XMLWriter)
+        assert isinstance(indent, str)
+
+        # Write out both the *text* (for editing) and the compiled *plan*:
+        query = self
+        xml_writer.element_start(indent, "Query", (("text", query.text),))
+        Query.plan_xml_write(query.plan, xml_writer, indent + "  ")
+        xml_writer.element_end(indent, "Query")
+
+
+class QueryIndexes:
+    """ A *QueryIndexes* object lazily builds and holds the indexes that are used to execute
+    *Query* plans over the rows of a CSV file (row 0 is the header row and is never matched):
+    * A *value index* maps each case folded column value to a list of row ids.
+    * A *bitmap index* maps each case folded column value to a bitmap of row ids and is only
+      built for columns with no more than *BITMAP_CARDINALITY_MAXIMUM* distinct values.
+    * A *range index* is a list of magnitudes sorted in ascending order and a parallel list
+      of row ids for a numeric parameter column.
+    Row sets are represented as Python *int* bitmaps where bit *N* is set for row id *N*.
+    """
+
+    BITMAP_CARDINALITY_MAXIMUM = 64
+
+    # QueryIndexes.__init__():
+    def __init__(self, rows):
+        # Verify argument types:
+        assert isinstance(rows, list)
+
+        # Load up *query_indexes* (i.e. *self*):
+        query_indexes = self
+        query_indexes.all_bitmap = (1 << len(rows)) - 2 if len(rows) >= 1 else 0
+        query_indexes.bitmap_indexes = dict()
+        query_indexes.range_indexes = dict()
+        query_indexes.rows = rows
+        query_indexes.value_indexes = dict()
+
+    # QueryIndexes.bitmap2row_ids():
+    @staticmethod
+    def bitmap2row_ids(bitmap):
+        # Verify argument types:
+        assert isinstance(bitmap, int)
+
+        # Only visit the non-zero bytes of *bitmap*:
+        row_ids = list()
+        bitmap_bytes = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        for byte_index, byte in enumerate(bitmap_bytes):
+            if byte != 0:
+                row_id = byte_index * 8
+                while byte != 0:
+                    if byte & 1:
+                        row_ids.append(row_id)
+                    byte >>= 1
+                    row_id += 1
+        return row_ids
+
+    # QueryIndexes.bitmap_count():
+    @staticmethod
+    def bitmap_count(bitmap):
+        # Verify argument types:
+        assert isinstance(bitmap, int)
+
+        return bin(bitmap).count('1')
+
+    # QueryIndexes.bitmap_index_get():
+    def bitmap_index_get(self, csv_index):
+        # Verify argument types:
+        assert isinstance(csv_index, int)
+
+        # Only low cardinality columns get a bitmap index (*None* otherwise):
+        query_indexes = self
+        bitmap_indexes = query_indexes.bitmap_indexes
+        if csv_index not in bitmap_indexes:
+            value_index = query_indexes.value_index_get(csv_index)
+            bitmap_index = None
+            if len(value_index) <= QueryIndexes.BITMAP_CARDINALITY_MAXIMUM:
+                row_ids2bitmap = query_indexes.row_ids2bitmap
+                bitmap_index = {value: row_ids2bitmap(row_ids)
+                                for value, row_ids in value_index.items()}
+            bitmap_indexes[csv_index] = bitmap_index
+        return bitmap_indexes[csv_index]
+
+    # QueryIndexes.index_kind_get():
+    def index_kind_get(self, plan):
+        # Verify argument types:
+        assert isinstance(plan, tuple)
+
+        # Return the name of the index that is used to execute a single *plan* clause:
+        query_indexes = self
+        kind = plan[0]
+        if kind == "equal":
+            bitmap_index = query_indexes.bitmap_index_get(plan[1].csv_index)
+            index_kind = "value" if bitmap_index is None else "bitmap"
+        elif kind == "range":
+            index_kind = "range"
+        else:
+            index_kind = "no"
+        return index_kind
+
+    # QueryIndexes.plan_execute():
+    def plan_execute(self, plan):
+        # Verify argument types:
+        assert isinstance(plan, tuple)
+
+        # Dispatch on the *plan* kind:
+        query_indexes = self
+        kind = plan[0]
+        if kind == "and":
+            bitmap = query_indexes.all_bitmap
+            for sub_plan in plan[1]:
+                bitmap &= query_indexes.plan_execute(sub_plan)
+                if bitmap == 0:
+                    break
+        elif kind == "or":
+            bitmap = 0
+            for sub_plan in plan[1]:
+                bitmap |= query_indexes.plan_execute(sub_plan)
+        elif kind == "not":
+            bitmap = query_indexes.all_bitmap & ~query_indexes.plan_execute(plan[1])
+        elif kind == "equal":
+            parameter, value = plan[1:]
+            bitmap_index = query_indexes.bitmap_index_get(parameter.csv_index)
+            if bitmap_index is not None:
+                bitmap = bitmap_index.get(value, 0)
+            else:
+                value_index = query_indexes.value_index_get(parameter.csv_index)
+                bitmap = query_indexes.row_ids2bitmap(value_index.get(value, []))
+        elif kind == "range":
+            parameter, low, low_inclusive, high, high_inclusive = plan[1:]
+            magnitudes, row_ids = query_indexes.range_index_get(parameter)
+            start = 0
+            if low is not None:
+                start = (bisect.bisect_left(magnitudes, low) if low_inclusive
+                         else bisect.bisect_right(magnitudes, low))
+            end = len(magnitudes)
+            if high is not None:
+                end = (bisect.bisect_right(magnitudes, high) if high_inclusive
+                       else bisect.bisect_left(magnitudes, high))
+            bitmap = query_indexes.row_ids2bitmap(row_ids[start:end])
+        elif kind == "match":
+            # There is no index for regular expressions, so scan the column:
+            parameter, select = plan[1:]
+            reg_ex = re.compile(select + "$")
+            csv_index = parameter.csv_index
+            rows = query_indexes.rows
+            row_ids = [row_id for row_id in range(1, len(rows))
+                       if csv_index < len(rows[row_id]) and
+                       reg_ex.match(rows[row_id][csv_index]) is not None]
+            bitmap = query_indexes.row_ids2bitmap(row_ids)
+        else:
+            assert False, "Unrecognized query plan kind '{0}'".format(kind)
+        return bitmap
+
+    # QueryIndexes.range_index_get():
+    def range_index_get(self, parameter):
+        # Verify argument types:
+        assert isinstance(parameter, Parameter)
+
+        # Build the range index the first time through.  Rows without a magnitude are left out:
+        query_indexes = self
+        range_indexes = query_indexes.range_indexes
+        csv_index = parameter.csv_index
+        range_index = range_indexes.get(csv_index)
+        if range_index is None:
+            rows = query_indexes.rows
+            magnitudes_table = dict()
+            pairs = list()
+            for row_id in range(1, len(rows)):
+                row = rows[row_id]
+                if csv_index < len(row):
+                    value = row[csv_index]
+                    if value not in magnitudes_table:
+                        magnitudes_table[value] = Units.magnitude_get(value)
+                    magnitude = magnitudes_table[value]
+                    if magnitude is not None:
+                        pairs.append((magnitude, row_id))
+            pairs.sort()
+            range_index = ([magnitude for magnitude, row_id in pairs],
+                           array('I', [row_id for magnitude, row_id in pairs]))
+            range_indexes[csv_index] = range_index
+        return range_index
+
+    # QueryIndexes.row_ids2bitmap():
+    def row_ids2bitmap(self, row_ids):
+        # Set one bit per row id in a *bytearray* and convert it into an *int* all at once:
+        query_indexes = self
+        bitmap_bytes = bytearray((len(query_indexes.rows) + 7) // 8)
+        for row_id in row_ids:
+            bitmap_bytes[row_id >> 3] |= 1 << (row_id & 7)
+        return int.from_bytes(bitmap_bytes, "little")
+
+    # QueryIndexes.value_index_get():
+    def value_index_get(self, csv_index):
+        # Verify argument types:
+        assert isinstance(csv_index, int)
+
+        # Build the value index the first time through:
+        query_indexes = self
+        value_indexes = query_indexes.value_indexes
+        value_index = value_indexes.get(csv_index)
+        if value_index is None:
+            value_index = dict()
+            rows = query_indexes.rows
+            for row_id in range(1, len(rows)):
+                row = rows[row_id]
+                if csv_index < len(row):
+                    value = row[csv_index].casefold()
+                    row_ids = value_index.get(value)
+                    if row_ids is None:
+                        value_index[value] = [row_id]
+                    else:
+                        row_ids.append(row_id)
+            value_indexes[csv_index] = value_index
+        return value_index
+
+
+class ResultsCache:
+    """ A *ResultsCache* object materializes the matching row ids of a search into a directory
+    of small files so that reopening an unchanged search against an unchanged CSV file does
+    not have to rerun the filters.
+
+    Each entry is named by a digest of (filter signature, CSV content hash, *ENGINE_VERSION*),
+    so editing either the search or the CSV file simply misses.  The modification time of an
+    entry is refreshed on each hit and the least recently used entries are removed whenever
+    the directory grows beyond *size_maximum* bytes.
+    """
+
+    # Bump *ENGINE_VERSION* whenever the filter matching semantics change:
+    ENGINE_VERSION = 1
+    MAGIC = b"TTRESULT"
+    HEADER = struct.Struct("<8sII")
+    SIZE_MAXIMUM = 32 * 1024 * 1024
+    SUFFIX = ".rows"
+
+    # ResultsCache.__init__():
+    def __init__(self, cache_directory, size_maximum=SIZE_MAXIMUM):
+        # Verify argument types:
+        assert isinstance(cache_directory, str)
+        assert isinstance(size_maximum, int) and size_maximum > 0
+
+        # Load up *results_cache* (i.e. *self*):
+        results_cache = self
+        results_cache.cache_directory = cache_directory
+        results_cache.csv_hashes_table = dict()
+        results_cache.size_maximum = size_maximum
+
+    # ResultsCache.csv_hash_get():
+    def csv_hash_get(self, csv_file_name):
+        # Verify argument types:
+        assert isinstance(csv_file_name, str)
+
+        # Hashing a large CSV file is not free, so the content hash is only recomputed when
+        # the size or modification time of *csv_file_name* changes:
+        results_cache = self
+        csv_hashes_table = results_cache.csv_hashes_table
+        csv_stat = os.stat(csv_file_name)
+        stat_key = (os.path.abspath(csv_file_name), csv_stat.st_size, csv_stat.st_mtime_ns)
+        csv_hash = csv_hashes_table.get(stat_key)
+        if csv_hash is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(csv_file_name, "rb") as csv_file:
+                for chunk in iter(partial(csv_file.read, 1 << 20), b""):
+                    hasher.update(chunk)
+            csv_hash = hasher.hexdigest()
+            csv_hashes_table[stat_key] = csv_hash
+        return csv_hash
+
+    # ResultsCache.entries_get():
+    def entries_get(self):
+        # Return a list of (size, mtime_ns, entry_file_name) triples for each cache entry:
+        results_cache = self
+        cache_directory = results_cache.cache_directory
+        entries = list()
+        if os.path.isdir(cache_directory):
+            suffix = ResultsCache.SUFFIX
+            with os.scandir(cache_directory) as directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.name.endswith(suffix) and directory_entry.is_file():
+                        entry_stat = directory_entry.stat()
+                        entries.append(
+                          (entry_stat.st_size, entry_stat.st_mtime_ns, directory_entry.path))
+        return entries
+
+    # ResultsCache.entry_file_name_get():
+    def entry_file_name_get(self, key):
+        # Verify argument types:
+        assert isinstance(key, str)
+
+        results_cache = self
+        return os.path.join(results_cache.cache_directory, key + ResultsCache.SUFFIX)
+
+    # ResultsCache.key_get():
+    def key_get(self, filter_signature, csv_file_name):
+        # Verify argument types:
+        assert isinstance(filter_signature, str)
+        assert isinstance(csv_file_name, str)
+
+        # Digest the three parts of the key down to a file name friendly string:
+        results_cache = self
+        csv_hash = results_cache.csv_hash_get(csv_file_name)
+        key_text = "{0}\n{1}\n{2}".format(filter_signature, csv_hash, ResultsCache.ENGINE_VERSION)
+        return hashlib.blake2b(key_text.encode("utf-8"), digest_size=16).hexdigest()
+
+    # ResultsCache.lookup():
+    def lookup(self, key, tracing=None):
+        # Verify argument types:
+        assert isinstance(key, str)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Read the entry for *key* (if it exists):
+        results_cache = self
+        entry_file_name = results_cache.entry_file_name_get(key)
+        row_ids = None
+        try:
+            with open(entry_file_name, "rb") as entry_file:
+                entry_bytes = entry_file.read()
+        except FileNotFoundError:
+            entry_bytes = b""
+
+        # Decode *row_ids*, quietly treating damaged or out of date entries as a miss:
+        header = ResultsCache.HEADER
+        if len(entry_bytes) >= header.size:
+            magic, engine_version, row_ids_count = header.unpack_from(entry_bytes, 0)
+            row_ids_array = array('I')
+            entry_size = header.size + row_ids_count * row_ids_array.itemsize
+            if (magic == ResultsCache.MAGIC and
+                    engine_version == ResultsCache.ENGINE_VERSION and
+                    len(entry_bytes) == entry_size):
+                row_ids_array.frombytes(entry_bytes[header.size:])
+                row_ids = row_ids_array.tolist()
+
+                # Mark the entry as the most recently used:
+                os.utime(entry_file_name)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}ResultsCache.lookup('{1}')=>{2}".format(
+              tracing, key, "miss" if row_ids is None else "{0} rows".format(len(row_ids))))
+        return row_ids
+
+    # ResultsCache.purge():
+    def purge(self, tracing=None):
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # Remove every entry from the cache directory (if it exists):
+        results_cache = self
+        removed_count = 0
+        for size, mtime_ns, entry_file_name in results_cache.entries_get():
+            os.remove(entry_file_name)
+            removed_count += 1
+        results_cache.csv_hashes_table.clear()
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}ResultsCache.purge()=>{1}".format(tracing, removed_count))
+        return removed_count
+
+    # ResultsCache.store():
+    def store(self, key, row_ids, tracing=None):
+        # Verify argument types:
+        assert isinstance(key, str)
+        assert isinstance(row_ids, list)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Encode *row_ids* and atomically write it out as the entry for *key*:
+        results_cache = self
+        cache_directory = results_cache.cache_directory
+        os.makedirs(cache_directory, exist_ok=True)
+        row_ids_array = array('I', row_ids)
+        entry_file_name = results_cache.entry_file_name_get(key)
+        temporary_file_name = entry_file_name + ".tmp"
+        with open(temporary_file_name, "wb") as entry_file:
+            entry_file.write(ResultsCache.HEADER.pack(
+              ResultsCache.MAGIC, ResultsCache.ENGINE_VERSION, len(row_ids_array)))
+            entry_file.write(row_ids_array.tobytes())
+        os.replace(temporary_file_name, entry_file_name)
+
+        # Evict the least recently used entries until the cache fits in *size_maximum*:
+        entries = results_cache.entries_get()
+        total_size = sum([entry[0] for entry in entries])
+        if total_size > results_cache.size_maximum:
+            entries.sort(key=lambda entry: entry[1])
+            for size, mtime_ns, old_entry_file_name in entries:
+                if total_size <= results_cache.size_maximum:
+                    break
+                if old_entry_file_name != entry_file_name:
+                    os.remove(old_entry_file_name)
+                    total_size -= size
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}ResultsCache.store('{1}', {2} rows)".format(tracing, key, len(row_ids)))
+
+
+class SchemaValidator:
+    """ A *SchemaValidator* object checks table and search XML files (and *SearchStore*
+    files) against the `tables_editor.xsd` schema, so that a bad file is reported with its
+    file name and line number rather than tripping an *assert* in the GUI.
+
+    The schema is compiled once per process (including once per worker process) and the
+    files are validated in parallel.  The verdict for each file is kept in a cache keyed by
+    the digest of its contents (and the digest of the schema), so a rerun only revalidates
+    files that actually changed.  A file whose size and modification time are unchanged is
+    not even read.
+    """
+
+    # The compiled schema for this process (see *SchemaValidator.schema_load*()):
+    schema = None
+
+    # SchemaValidator.__init__():
+    def __init__(self, schema_file_name, cache_file_name):
+        # Verify argument types:
+        assert isinstance(schema_file_name, str)
+        assert isinstance(cache_file_name, str)
+
+        # Any change to the schema invalidates every cached verdict:
+        with open(schema_file_name, "rb") as schema_file:
+            schema_digest = hashlib.blake2b(schema_file.read(), digest_size=16).hexdigest()
+        verdicts = dict()
+        try:
+            with open(cache_file_name) as cache_file:
+                cache = json.load(cache_file)
+            if cache.get("schema_digest") == schema_digest:
+                verdicts = cache["verdicts"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # Load up *schema_validator* (i.e. *self*):
+        schema_validator = self
+        schema_validator.cache_file_name = cache_file_name
+        schema_validator.schema_digest = schema_digest
+        schema_validator.schema_file_name = schema_file_name
+        schema_validator.verdicts = verdicts
+
+    # SchemaValidator.directories_validate():
+    def directories_validate(self, directories, tracing=None):
+        """ Validate every `.xml` and *SearchStore* file below each directory in *directories*
+            and return the list of error messages.
+        """
+        # Verify argument types:
+        assert isinstance(directories, list)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Collect the *file_names* to validate:
+        schema_validator = self
+        file_names = list()
+        for directory in directories:
+            for directory_path, sub_directory_names, base_names in os.walk(directory):
+                sub_directory_names[:] = sorted([sub_directory_name
+                                                 for sub_directory_name in sub_directory_names
+                                                 if not sub_directory_name.startswith('.')])
+                for base_name in sorted(base_names):
+                    if (not base_name.startswith('.') and
+                            (base_name.endswith(".xml") or
+                             base_name.endswith(SearchStore.SUFFIX))):
+                        file_names.append(os.path.join(directory_path, base_name))
+        return schema_validator.files_validate(file_names, tracing=tracing)
+
+    @staticmethod
+    # SchemaValidator.file_validate():
+    def file_validate(file_name, old_digest):
+        """ Return (*file_name*, *digest*, *errors*) for *file_name*.  *errors* is *None* when
+            *digest* matches *old_digest*, which means the previous verdict still stands.
+        """
+        # Verify argument types:
+        assert isinstance(file_name, str)
+        assert isinstance(old_digest, str) or old_digest is None
+
+        # Read the file and skip the validation if it has not really changed:
+        with open(file_name, "rb") as xml_file:
+            xml_bytes = xml_file.read()
+        digest = hashlib.blake2b(xml_bytes, digest_size=16).hexdigest()
+        errors = None
+        if digest != old_digest:
+            # A *SearchStore* holds many searches, each of which is validated on its own:
+            errors = list()
+            if file_name.endswith(SearchStore.SUFFIX):
+                search_store = SearchStore(file_name)
+                for key, xml_text in sorted(search_store.xml_texts_get().items()):
+                    errors.extend(SchemaValidator.xml_validate(
+                      "{0}#{1}".format(file_name, key), xml_text.encode("utf-8")))
+            else:
+                errors.extend(SchemaValidator.xml_validate(file_name, xml_bytes))
+        return file_name, digest, errors
+
+    # SchemaValidator.files_validate():
+    def files_validate(self, file_names, tracing=None):
+        """ Validate each file in *file_names* and return the list of error messages. """
+        # Verify argument types:
+        assert isinstance(file_names, list)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Sweep through *file_names* and reuse the verdict for each unchanged file:
+        schema_validator = self
+        verdicts = schema_validator.verdicts
+        new_verdicts = dict()
+        file_stats = dict()
+        pending_file_names = list()
+        old_digests = list()
+        for file_name in file_names:
+            file_stat = os.stat(file_name)
+            file_stats[file_name] = file_stat
+            verdict = verdicts.get(file_name)
+            if verdict is not None and verdict[:2] == [file_stat.st_mtime_ns, file_stat.st_size]:
+                new_verdicts[file_name] = verdict
+            else:
+                pending_file_names.append(file_name)
+                old_digests.append(None if verdict is None else verdict[2])
+
+        # Validate the remaining files, in parallel when there is more than one processor:
+        schema_file_name = schema_validator.schema_file_name
+        if len(pending_file_names) <= 1 or (os.cpu_count() or 1) <= 1:
+            SchemaValidator.schema_load(schema_file_name)
+            results = list(map(SchemaValidator.file_validate, pending_file_names, old_digests))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+              initializer=SchemaValidator.schema_load, initargs=(schema_file_name,)) as executor:
+                results = list(executor.map(SchemaValidator.file_validate,
+                                            pending_file_names, old_digests, chunksize=32))
+
+        # Record the new verdicts.  The size and modification time are those from before the
+        # file was read, so a file that changes during validation is simply checked again:
+        for file_name, digest, errors in results:
+            if errors is None:
+                errors = verdicts[file_name][3]
+            file_stat = file_stats[file_name]
+            new_verdicts[file_name] = [file_stat.st_mtime_ns, file_stat.st_size, digest, errors]
+        schema_validator.verdicts = new_verdicts
+        try:
+            file_text_replace(schema_validator.cache_file_name, json.dumps({
+              "schema_digest": schema_validator.schema_digest, "verdicts": new_verdicts}))
+        except OSError as error:
+            print("Unable to save '{0}': {1}".format(schema_validator.cache_file_name, error))
+
+        # Collect all of the errors in *file_names* order:
+        errors = list()
+        for file_name in file_names:
+            errors.extend(new_verdicts[file_name][3])
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}SchemaValidator.files_validate(<{1} files>)=>{2} validated, {3} errors".
+                  format(tracing, len(file_names), len(pending_file_names), len(errors)))
+        return errors
+
+    @staticmethod
+    # SchemaValidator.schema_load():
+    def schema_load(schema_file_name):
+        # Verify argument types:
+        assert isinstance(schema_file_name, str)
+
+        # Compile *schema_file_name* at most once per process:
+        if SchemaValidator.schema is None:
+            SchemaValidator.schema = etree.XMLSchema(etree.parse(schema_file_name))
+
+    @staticmethod
+    # SchemaValidator.xml_validate():
+    def xml_validate(name, xml_bytes):
+        """ Return a list of "*name*:*line*: *message*" errors for *xml_bytes*. """
+        # Verify argument types:
+        assert isinstance(name, str)
+        assert isinstance(xml_bytes, bytes)
+
+        # Syntax errors and schema violations are reported the same way:
+        schema = SchemaValidator.schema
+        errors = list()
+        try:
+            xml_tree = etree.fromstring(xml_bytes)
+        except etree.XMLSyntaxError as error:
+            errors.append("{0}:{1}: {2}".format(name, error.lineno, error.msg))
+        else:
+            if not schema.validate(xml_tree):
+                for log_entry in schema.error_log:
+                    errors.append("{0}:{1}: {2}".format(name, log_entry.line, log_entry.message))
+        return errors
+
+
+# Search:
+class Search(Node):
+
+    # FIXME: This tale belongs in *Units*:
+    # (The multipliers are exact so that equal values such as "300pF" and ".3nF" compare equal.)
+    ISO_MULTIPLIER_TABLE = {
+      "G": Fraction(10 ** 9),
+      "M": Fraction(10 ** 6),
+      "K": Fraction(10 ** 3),
+      "k": Fraction(10 ** 3),
+      "m": Fraction(1, 10 ** 3),
+      "u": Fraction(1, 10 ** 6),
+      "\u00b5": Fraction(1, 10 ** 6),
+      "n": Fraction(1, 10 ** 9),
+      "p": Fraction(1, 10 ** 12),
+    }
+
+    # Search.__init__():
+    def __init__(self, **arguments_table):
+        # Verify argument types:
+        is_search_tree = "search_tree" in arguments_table
+        required_arguments_size = 1 if "tracing" in arguments_table else 0
+        if is_search_tree:
+            assert "table" in arguments_table
+            table = arguments_table["table"]
+            assert isinstance(table, Table)
+            required_arguments_size += 2
+        else:
+            required_arguments_size += 5
+            assert "name" in arguments_table
+            assert "comments" in arguments_table
             assert "table" in arguments_table
             assert "parent_name" in arguments_table
             assert "url" in arguments_table
@@ -1647,8 +3649,9 @@ class Search(Node):
 
             comments = list()
             filters = list()
+            query = None
             sub_trees = list(search_tree)
-            assert len(sub_trees) == 2
+            assert len(sub_trees) in (2, 3)
             for sub_tree in sub_trees:
                 sub_tree_tag = sub_tree.tag
                 if sub_tree_tag == "SearchComments":
@@ -1663,6 +3666,8 @@ class Search(Node):
                         assert filter_tree.tag == "Filter"
                         filter = Filter(tree=filter_tree, table=table)
                         filters.append(filter)
+                elif sub_tree_tag == "Query":
+                    query = Query(query_tree=sub_tree, table=table)
                 else:
                     assert False
 
@@ -1681,6 +3686,7 @@ class Search(Node):
             for comment in comments:
                 assert isinstance(comment, SearchComment)
             filters = list()
+            query = None
 
         # Make sure *search* is on the *table.children* list:
         # for prior_search in table.children:
@@ -1705,11 +3711,15 @@ class Search(Node):
         path = ""
         super().__init__(name, path, parent=table)
         search.comments = comments
+        search.depth = 0
+        search.dirty = not is_search_tree
         search.filters = filters
+        search.name_key = None
         assert isinstance(parent_name, str)
         search.search_parent = None
         search.search_parent_name = parent_name
         search.name = name
+        search.query = query
         search.table = table
         search.url = url
 
@@ -1724,6 +3734,7 @@ class Search(Node):
         assert isinstance(tracing, str) or tracing is None
 
         # Preform any requested *tracing*:
+        next_tracing = None if tracing is None else tracing + " "
         if tracing is not None:
             print("{0}=>Search.clicked()".format(tracing))
 
@@ -1738,10 +3749,42 @@ class Search(Node):
 
         tables_editor.current_search = search
 
+        # Show the results for *search*, which come straight from the results cache when
+        # neither *search* nor the CSV file have changed since the last time:
+        tables_editor.results_show(search, tracing=next_tracing)
+
         # Wrap up any requested *tracing*:
         if tracing is not None:
             print("{0}<=Search.clicked()".format(tracing))
 
+    # Search.dirty_clear():
+    def dirty_clear(self):
+        search = self
+        search.dirty = False
+        for comment in search.comments:
+            comment.dirty_clear()
+        for filter in search.filters:
+            filter.dirty_clear()
+
+    # Search.dirty_mark():
+    def dirty_mark(self):
+        search = self
+        search.dirty = True
+
+    # Search.filter_signature_get():
+    def filter_signature_get(self):
+        """ Return a string that changes whenever the set of rows matched by the *Search*
+            object (i.e. *self*) could change.
+        """
+        # Only the used filters participate in matching and each one matches the CSV column
+        # at its position in *filters*.  Any *query* participates via its canonical plan:
+        search = self
+        used_filters = [(filter_index, filter.select)
+                        for filter_index, filter in enumerate(search.filters) if filter.use]
+        query = search.query
+        query_lines = list() if query is None else query.explain()
+        return json.dumps([used_filters, query_lines])
+
     # Search.filters_refresh()
     def filters_refresh(self, tracing=None):
         # Verify argument types:
@@ -1775,7 +3818,10 @@ class Search(Node):
                         new_filters.append(filter)
                         break
 
-            # Carefully replace the entire contents of *filters* with the contents of *new_filters*:
+            # Carefully replace the entire contents of *filters* with the contents of *new_filters*.
+            # Dropping a *filter* changes what gets saved for *search*:
+            if len(new_filters) != len(filters):
+                search.dirty_mark()
             filters[:] = new_filters[:]
 
             # Step 2: Sweep through *parameters* and create a new *filter* for each *parameter*
@@ -1792,6 +3838,20 @@ class Search(Node):
         if tracing is not None:
             print("{0}<=Search.filters_refresh()".format(tracing))
 
+    # Search.fingerprint_get():
+    def fingerprint_get(self):
+        # Cover everything that *Search.xml_write*() writes out for *search* (i.e. *self*):
+        search = self
+        search_parent = search.search_parent
+        table = search.table
+        query = search.query
+        return values2fingerprint((
+          "Search", search.name, "" if search_parent is None else search_parent.name,
+          None if table is None else table.name, search.url,
+          None if query is None else query.text,
+          [comment.fingerprint_get() for comment in search.comments],
+          [filter.fingerprint_get() for filter in search.filters]))
+
     # Search.is_deletable():
     def is_deletable(self, tracing=None):
         # Verify argument types:
@@ -1826,6 +3886,15 @@ class Search(Node):
             print("{0}<=is_deletable('{1}')=>{2}".format(tracing, search_name, deletable))
         return deletable
 
+    # Search.is_dirty():
+    def is_dirty(self):
+        # *search* (i.e. *self*) is dirty if it, any of its *comments*, or any of its *filters*
+        # has changed:
+        search = self
+        return (search.dirty or
+                any(comment.dirty for comment in search.comments) or
+                any(filter.dirty for filter in search.filters))
+
     # Search.key():
     def key(self):
         """ Return a sorting key for the *Search* object (i.e. *self*):
@@ -1846,52 +3915,66 @@ class Search(Node):
         #    are organized as a heirachical set of templates and we want the ones closest to
         #    to top
 
-        # Grab *table* and *searches_table* from *search* (i.e. *self*):
+        # The template *depth* of *search* (i.e. *self*) is filled in by *Table.fix_up*() and
+        # the rest of the key only depends upon the search name, so it is computed once per name:
         search = self
-        table = search.parent
-        assert isinstance(table, Table)
-        searches_table = table.searches_table
-        assert isinstance(searches_table, dict)
+        name_key = search.name_key
+        if name_key is None or name_key[0] != search.name:
+            name_key = (search.name,) + Search.name2number_rest(search.name)
+            search.name_key = name_key
+        return (search.depth, name_key[1], name_key[2])
 
-        # Figure out template *depth*:
-        depth = 0
-        nested_search = search
-        while nested_search.search_parent is not None:
-            depth += 1
-            nested_search = nested_search.search_parent
+    @staticmethod
+    # Search.name2number_rest():
+    def name2number_rest(search_name):
+        """ Return the (*UnitsNumber*, *Text*) part of the *Search.key*() for *search_name*.
+            *UnitsNumber* is an exact *Fraction* (zero when *search_name* does not start with
+            a number.)
+        """
+        # Verify argument types:
+        assert isinstance(search_name, str)
 
         # Sweep through the *search_name* looking for a number, optionally followed by an
         # ISO unit mulitplier.:
-        number_end_index = -1
-        search_name = search.name
-        for character_index, character in enumerate(search_name):
+        number_end_index = 0
+        for character in search_name:
             if character in ".0123456789":
                 # We a *character* that "could" be part of a number:
-                number_end_index = character_index + 1
+                number_end_index += 1
             else:
                 break
 
-        # Extract *number* from *search_name* if possible:
-        number = 0.0
-        if number_end_index >= 0:
+        # Extract *number* from *search_name* if possible.  When it is not a number after all,
+        # (e.g. "1.2.3pF"), the whole of *search_name* is the rest of the key:
+        number = Fraction(0)
+        if number_end_index >= 1:
             try:
-                number = float(search_name[0:number_end_index])
+                number = Fraction(search_name[0:number_end_index])
             except ValueError:
-                pass
+                number_end_index = 0
 
         # Figure out the ISO *multiplier* and adjust *number* appropriately:
-        multiplier = 1.0
-        if number_end_index >= 0 and number_end_index < len(search_name):
-
+        if 1 <= number_end_index < len(search_name):
             multiplier_character = search_name[number_end_index]
             iso_multiplier_table = Search.ISO_MULTIPLIER_TABLE
-            if character in iso_multiplier_table:
-                multiplier = iso_multiplier_table[multiplier_character]
-        number *= multiplier
+            if multiplier_character in iso_multiplier_table:
+                number *= iso_multiplier_table[multiplier_character]
 
         # Return a tuple used for sorting:
-        rest = search_name if number_end_index < 0 else search_name[number_end_index:]
-        return (depth, number, rest)
+        return (number, search_name[number_end_index:])
+
+    # Search.query_set():
+    def query_set(self, text):
+        """ Compile *text* against the parameters of the *Search* object (i.e. *self*) table
+            and make it the search query.  An empty *text* removes the query.  A *ValueError*
+            is raised (and the previous query is retained) if *text* does not compile.
+        """
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        search = self
+        search.query = None if text.strip() == "" else Query(text=text, table=search.table)
+        search.dirty_mark()
 
     # Search.save():
     def save(self, tracing=None):
@@ -1900,33 +3983,33 @@ class Search(Node):
         if tracing is not None:
             print("{0}=>Search.save()".format(tracing))
 
-        # Grab the *search_directory* associated with *table*:
+        # Write *search* into either the *SearchStore* for the table (when its searches are
+        # packed) or stream it into its own *search_xml_file_name*.  Either way, nothing is
+        # written when nothing has actually changed:
         search = self
-        table = search.parent
-        assert isinstance(table, Table)
-        search_directory = table.search_directory_get(tracing=next_tracing)
-
-        # Ensure that the *directory_path* exists:
-        if not os.path.isdir(search_directory):
-            os.makedirs(search_directory)
-
-        # Compute *search_xml_file_name*:
-        search_xml_base_name = search.title2file_name(search.name) + ".xml"
-        search_xml_file_name = os.path.join(search_directory, search_xml_base_name)
-
-        # Create the *search_xml_content* from *search*:
-        search_xml_lines = list()
-        search.xml_lines_append(search_xml_lines, "", tracing=next_tracing)
-        search_xml_lines.append("")
-        search_xml_content = "\n".join(search_xml_lines)
-
-        # Write *search_xml_content* out to *search_xml_file_name*:
-        with open(search_xml_file_name, "w") as search_file:
-            search_file.write(search_xml_content)
+        search_xml_file_name = search.xml_file_name_get(tracing=next_tracing)
+        search_directory = os.path.dirname(search_xml_file_name)
+        search_store_file_name = search_directory + SearchStore.SUFFIX
+        if os.path.isfile(search_store_file_name):
+            # A *SearchStore* record holds the whole text of one search:
+            search_xml_file = io.StringIO()
+            search.xml_file_write(search_xml_file, tracing=next_tracing)
+            search_store = SearchStore(search_store_file_name)
+            search_store.search_put(os.path.basename(search_xml_file_name)[:-4],
+                                    search_xml_file.getvalue())
+            saved_file_name = search_store_file_name
+        else:
+            if not os.path.isdir(search_directory):
+                os.makedirs(search_directory)
+            file_stream_replace(search_xml_file_name,
+                                partial(search.xml_file_write, tracing=next_tracing))
+            saved_file_name = search_xml_file_name
+        search.dirty_clear()
 
-        # Wrap up any requested *tracing*:
+        # Wrap up any requested *tracing* and return the name of the file that holds *search*:
         if tracing is not None:
-            print("{0}<=Search.save()".format(tracing))
+            print("{0}<=Search.save()=>'{1}'".format(tracing, saved_file_name))
+        return saved_file_name
 
     # Search.search_parent_set():
     def search_parent_set(self, search_parent):
@@ -1937,7 +4020,9 @@ class Search(Node):
         search = self
         print("Search.search_parent_set('{0}', {1})".format(search.name,
               "None" if search_parent is None else "'{0}'".format(search_parent.name)))
-        search.search_parent = search_parent
+        if search.search_parent is not search_parent:
+            search.search_parent = search_parent
+            search.dirty_mark()
 
     # Search.table_set():
     def table_set(self, new_table, tracing=None):
@@ -1951,7 +4036,9 @@ class Search(Node):
                   format(tracing, "None" if new_table is None else new_table.name))
 
         search = self
-        search.table = new_table
+        if search.table is not new_table:
+            search.table = new_table
+            search.dirty_mark()
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
@@ -1972,17 +4059,36 @@ class Search(Node):
     def type_letter_get(self):
         return 'S'
 
-    # Search.xml_lines_append()
-    def xml_lines_append(self, xml_lines, indent, tracing=None):
+    # Search.xml_file_name_get():
+    def xml_file_name_get(self, tracing=None):
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # The XML file for *search* (i.e. *self*) lives in the search directory of its *table*:
+        search = self
+        table = search.parent
+        assert isinstance(table, Table)
+        search_directory = table.search_directory_get(tracing=tracing)
+        search_xml_base_name = search.title2file_name(search.name) + ".xml"
+        return os.path.join(search_directory, search_xml_base_name)
+
+    # Search.xml_file_write():
+    def xml_file_write(self, xml_file, tracing=None):
+        # Write the *search* (i.e. *self*) to *xml_file*.  (There is no XML header.):
+        search = self
+        search.xml_write(XMLWriter(xml_file), "", tracing=tracing)
+
+    # Search.xml_write()
+    def xml_write(self, xml_writer, indent, tracing=None):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
         assert isinstance(tracing, str) or tracing is None
 
         # Perform any requested *tracing*:
         next_tracing = None if tracing is None else tracing + " "
         if tracing is not None:
-            print("{0}=>Search.xml_lines_append()".format(tracing))
+            print("{0}=>Search.xml_write()".format(tracing))
 
         # Start the `<Search...>` element:
         search = self
@@ -1990,35 +4096,47 @@ class Search(Node):
         search_parent = search.search_parent
         assert search.name == "@ALL" or isinstance(search_parent, Search)
         search_parent_name = "" if search_parent is None else search_parent.name
-        xml_lines.append('{0}<Search name="{1}" parent="{2}" table="{3}" url="{4}">'.format(
-                         indent, search.name, search_parent_name, table.name,
-                         text2safe_attribute(search.url)))
-
-        # Append the `<SearchComments>` element:
-        xml_lines.append('{0}  <SearchComments>'.format(indent))
+        xml_writer.element_start(indent, "Search", (
+          ("name", search.name),
+          ("parent", search_parent_name),
+          ("table", table.name),
+          ("url", search.url)))
+
+        # Write out the `<SearchComments>` element:
+        search_comments_indent = indent + "  "
+        xml_writer.element_start(search_comments_indent, "SearchComments")
         search_comments = search.comments
         search_comment_indent = indent + "    "
         for search_comment in search_comments:
-            search_comment.xml_lines_append(xml_lines, search_comment_indent)
-        xml_lines.append('{0}  </SearchComments>'.format(indent))
+            search_comment.xml_write(xml_writer, search_comment_indent)
+        xml_writer.element_end(search_comments_indent, "SearchComments")
 
-        # Append the `<Filters>` element:
+        # Write out the `<Filters>` element:
         filters = search.filters
-        xml_lines.append('{0}  <Filters>'.format(indent))
+        filters_indent = indent + "  "
+        xml_writer.element_start(filters_indent, "Filters")
         filter_indent = indent + "    "
         for filter in filters:
-            filter.xml_lines_append(xml_lines, filter_indent, tracing=next_tracing)
-        xml_lines.append('{0}  </Filters>'.format(indent))
+            filter.xml_write(xml_writer, filter_indent, tracing=next_tracing)
+        xml_writer.element_end(filters_indent, "Filters")
+
+        # Write out the optional compiled `<Query>` element:
+        query = search.query
+        if query is not None:
+            query.xml_write(xml_writer, indent + "  ")
 
         # Wrap up the `<Search>` element:
-        xml_lines.append('{0}</Search>'.format(indent))
+        xml_writer.element_end(indent, "Search")
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
-            print("{0}<=Search.xml_lines_append()".format(tracing))
+            print("{0}<=Search.xml_write()".format(tracing))
 
 
 class SearchComment(Comment):
+
+    __slots__ = ()
+
     # SearchComment.__init()
     def __init__(self, **arguments_table):
         # Verify argument types:
@@ -2039,20 +4157,310 @@ class SearchComment(Comment):
         # intializer for the *Coment* class:
         super().__init__("SearchComment", **arguments_table)
 
-    # SearchComment.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
+    # SearchComment.xml_write():
+    def xml_write(self, xml_writer, indent):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
-        # Append the <SearchComment> element:
+        # Write the <SearchComment> element:
         search_comment = self
         lines = search_comment.lines
-        xml_lines.append('{0}<SearchComment language="{1}">'.
-                         format(indent, search_comment.language))
+        xml_writer.element_start(indent, "SearchComment", (("language", search_comment.language),))
+        line_indent = indent + "  "
         for line in lines:
-            xml_lines.append("{0}  {1}".format(indent, line))
-        xml_lines.append('{0}</SearchComment>'.format(indent))
+            xml_writer.text_line(line_indent, line)
+        xml_writer.element_end(indent, "SearchComment")
+
+
+class SearchStore:
+    """ A *SearchStore* object packs every *Search* of one *Table* into a single file, so
+    that expanding a table in the collections tree opens and reads one file rather than
+    listing a directory and parsing one small file per search.
+
+    Each search is kept as its XML text under its *key*, which is the base name (without the
+    `.xml` suffix) that the search would have in the one file per search layout.  The file
+    starts with a header, followed by the search texts, followed by an index of
+    (*offset*, *length*, *key*) entries, followed by an append only log of puts and deletes.
+    Reading the header, index, and log is enough to find any search without touching the
+    rest of the file.  Updates only append to the log; once the log holds more than
+    *LOG_LIMIT* entries the whole file is rewritten (i.e. compacted) to a temporary file that
+    is renamed into place.  A torn log entry at the end of the file (e.g. from a crash) is
+    ignored when the log is replayed and is cut off before the next entry is appended.
+    """
+
+    HEADER = struct.Struct("<8sIQQ")
+    INDEX_ENTRY = struct.Struct("<QII")
+    LOG_ENTRY = struct.Struct("<cII")
+    LOG_LIMIT = 64
+    MAGIC = b"TTSEARCH"
+    SUFFIX = ".searches"
+    # Bump *VERSION* whenever the file layout changes:
+    VERSION = 1
+
+    # SearchStore.__init__():
+    def __init__(self, store_file_name):
+        # Verify argument types:
+        assert isinstance(store_file_name, str)
+
+        # Load up *search_store* (i.e. *self*):
+        search_store = self
+        search_store.end_offset = 0
+        search_store.index = dict()
+        search_store.log_count = 0
+        search_store.store_file_name = store_file_name
+
+        # Read the index and the log of an existing *store_file_name*.  The search texts are
+        # only read when they are asked for:
+        if os.path.isfile(store_file_name):
+            search_store.index_read()
+
+    # SearchStore.compact():
+    def compact(self, xml_texts=None):
+        # Verify argument types:
+        assert isinstance(xml_texts, dict) or xml_texts is None
+
+        # Unless the caller supplies them, read every live search text from the current file
+        # of *search_store* (i.e. *self*):
+        search_store = self
+        if xml_texts is None:
+            xml_texts = search_store.xml_texts_get()
+
+        # Lay out the new file as the header, the search texts, and then the index:
+        index = dict()
+        text_chunks = list()
+        index_chunks = list()
+        offset = SearchStore.HEADER.size
+        for key in sorted(xml_texts.keys()):
+            key_bytes = key.encode("utf-8")
+            xml_bytes = xml_texts[key].encode("utf-8")
+            index[key] = (offset, len(xml_bytes))
+            text_chunks.append(xml_bytes)
+            index_chunks.append(SearchStore.INDEX_ENTRY.pack(offset, len(xml_bytes),
+                                                             len(key_bytes)))
+            index_chunks.append(key_bytes)
+            offset += len(xml_bytes)
+        index_offset = offset
+        log_offset = index_offset + sum([len(index_chunk) for index_chunk in index_chunks])
+        header_bytes = SearchStore.HEADER.pack(
+          SearchStore.MAGIC, SearchStore.VERSION, index_offset, log_offset)
+        content = b"".join([header_bytes] + text_chunks + index_chunks)
+
+        # Write *content* to a temporary file that is renamed over *store_file_name*, so that
+        # a reader never sees a partially compacted store:
+        store_file_name = search_store.store_file_name
+        store_directory = os.path.dirname(os.path.abspath(store_file_name))
+        os.makedirs(store_directory, exist_ok=True)
+        temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(
+            dir=store_directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(temporary_file_descriptor, "wb") as temporary_file:
+                temporary_file.write(content)
+            os.chmod(temporary_file_name, 0o644)
+            os.replace(temporary_file_name, store_file_name)
+        except BaseException:
+            os.unlink(temporary_file_name)
+            raise
+        search_store.end_offset = len(content)
+        search_store.index = index
+        search_store.log_count = 0
+
+    # SearchStore.directory_export():
+    def directory_export(self, search_directory):
+        """ Write each search in *search_store* (i.e. *self*) out as its own `.xml` file in
+            *search_directory* and return the number of searches written.
+        """
+        # Verify argument types:
+        assert isinstance(search_directory, str)
+
+        search_store = self
+        os.makedirs(search_directory, exist_ok=True)
+        xml_texts = search_store.xml_texts_get()
+        for key, xml_text in xml_texts.items():
+            file_text_replace(os.path.join(search_directory, key + ".xml"), xml_text)
+        return len(xml_texts)
+
+    # SearchStore.directory_import():
+    def directory_import(self, search_directory):
+        """ Put every `.xml` file in *search_directory* into *search_store* (i.e. *self*) and
+            return the list of file names that were imported.
+        """
+        # Verify argument types:
+        assert isinstance(search_directory, str)
+
+        # Add the searches from *search_directory* to the ones already in *search_store*:
+        search_store = self
+        xml_texts = search_store.xml_texts_get()
+        search_file_names = list()
+        for base_name in sorted(os.listdir(search_directory)):
+            search_file_name = os.path.join(search_directory, base_name)
+            if base_name.endswith(".xml") and os.path.isfile(search_file_name):
+                with open(search_file_name) as search_file:
+                    xml_texts[base_name[:-4]] = search_file.read()
+                search_file_names.append(search_file_name)
+
+        # Rewrite the store from scratch with all of the *xml_texts*:
+        search_store.compact(xml_texts)
+        return search_file_names
+
+    # SearchStore.index_read():
+    def index_read(self):
+        # Read the header of the file for *search_store* (i.e. *self*):
+        search_store = self
+        store_file_name = search_store.store_file_name
+        header = SearchStore.HEADER
+        with open(store_file_name, "rb") as store_file:
+            header_bytes = store_file.read(header.size)
+            assert len(header_bytes) == header.size, (
+              "'{0}' is too short to be a search store".format(store_file_name))
+            magic, version, index_offset, log_offset = header.unpack(header_bytes)
+            assert magic == SearchStore.MAGIC and version == SearchStore.VERSION, (
+              "'{0}' is not a version {1} search store".format(store_file_name,
+                                                               SearchStore.VERSION))
+
+            # The index and the log are contiguous at the end of the file, so a single read
+            # gets both of them:
+            store_file.seek(index_offset)
+            tail_bytes = store_file.read()
+
+        # Decode the index:
+        index = dict()
+        index_entry = SearchStore.INDEX_ENTRY
+        position = 0
+        log_position = log_offset - index_offset
+        while position < log_position:
+            offset, length, key_length = index_entry.unpack_from(tail_bytes, position)
+            position += index_entry.size
+            key = tail_bytes[position:position + key_length].decode("utf-8")
+            position += key_length
+            index[key] = (offset, length)
+
+        # Replay the log on top of *index*, stopping at a torn or garbled entry:
+        log_entry = SearchStore.LOG_ENTRY
+        log_count = 0
+        tail_size = len(tail_bytes)
+        while position + log_entry.size <= tail_size:
+            kind, key_length, length = log_entry.unpack_from(tail_bytes, position)
+            key_position = position + log_entry.size
+            text_position = key_position + key_length
+            if kind not in (b'P', b'D') or text_position + length > tail_size:
+                break
+            try:
+                key = tail_bytes[key_position:text_position].decode("utf-8")
+            except UnicodeDecodeError:
+                break
+            if kind == b'P':
+                index[key] = (index_offset + text_position, length)
+            else:
+                index.pop(key, None)
+            log_count += 1
+            position = text_position + length
+
+        # Stuff the results back into *search_store*.  *end_offset* is where the valid log
+        # entries end, so that *log_append*() can cut off anything after it:
+        search_store.end_offset = index_offset + position
+        search_store.index = index
+        search_store.log_count = log_count
+
+    # SearchStore.keys_get():
+    def keys_get(self):
+        search_store = self
+        return sorted(search_store.index.keys())
+
+    # SearchStore.log_append():
+    def log_append(self, kind, key, xml_text):
+        # Verify argument types:
+        assert kind in (b'P', b'D')
+        assert isinstance(key, str)
+        assert isinstance(xml_text, str)
+
+        # A brand new store is simply written out in its compacted form:
+        search_store = self
+        index = search_store.index
+        store_file_name = search_store.store_file_name
+        if not os.path.isfile(store_file_name):
+            search_store.compact()
+
+        # Append the log entry just after the last valid one (cutting off any torn entry left
+        # by a crash) and apply it to *index*:
+        key_bytes = key.encode("utf-8")
+        xml_bytes = xml_text.encode("utf-8")
+        with open(store_file_name, "ab") as store_file:
+            if store_file.tell() != search_store.end_offset:
+                store_file.truncate(search_store.end_offset)
+                store_file.seek(0, os.SEEK_END)
+            text_offset = store_file.tell() + SearchStore.LOG_ENTRY.size + len(key_bytes)
+            store_file.write(SearchStore.LOG_ENTRY.pack(kind, len(key_bytes), len(xml_bytes)) +
+                             key_bytes + xml_bytes)
+            search_store.end_offset = store_file.tell()
+        if kind == b'P':
+            index[key] = (text_offset, len(xml_bytes))
+        else:
+            del index[key]
+        search_store.log_count += 1
+
+        # Keep the log from growing without bound:
+        if search_store.log_count > SearchStore.LOG_LIMIT:
+            search_store.compact()
+
+    # SearchStore.search_delete():
+    def search_delete(self, key):
+        # Verify argument types:
+        assert isinstance(key, str)
+
+        # Only log a delete for a *key* that is actually present:
+        search_store = self
+        deleted = key in search_store.index
+        if deleted:
+            search_store.log_append(b'D', key, "")
+        return deleted
+
+    # SearchStore.search_put():
+    def search_put(self, key, xml_text):
+        """ Store *xml_text* under *key* and return *True* if the store actually changed. """
+        # Verify argument types:
+        assert isinstance(key, str)
+        assert isinstance(xml_text, str)
+
+        # Like *file_text_replace*(), nothing is written when the text has not changed:
+        search_store = self
+        changed = search_store.search_xml_get(key) != xml_text
+        if changed:
+            search_store.log_append(b'P', key, xml_text)
+        return changed
+
+    # SearchStore.search_xml_get():
+    def search_xml_get(self, key):
+        """ Return the XML text stored under *key* or *None* if there is none. """
+        # Verify argument types:
+        assert isinstance(key, str)
+
+        # Seek directly to the text using the index of *search_store* (i.e. *self*):
+        search_store = self
+        index_entry = search_store.index.get(key)
+        xml_text = None
+        if index_entry is not None:
+            offset, length = index_entry
+            with open(search_store.store_file_name, "rb") as store_file:
+                store_file.seek(offset)
+                xml_text = store_file.read(length).decode("utf-8")
+        return xml_text
+
+    # SearchStore.xml_texts_get():
+    def xml_texts_get(self):
+        """ Return a *dict* that maps each key of *search_store* (i.e. *self*) to its XML text.
+        """
+        # Read the whole file in one go and slice each text out of it:
+        search_store = self
+        index = search_store.index
+        xml_texts = dict()
+        if len(index) >= 1:
+            with open(search_store.store_file_name, "rb") as store_file:
+                store_bytes = store_file.read()
+            for key, index_entry in index.items():
+                offset, length = index_entry
+                xml_texts[key] = store_bytes[offset:offset + length].decode("utf-8")
+        return xml_texts
 
 
 class Table(Node):
@@ -2064,10 +4472,17 @@ class Table(Node):
         file_name = arguments_table["file_name"]
         assert isinstance(file_name, str)
         is_table_tree = "table_tree" in arguments_table
+        is_header_tree = "header_tree" in arguments_table
         if is_table_tree:
             # assert len(arguments_table) == 3, arguments_table
             assert ("table_tree" in arguments_table and
                     isinstance(arguments_table["table_tree"], etree._Element))
+        elif is_header_tree:
+            # Only the attributes of *header_tree* are used.  The rest of the table is read
+            # in on demand from *file_name* (via the optional *table_cache*):
+            assert isinstance(arguments_table["header_tree"], etree._Element)
+            table_cache = arguments_table.get("table_cache")
+            assert isinstance(table_cache, TableCache) or table_cache is None
         else:
             # This code also winds up pulling out *name*
             # print("len(arguments_table)={0}".format(len(arguments_table)))
@@ -2120,10 +4535,10 @@ class Table(Node):
         title = None
         items = -1
 
-        # Dispatch on *is_table_tree*:
-        if is_table_tree:
+        # Dispatch on *is_table_tree* and *is_header_tree*:
+        if is_table_tree or is_header_tree:
             # Make sure that *table_tree* is actually a Table tag:
-            table_tree = arguments_table["table_tree"]
+            table_tree = arguments_table["table_tree" if is_table_tree else "header_tree"]
             assert table_tree.tag == "Table"
             attributes_table = table_tree.attrib
 
@@ -2138,25 +4553,11 @@ class Table(Node):
             # Extract *url*:
             url = attributes_table["url"]
 
-            # Ensure that we have exactly two elements:
-            table_tree_elements = list(table_tree)
-            assert len(table_tree_elements) == 2
-
-            # Extract the *comments* from *comments_tree_element*:
-            comments = list()
-            comments_tree = table_tree_elements[0]
-            assert comments_tree.tag == "TableComments"
-            for comment_tree in comments_tree:
-                comment = TableComment(comment_tree=comment_tree)
-                comments.append(comment)
-
-            # Extract the *parameters* from *parameters_tree_element*:
-            parameters = list()
-            parameters_tree = table_tree_elements[1]
-            assert parameters_tree.tag == "Parameters"
-            for parameter_tree in parameters_tree:
-                parameter = Parameter(parameter_tree=parameter_tree)
-                parameters.append(parameter)
+            # Extract *comments* and *parameters*, which are left for later from a *header_tree*:
+            comments = None
+            parameters = None
+            if is_table_tree:
+                comments, parameters = Table.elements_parse(table_tree)
             path = ""
             parent = None
         else:
@@ -2186,11 +4587,16 @@ class Table(Node):
         super().__init__(name, path, parent=parent)
         assert url is not None
 
-        # Load up *table* (i.e. *self*):
+        # Load up *table* (i.e. *self*).  *comments* and *parameters* are left unset for a
+        # table built from a *header_tree*, so that *Table.__getattr__*() reads them on first use:
         table = self
         table.base = base
-        table.comments = comments
+        if comments is not None:
+            table.comments = comments
         table.csv_file_name = csv_file_name
+        table.dirty = not (is_table_tree or is_header_tree)
+        table.hash_generation = None
+        table.hash_value = 0
         table.file_name = file_name
         table.id = id
         table.items = items
@@ -2198,8 +4604,10 @@ class Table(Node):
         table.import_headers = None
         table.import_rows = None
         table.name = name
-        table.parameters = parameters
+        if parameters is not None:
+            table.parameters = parameters
         table.searches_table = dict()
+        table.table_cache = table_cache if is_header_tree else None
         table.title = title
         table.url = url
 
@@ -2212,8 +4620,19 @@ class Table(Node):
         # Verify argument types:
         assert isinstance(table2, Table), "{0}".format(type(table2))
 
-        # Compare each field in *table1* (i.e. *self*) with the corresponding field in *table2*:
+        # The header fields are compared first, so that tables that have not been loaded yet
+        # are only loaded when their headers match:
         table1 = self
+        if table1.file_name != table2.file_name or table1.name != table2.name:
+            return False
+
+        # Loaded tables with different contents hashes can not be equal, so the full
+        # comparison below is only done when the hashes match:
+        if (table1.is_loaded() and table2.is_loaded() and
+                table1.contents_hash_get() != table2.contents_hash_get()):
+            return False
+
+        # Compare each field in *table1* (i.e. *self*) with the corresponding field in *table2*:
         file_name_equal = (table1.file_name == table2.file_name)
         name_equal = (table1.name == table2.name)
         comments_equal = (table1.comments == table2.comments)
@@ -2229,6 +4648,24 @@ class Table(Node):
 
         return all_equal
 
+    # Table.__getattr__():
+    def __getattr__(self, name):
+        # This is only called when *name* is not an attribute of *table* (i.e. *self*).  For a
+        # table that was built from just a header, *comments* and *parameters* are read now:
+        table = self
+        if name not in ("comments", "parameters") or "file_name" not in vars(table):
+            raise AttributeError(name)
+        table.load()
+        return vars(table)[name]
+
+    # Table.__hash__():
+    def __hash__(self):
+        # Only the header fields compared by *Table.__eq__*() are hashed.  They are assigned
+        # directly (e.g. by *TreeModel.table_update*()), so the hash is not cached, and hashing
+        # a table never loads its *comments* and *parameters*:
+        table = self
+        return hash((table.file_name, table.name))
+
     def bind_parameters_from_imports(self, tracing=None):
         # Verify argument types:
         assert isinstance(tracing, str) or tracing is None
@@ -2284,6 +4721,7 @@ class Table(Node):
                     parameter = Parameter(name=scrunched_name, type=name, csv=header,
                                           csv_index=column_index, comments=comments)
                     parameters.append(parameter)
+                    table.dirty_mark()
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
@@ -2312,6 +4750,11 @@ class Table(Node):
             # Nope, *table* is not in *tables*, so let's stuff it in:
             if tracing is not None:
                 print("{0}Before len(tables)={1}".format(tracing, len(tables)))
+            # Remember what *table* looked like when it was opened, so that
+            # *TablesEditor.tables_changed_get*() only reports it once it has changed:
+            saved_fingerprints = tables_editor.saved_fingerprints
+            if table.file_name not in saved_fingerprints:
+                saved_fingerprints[table.file_name] = table.fingerprint_get()
             tables_editor.tables_combo_edit.item_append(table)
             if tracing is not None:
                 print("{0}After len(tables)={1}".format(tracing, len(tables)))
@@ -2330,6 +4773,16 @@ class Table(Node):
         if tracing is not None:
             print("{0}<=Table.clicked()".format(tracing))
 
+    # Table.contents_hash_get():
+    def contents_hash_get(self):
+        # Return a hash of the *comments* and *parameters* of *table* (i.e. *self*), which is
+        # cached until the next structure change.  (*Table.load*() also discards it):
+        table = self
+        if table.hash_generation is not structure_generation:
+            table.hash_value = hash((tuple(table.comments), tuple(table.parameters)))
+            table.hash_generation = structure_generation
+        return table.hash_value
+
     # Table.csv_read_and_process():
     def csv_read_and_process(self, csv_directory, bind=False, tracing=None):
         # Verify argument types:
@@ -2460,6 +4913,119 @@ class Table(Node):
             print("{0}<=Table.csv_read_process('{1}', bind={2})".
                   format(tracing, csv_directory, bind))
 
+    # Table.dirty_clear():
+    def dirty_clear(self):
+        table = self
+        table.dirty = False
+        if not table.is_loaded():
+            return
+        for comment in table.comments:
+            comment.dirty_clear()
+        for parameter in table.parameters:
+            parameter.dirty_clear()
+
+    # Table.dirty_mark():
+    def dirty_mark(self):
+        table = self
+        table.dirty = True
+        structure_changed()
+
+    @staticmethod
+    # Table.elements_parse():
+    def elements_parse(table_tree):
+        # Verify argument types:
+        assert isinstance(table_tree, etree._Element)
+
+        # Ensure that we have exactly two elements:
+        table_tree_elements = list(table_tree)
+        assert len(table_tree_elements) == 2
+
+        # Extract the *comments* from *comments_tree_element*:
+        comments = list()
+        comments_tree = table_tree_elements[0]
+        assert comments_tree.tag == "TableComments"
+        for comment_tree in comments_tree:
+            comment = TableComment(comment_tree=comment_tree)
+            comments.append(comment)
+
+        # Extract the *parameters* from *parameters_tree_element*:
+        parameters = list()
+        parameters_tree = table_tree_elements[1]
+        assert parameters_tree.tag == "Parameters"
+        for parameter_tree in parameters_tree:
+            parameter = Parameter(parameter_tree=parameter_tree)
+            parameters.append(parameter)
+        return comments, parameters
+
+    @staticmethod
+    # Table.file_load():
+    def file_load(table_file_name):
+        """ Return the *Table* read from *table_file_name* or an error message string. """
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+
+        # This runs in a *Table.files_load*() worker process, so any problem is returned as
+        # text rather than raised:
+        try:
+            if not table_file_name.endswith(".xml"):
+                result = "'{0}' does not have a .xml suffix".format(table_file_name)
+            else:
+                with open(table_file_name) as table_read_file:
+                    table_input_text = table_read_file.read()
+                table_tree = etree.fromstring(table_input_text)
+                result = Table(file_name=table_file_name, table_tree=table_tree, csv_file_name="")
+        except Exception as error:
+            result = "'{0}': {1}".format(table_file_name, error)
+        return result
+
+    @staticmethod
+    # Table.files_load():
+    def files_load(table_file_names, tracing=None):
+        """ Return the list of *Table*'s read from *table_file_names* in the same order.
+            The files are parsed concurrently in a pool of worker processes.  A file that
+            can not be read is reported and left out rather than stopping the others.
+        """
+        # Verify argument types:
+        assert isinstance(table_file_names, list)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        if tracing is not None:
+            print("{0}=>Table.files_load(<{1} files>)".format(tracing, len(table_file_names)))
+
+        # A worker pool is not worth starting for a single file (or a single processor).
+        # *Executor.map*() hands back the *results* in the same order as *table_file_names*:
+        if len(table_file_names) <= 1 or (os.cpu_count() or 1) <= 1:
+            results = [Table.file_load(table_file_name) for table_file_name in table_file_names]
+        else:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                results = list(executor.map(Table.file_load, table_file_names))
+
+        # Report the failures and keep the tables:
+        tables = list()
+        for result in results:
+            if isinstance(result, Table):
+                tables.append(result)
+            else:
+                print("Unable to load table {0}".format(result))
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=Table.files_load(<{1} files>)=><{2} tables>".
+                  format(tracing, len(table_file_names), len(tables)))
+        return tables
+
+    # Table.fingerprint_get():
+    def fingerprint_get(self):
+        # Combine the fields of *table* (i.e. *self*) with the fingerprints of its *comments*
+        # and *parameters*.  Only the comments (which hold most of the text) are cached, so
+        # this is cheap to recompute after any change:
+        table = self
+        return values2fingerprint((
+          "Table", table.name, table.csv_file_name, table.title, table.url,
+          [comment.fingerprint_get() for comment in table.comments],
+          [parameter.fingerprint_get() for parameter in table.parameters]))
+
     def fix_up(self, tracing=None):
         # Verify argument types:
         assert isinstance(tracing, str) or tracing is None
@@ -2495,8 +5061,26 @@ class Table(Node):
                 search_parent = searches_table[search_parent_name]
                 search.search_parent = search_parent
 
+        # Fill in the template *depth* of every search with one pass over the parent links.
+        # Each chain of parents is only walked as far as a search whose *depth* is known:
+        depths_table = dict()
+        for search in searches:
+            chain = list()
+            nested_search = search
+            while nested_search is not None and nested_search not in depths_table:
+                chain.append(nested_search)
+                assert len(chain) <= len(searches), "Search '{0}' has a parent loop".format(
+                                                     search.name)
+                nested_search = nested_search.search_parent
+            depth = -1 if nested_search is None else depths_table[nested_search]
+            for nested_search in reversed(chain):
+                depth += 1
+                depths_table[nested_search] = depth
+                nested_search.depth = depth
+
         # Now sort *searches*:
         searches.sort(key=Search.key)
+        table.children_renumber()
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
@@ -2526,6 +5110,66 @@ class Table(Node):
             header_labels.append(header_label)
         return header_labels
 
+    @staticmethod
+    # Table.header_tree_get():
+    def header_tree_get(file_name):
+        # Verify argument types:
+        assert isinstance(file_name, str)
+
+        # Incrementally parse *file_name* a small chunk at a time only as far as the start of
+        # the root element, whose attributes are complete at that point, and stop reading there:
+        header_tree = None
+        parser = etree.XMLPullParser(events=("start",))
+        with open(file_name, "rb") as table_file:
+            while header_tree is None:
+                chunk = table_file.read(1024)
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    header_tree = element
+                    break
+                if len(chunk) == 0:
+                    break
+        assert header_tree is not None and header_tree.tag == "Table", (
+          "'{0}' does not start with a <Table> element".format(file_name))
+        return header_tree
+
+    # Table.is_dirty():
+    def is_dirty(self):
+        # *table* (i.e. *self*) is dirty if it, any of its *comments*, or any of its *parameters*
+        # has changed.  Nothing below a table that has not been loaded yet can have changed:
+        table = self
+        if not table.is_loaded():
+            return table.dirty
+        return (table.dirty or
+                any(comment.dirty for comment in table.comments) or
+                any(parameter.is_dirty() for parameter in table.parameters))
+
+    # Table.is_loaded():
+    def is_loaded(self):
+        # Return *True* once the *comments* and *parameters* of *table* (i.e. *self*) are present:
+        table = self
+        return "parameters" in vars(table)
+
+    # Table.load():
+    def load(self):
+        # Read in the *comments* and *parameters* of a *table* (i.e. *self*) that was built from
+        # just a header, preferring the *table_cache* (if any) over parsing the XML again:
+        table = self
+        if not table.is_loaded():
+            file_name = table.file_name
+            table_cache = table.table_cache
+            if table_cache is None:
+                with open(file_name) as table_file:
+                    table_tree = etree.fromstring(table_file.read())
+                comments, parameters = Table.elements_parse(table_tree)
+            else:
+                full_table = table_cache.table_load(file_name)
+                comments = full_table.comments
+                parameters = full_table.parameters
+            table.comments = comments
+            table.parameters = parameters
+            table.hash_generation = None
+
     # Table.save():
     def save(self, tracing=None):
         # Verify argument types:
@@ -2537,15 +5181,18 @@ class Table(Node):
         if tracing is not None:
             print("{0}=>Table.save('{1}')".format(tracing, table.name))
 
-        # Write out *table* (i.e. *self*) to *file_name*:
-        output_file_name = table.file_name
-        xml_text = table.to_xml_string()
-        with open(output_file_name, "w") as output_file:
-            output_file.write(xml_text)
+        # Only a dirty *table* (i.e. *self*) is written out to *file_name*, and even then the
+        # file is left alone if its contents would not change:
+        written = False
+        if table.is_dirty():
+            output_file_name = table.file_name
+            written = file_stream_replace(output_file_name, table.xml_file_write)
+            table.dirty_clear()
 
-        # Wrap up any requested *tracing*:
+        # Wrap up any requested *tracing* and return whether *file_name* was actually written:
         if tracing is not None:
             print("{0}=>Table.save('{1}')".format(tracing, table.name))
+        return written
 
     # Table.search_directory_get():
     def search_directory_get(self, tracing=None):
@@ -2588,6 +5235,16 @@ class Table(Node):
             print("{0}<=Table.search_directory_get()=>'{1}'".format(tracing, directory_path))
         return directory_path
 
+    # Table.search_store_file_name_get():
+    def search_store_file_name_get(self, tracing=None):
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # When the searches of *table* (i.e. *self*) are packed, they live in a single
+        # *SearchStore* file that sits next to the one file per search directory:
+        table = self
+        return table.search_directory_get(tracing=tracing) + SearchStore.SUFFIX
+
     # Table.searches_table_set():
     def searches_table_set(self, searches_table):
         # Verify argument types:
@@ -2609,54 +5266,210 @@ class Table(Node):
     # Table.to_xml_string():
     def to_xml_string(self):
         table = self
-        xml_lines = list()
-        xml_lines.append('<?xml version="1.0"?>')
-        table.xml_lines_append(xml_lines, "")
-        xml_lines.append("")
-        text = '\n'.join(xml_lines)
-        return text
+        xml_file = io.StringIO()
+        table.xml_file_write(xml_file)
+        return xml_file.getvalue()
 
     # Table.type_letter_get():
     def type_letter_get(self):
         return 'T'
 
-    # Table.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
+    # Table.xml_file_write():
+    def xml_file_write(self, xml_file):
+        # Write the XML header followed by the *table* (i.e. *self*) to *xml_file*:
+        table = self
+        xml_writer = XMLWriter(xml_file)
+        xml_writer.header_write()
+        table.xml_write(xml_writer, "")
+
+    # Table.xml_write():
+    def xml_write(self, xml_writer, indent):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
-        # Start appending the `<Table...>` element:
+        # Start writing the `<Table...>` element.  The odd spacing before the optional
+        # *title* attribute is retained so that existing files are rewritten byte for byte:
         table = self
         title = table.title
-        title_text = "" if title is None else ' title="{0}"'.format(title)
-
-        # Do not let reserved XML characters get into *title_text*:
-        title_text = title_text.replace('&', '+')
-        title_text = title_text.replace('<', '[')
-        title_text = title_text.replace('>', ']')
-
-        xml_lines.append('{0}<Table name="{1}" csv_file_name="{2}" url="{3}" {4}>'.format(
-                         indent, table.name, table.csv_file_name, table.url, title_text))
-
-        # Append the `<TableComments>` element:
-        xml_lines.append('{0}  <TableComments>'.format(indent))
+        title_text = ""
+        if title is not None:
+            # Do not let reserved XML characters get into *title*:
+            title = title.replace('&', '+').replace('<', '[').replace('>', ']')
+            title_text = XMLWriter.attributes_text_get((("title", title),))
+        xml_writer.element_start(indent, "Table", (
+          ("name", table.name),
+          ("csv_file_name", table.csv_file_name),
+          ("url", table.url)), tail=" " + title_text)
+
+        # Write out the `<TableComments>` element:
+        table_comments_indent = indent + "  "
+        xml_writer.element_start(table_comments_indent, "TableComments")
         for comment in table.comments:
-            comment.xml_lines_append(xml_lines, indent + "    ")
-        xml_lines.append('{0}  </TableComments>'.format(indent))
+            comment.xml_write(xml_writer, indent + "    ")
+        xml_writer.element_end(table_comments_indent, "TableComments")
 
-        # Append the `<Parameters>` element:
-        xml_lines.append('{0}  <Parameters>'.format(indent))
+        # Write out the `<Parameters>` element:
+        parameters_indent = indent + "  "
+        xml_writer.element_start(parameters_indent, "Parameters")
         for parameter in table.parameters:
-            parameter.xml_lines_append(xml_lines, "    ")
-        xml_lines.append('{0}  </Parameters>'.format(indent))
+            parameter.xml_write(xml_writer, indent + "    ")
+        xml_writer.element_end(parameters_indent, "Parameters")
 
         # Close out the `<Table>` element:
-        xml_lines.append('{0}</Table>'.format(indent))
+        xml_writer.element_end(indent, "Table")
+
+
+class TableCache:
+    """ A *TableCache* object keeps a binary copy of each parsed *Table* in a cache directory
+    so that reloading an unchanged table file skips both XML parsing and building all of the
+    *Parameter*, *Comment*, and *Enumeration* objects.
+
+    Each entry is named by a digest of the absolute table file name and starts with a header
+    that records *ENGINE_VERSION* and the size and modification time of the table file the
+    entry was built from.  Any mismatch simply misses and the entry is rebuilt.  Entries are
+    written to a uniquely named temporary file that is renamed into place, so concurrent
+    writers can never produce a torn entry.
+    """
+
+    # Bump *ENGINE_VERSION* whenever the attributes of *Table* or anything it contains change:
+    ENGINE_VERSION = 2
+    MAGIC = b"TTTABLES"
+    HEADER = struct.Struct("<8sIqq")
+    SUFFIX = ".table"
+
+    # TableCache.__init__():
+    def __init__(self, cache_directory):
+        # Verify argument types:
+        assert isinstance(cache_directory, str)
+
+        # Load up *table_cache* (i.e. *self*):
+        table_cache = self
+        table_cache.cache_directory = cache_directory
+
+    # TableCache.entry_file_name_get():
+    def entry_file_name_get(self, table_file_name):
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+
+        table_cache = self
+        key = hashlib.blake2b(os.path.abspath(table_file_name).encode("utf-8"),
+                              digest_size=16).hexdigest()
+        return os.path.join(table_cache.cache_directory, key + TableCache.SUFFIX)
+
+    # TableCache.table_load():
+    def table_load(self, table_file_name, tracing=None):
+        """ Return the *Table* read from *table_file_name*, from the cache whenever possible. """
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Read the entry for *table_file_name* (if it exists):
+        table_cache = self
+        table_stat = os.stat(table_file_name)
+        entry_file_name = table_cache.entry_file_name_get(table_file_name)
+        try:
+            with open(entry_file_name, "rb") as entry_file:
+                entry_bytes = entry_file.read()
+        except FileNotFoundError:
+            entry_bytes = b""
+
+        # Decode *table*, quietly treating damaged or out of date entries as a miss:
+        table = None
+        header = TableCache.HEADER
+        if len(entry_bytes) >= header.size:
+            magic, engine_version, mtime_ns, size = header.unpack_from(entry_bytes, 0)
+            if (magic == TableCache.MAGIC and engine_version == TableCache.ENGINE_VERSION and
+                    mtime_ns == table_stat.st_mtime_ns and size == table_stat.st_size):
+                try:
+                    table = pickle.loads(entry_bytes[header.size:])
+                except Exception:
+                    table = None
+                if isinstance(table, Table):
+                    # *table* may have been cached under a different (but equivalent) name:
+                    table.file_name = table_file_name
+
+        # On a miss, parse *table_file_name* and store a fresh entry:
+        is_hit = table is not None
+        if not is_hit:
+            with open(table_file_name) as table_file:
+                table_text = table_file.read()
+            table_tree = etree.fromstring(table_text)
+            table = Table(file_name=table_file_name, table_tree=table_tree)
+            table_cache.table_store(table, table_stat)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}TableCache.table_load('{1}')=>{2}".
+                  format(tracing, table_file_name, "hit" if is_hit else "miss"))
+        return table
+
+    # TableCache.table_warm():
+    def table_warm(self, table_file_name):
+        """ Make sure that the entry for *table_file_name* is up to date and return *True* if
+            it had to be (re)created.  Only the header of a current entry is read.
+        """
+        # Verify argument types:
+        assert isinstance(table_file_name, str)
+
+        # Compare the header of the entry with *table_file_name*:
+        table_cache = self
+        table_stat = os.stat(table_file_name)
+        header = TableCache.HEADER
+        try:
+            with open(table_cache.entry_file_name_get(table_file_name), "rb") as entry_file:
+                header_bytes = entry_file.read(header.size)
+        except FileNotFoundError:
+            header_bytes = b""
+        is_current = (len(header_bytes) == header.size and header.unpack(header_bytes) ==
+                      (TableCache.MAGIC, TableCache.ENGINE_VERSION,
+                       table_stat.st_mtime_ns, table_stat.st_size))
+
+        # Parse and store *table_file_name* when its entry is missing or out of date:
+        if not is_current:
+            table_cache.table_load(table_file_name)
+        return not is_current
+
+    # TableCache.table_store():
+    def table_store(self, table, table_stat):
+        # Verify argument types:
+        assert isinstance(table, Table)
+        assert isinstance(table_stat, os.stat_result)
+
+        # Do not cache a *table* whose file changed while it was being read, since the entry
+        # would be labeled with the wrong modification time:
+        table_file_name = table.file_name
+        new_table_stat = os.stat(table_file_name)
+        if (new_table_stat.st_mtime_ns == table_stat.st_mtime_ns and
+                new_table_stat.st_size == table_stat.st_size):
+            # Encode the entry and write it to a unique temporary file that is renamed into
+            # place.  Failing to write an entry is never fatal; the table is just reparsed:
+            table_cache = self
+            cache_directory = table_cache.cache_directory
+            entry_bytes = TableCache.HEADER.pack(
+              TableCache.MAGIC, TableCache.ENGINE_VERSION,
+              table_stat.st_mtime_ns, table_stat.st_size)
+            entry_bytes += pickle.dumps(table, pickle.HIGHEST_PROTOCOL)
+            try:
+                os.makedirs(cache_directory, exist_ok=True)
+                temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(
+                    dir=cache_directory, prefix=".", suffix=".tmp")
+                try:
+                    with os.fdopen(temporary_file_descriptor, "wb") as temporary_file:
+                        temporary_file.write(entry_bytes)
+                    os.replace(temporary_file_name,
+                               table_cache.entry_file_name_get(table_file_name))
+                except BaseException:
+                    os.unlink(temporary_file_name)
+                    raise
+            except OSError as error:
+                print("Unable to cache '{0}': {1}".format(table_file_name, error))
 
 
 class TableComment(Comment):
 
+    __slots__ = ()
+
     # TableComment.__init__():
     def __init__(self, **arguments_table):
         # Verify argument types:
@@ -2683,23 +5496,33 @@ class TableComment(Comment):
         assert isinstance(table_comment2, TableComment)
         return super().__eq__(table_comment2)
 
-    # TableComment.xml_lines_append():
-    def xml_lines_append(self, xml_lines, indent):
+    # TableComment.xml_write():
+    def xml_write(self, xml_writer, indent):
         # Verify argument types:
-        assert isinstance(xml_lines, list)
+        assert isinstance(xml_writer, XMLWriter)
         assert isinstance(indent, str)
 
-        # Append the <TableComment...> element:
+        # Write the <TableComment...> element:
         table_comment = self
-        xml_lines.append('{0}<TableComment language="{1}">'.format(indent, table_comment.language))
+        xml_writer.element_start(indent, "TableComment", (("language", table_comment.language),))
+        line_indent = indent + "  "
         for line in table_comment.lines:
-            xml_lines.append('{0}  {1}'.format(indent, line))
-        xml_lines.append('{0}</TableComment>'.format(indent))
+            xml_writer.text_line(line_indent, line)
+        xml_writer.element_end(indent, "TableComment")
 
 
 # TablesEditor:
 class TablesEditor(QMainWindow):
 
+    # The largest number of quick find matches whose directories are fetched and expanded:
+    FIND_REVEAL_LIMIT = 20
+
+    # The number of milliseconds of typing inactivity before an exact result count is run:
+    RESULTS_COUNT_DELAY = 400
+
+    # The number of randomly sampled rows used to estimate result counts:
+    RESULTS_SAMPLE_SIZE = 2000
+
     # TablesEditor.__init__()
     def __init__(self, tables, tracing=None):
         # Verify argument types:
@@ -2779,12 +5602,28 @@ class TablesEditor(QMainWindow):
         tables_editor.current_search = None
         tables_editor.current_table = current_table
         tables_editor.current_tables = tables
+        tables_editor.find_matched_paths = set()
+        tables_editor.find_visible_paths = set()
+        tables_editor.find_words = None
         tables_editor.in_signal = True
         tables_editor.languages = ["English", "Spanish", "Chinese"]
         tables_editor.main_window = main_window
-        tables_editor.original_tables = copy.deepcopy(tables)
+        tables_editor.model = None
+        tables_editor.saved_fingerprints = dict([(table.file_name, table.fingerprint_get())
+                                                 for table in tables])
         tables_editor.re_table = TablesEditor.re_table_get()
+        tables_editor.results_cache = ResultsCache(TablesEditor.results_cache_directory_get())
+        tables_editor.results_csv_file_name = "download.csv"
+        tables_editor.results_csv_mtime = None
+        tables_editor.results_query_indexes = None
+        tables_editor.results_row_ids = list()
+        tables_editor.results_rows = list()
+        tables_editor.results_sample_row_ids = list()
+        tables_editor.results_search = None
+        tables_editor.results_sort_columns = list()
+        tables_editor.results_sort_keys_table = dict()
         tables_editor.searches = list()
+        tables_editor.searches_dirty = False
         tables_editor.search_directory = "/home/wayne/public_html/projects/tables_editor/searches"
         tables_editor.tab_unload = None
         tables_editor.tables = tables
@@ -2927,9 +5766,32 @@ class TablesEditor(QMainWindow):
         mw.searches_table_combo.currentTextChanged.connect(tables_editor.searches_table_changed)
         mw.root_tabs.currentChanged.connect(tables_editor.tab_changed)
 
+        # Typing in a [Select] cell of *filters_table* shows an estimated result count right
+        # away and the exact count once the typing pauses for *results_count_timer*:
+        filters_table = mw.filters_table
+        filter_select_delegate = FilterSelectDelegate(tables_editor)
+        filters_table.setItemDelegateForColumn(3, filter_select_delegate)
+        filters_table.itemChanged.connect(tables_editor.filters_table_item_changed)
+        mw.filters_query_line.editingFinished.connect(tables_editor.filters_query_changed)
+        mw.filters_explain.clicked.connect(tables_editor.filters_explain_clicked)
+        results_count_timer = QTimer()
+        results_count_timer.setSingleShot(True)
+        results_count_timer.setInterval(TablesEditor.RESULTS_COUNT_DELAY)
+        results_count_timer.timeout.connect(partial(TablesEditor.results_count_show,
+                                                    tables_editor, True))
+        tables_editor.filter_select_delegate = filter_select_delegate
+        tables_editor.results_count_timer = results_count_timer
+
+        # Sorting of *results_table* is done by *TablesEditor.results_table_fill*() using
+        # precomputed sort keys rather than by the (lexical only) built in widget sorting:
+        results_header = mw.results_table.horizontalHeader()
+        results_header.setSortIndicatorShown(True)
+        results_header.sectionClicked.connect(tables_editor.results_header_clicked)
+
         mw.collections_new.clicked.connect(tables_editor.collections_new_clicked)
         mw.collections_new.setEnabled(False)
         mw.collections_line.textChanged.connect(tables_editor.collections_line_changed)
+        mw.collections_find_line.textChanged.connect(tables_editor.collections_find_changed)
         mw.collections_tree.clicked.connect(tables_editor.collections_tree_clicked)
         mw.collections_delete.clicked.connect(tables_editor.collections_delete_clicked)
         mw.collections_delete.setEnabled(False)
@@ -2965,7 +5827,12 @@ class TablesEditor(QMainWindow):
                 root_node.add_child(digikey_collection)
                 root_node.add_child(digikey_collection2)
 
-                model = TreeModel(root_node)
+                model = TreeModel(root_node,
+                                  catalog_file_name=TablesEditor.catalog_file_name_get())
+
+                # Directories are filled in from the tree as it was when the editor last
+                # exited and are then checked against the file system:
+                model.snapshot_load(TablesEditor.tree_snapshot_file_name_get())
 
                 # tree_object_model = TreeModel()
                 # assert isinstance(tree_object_model, TreeObjectModel)
@@ -2975,6 +5842,8 @@ class TablesEditor(QMainWindow):
 
             print("module=", model)
             collections_tree.setModel(model)
+            collections_tree.collapsed.connect(model.fetch_cancel)
+            model.rowsInserted.connect(tables_editor.collections_rows_inserted)
             # collections_tree.setRootIndex(model.index(path))
             collections_tree.setSortingEnabled(True)
         # elif isinstance(collections_tree, QTreeWidget):
@@ -3063,6 +5932,19 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}<=TablesEditor.__init__(...)\n".format(tracing))
 
+    @staticmethod
+    # TablesEditor.catalog_file_name_get():
+    def catalog_file_name_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/catalog.sqlite3"
+
+    # TablesEditor.catalog_get():
+    def catalog_get(self):
+        """ Return the *Catalog* of the collections tree or *None* if there is none. """
+        # The *catalog* is opened by the *TreeModel* the first time it is needed:
+        tables_editor = self
+        model = tables_editor.model
+        return model.catalog_get() if isinstance(model, TreeModel) else None
+
     # TablesEditor.comment_text_set()
     def comment_text_set(self, new_text, tracing=None):
         # Verify argument types:
@@ -3154,25 +6036,91 @@ class TablesEditor(QMainWindow):
                         tables_editor.current_model_index = parent_search_model_index
                         tables_editor.current_search = search_parent
 
-                    # Remove the associated files:
+                    # Remove the associated files (or *SearchStore* entry):
                     search_directory = table.search_directory_get(tracing=next_tracing)
                     file_name_base = search.title2file_name(current_search.name)
                     file_name_prefix = os.path.join(search_directory, file_name_base)
                     xml_file_name = file_name_prefix + ".xml"
                     csv_file_name = file_name_prefix + ".csv"
+                    search_store_file_name = search_directory + SearchStore.SUFFIX
                     if os.path.isfile(xml_file_name):
                         os.remove(xml_file_name)
                     if os.path.isfile(csv_file_name):
                         os.remove(csv_file_name)
+                    if os.path.isfile(search_store_file_name):
+                        SearchStore(search_store_file_name).search_delete(file_name_base)
             else:
                 print("Non-search node '{0}' selected???".format(node.name))
 
-        # Update the collections tab:
-        tables_editor.update(tracing=next_tracing)
+        # Update the collections tab:
+        tables_editor.update(tracing=next_tracing)
+
+        # Wrap up any requested signal tracing:
+        if trace_signals:
+            print("<=Tables_Editor.collections_delete_clicked()\n")
+
+    # TablesEditor.collections_find_changed():
+    def collections_find_changed(self, text):
+        """ Show only the parts of the collections tree whose tables or directories have a title
+            that contains *text*.  An empty *text* shows everything again.
+        """
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        # Perform any requested signal tracing:
+        tables_editor = self
+        trace_signals = tables_editor.trace_signals
+        if trace_signals:
+            print("=>Tables_Editor.collections_find_changed('{0}')".format(text))
+
+        # Look *text* up in the *title_index* of the whole collection:
+        model = tables_editor.model
+        if model is not None:
+            model.user_activity_note()
+            collections_tree = tables_editor.main_window.collections_tree
+            matches = model.title_index_get().find(text) if text.strip() != "" else None
+
+            # A node stays visible when it matches or is above a match (which is figured out
+            # from the match paths, without reading any directories).  These are kept for
+            # *TablesEditor.collections_rows_inserted*(), which filters rows fetched later:
+            matched_paths = set()
+            visible_paths = set()
+            if matches is not None:
+                for path, title, is_table in matches:
+                    matched_paths.add(path)
+                    while path not in visible_paths and path != os.path.dirname(path):
+                        visible_paths.add(path)
+                        path = os.path.dirname(path)
+            tables_editor.find_matched_paths = matched_paths
+            tables_editor.find_visible_paths = visible_paths
+            tables_editor.find_words = (None if matches is None else
+                                        TitleIndex.text_normalize(text).split())
+
+            # When there are just a few matches, fetch the directories above each of them
+            # (and only those) and expand them:
+            if matches is not None and len(matches) <= TablesEditor.FIND_REVEAL_LIMIT:
+                for path, title, is_table in matches:
+                    for node in model.path_reveal(path)[:-1]:
+                        collections_tree.expand(model.model_index_get(node))
+
+            # Hide the rows of the nodes that are already in the tree and are not visible.  Nodes
+            # below a matching directory are all shown:
+            pending_pairs = [(node, False) for node in model.root_node.children]
+            while len(pending_pairs) >= 1:
+                node, is_matched = pending_pairs.pop()
+                model_index = model.model_index_get(node)
+                for row, child in enumerate(node.children):
+                    if isinstance(child, (Directory, Table)):
+                        path = child.file_name if isinstance(child, Table) else child.path
+                        is_hidden = (matches is not None and not is_matched and
+                                     path not in visible_paths)
+                        collections_tree.setRowHidden(row, model_index, is_hidden)
+                        if isinstance(child, Directory):
+                            pending_pairs.append((child, is_matched or path in matched_paths))
 
         # Wrap up any requested signal tracing:
         if trace_signals:
-            print("<=Tables_Editor.collections_delete_clicked()\n")
+            print("<=Tables_Editor.collections_find_changed('{0}')\n".format(text))
 
     # TablesEditor.collections_line_changed():
     def collections_line_changed(self, text):
@@ -3241,7 +6189,10 @@ class TablesEditor(QMainWindow):
             # if tracing is not None:
             #    print("{0}1:len(searches)={1}".format(tracing, len(searches)))
             table.fix_up(tracing=next_tracing)
-            new_search.save(tracing=next_tracing)
+            search_file_name = new_search.save(tracing=next_tracing)
+            catalog = tables_editor.catalog_get()
+            if catalog is not None:
+                catalog.search_update(search_file_name)
 
             model_index = tables_editor.current_model_index
             if model_index is not None:
@@ -3260,6 +6211,50 @@ class TablesEditor(QMainWindow):
         if trace_signals:
             print("<=TablesEditor.collections_new_clicked()\n")
 
+    # TablesEditor.collections_rows_inserted():
+    def collections_rows_inserted(self, parent_model_index, first, last):
+        """ Apply the current quick find to rows *first* through *last* that were just added
+            below *parent_model_index* (e.g. by a background fetch.)
+        """
+        # Verify argument types:
+        assert isinstance(parent_model_index, QModelIndex)
+        assert isinstance(first, int)
+        assert isinstance(last, int)
+
+        # Nothing is hidden unless a find is showing:
+        tables_editor = self
+        find_words = tables_editor.find_words
+        model = tables_editor.model
+        if find_words is not None and model is not None:
+            # Every node below a matching directory is shown:
+            matched_paths = tables_editor.find_matched_paths
+            visible_paths = tables_editor.find_visible_paths
+            parent_node = model.getNode(parent_model_index)
+            is_matched = False
+            node = parent_node
+            while node is not None and not is_matched:
+                is_matched = isinstance(node, Directory) and node.path in matched_paths
+                node = node.parent
+
+            # Otherwise, a new row is shown when it matches or is known to be above a match:
+            collections_tree = tables_editor.main_window.collections_tree
+            children = parent_node.children
+            for row in range(first, min(last + 1, len(children))):
+                child = children[row]
+                if isinstance(child, (Directory, Table)):
+                    if isinstance(child, Table):
+                        path = child.file_name
+                        title = child.title
+                    else:
+                        path = child.path
+                        title = child.title_get()
+                    normalized_title = TitleIndex.text_normalize(title)
+                    if all([word in normalized_title for word in find_words]):
+                        matched_paths.add(path)
+                        visible_paths.add(path)
+                    is_hidden = not (is_matched or path in visible_paths)
+                    collections_tree.setRowHidden(row, parent_model_index, is_hidden)
+
     # TablesEditor.collections_tree_clicked():
     def collections_tree_clicked(self, model_index):
         # Verify argument types:
@@ -3278,6 +6273,7 @@ class TablesEditor(QMainWindow):
         # data = model_index.data()
         # parent = model_index.parent()
         model = model_index.model()
+        model.user_activity_note()
         node = model.getNode(model_index)
         node.clicked(tables_editor, tracing=next_tracing)
 
@@ -3343,11 +6339,14 @@ class TablesEditor(QMainWindow):
             table = current_search.parent
             assert isinstance(table, Table)
             search_directory = table.search_directory_get()
-            xml_file_name_base = current_search.title2file_name(search_name) + ".xml"
-            xml_file_name = os.path.join(search_directory, xml_file_name_base)
+            file_name_base = current_search.title2file_name(search_name)
+            xml_file_name = os.path.join(search_directory, file_name_base + ".xml")
+            search_store_file_name = search_directory + SearchStore.SUFFIX
             if tracing is not None:
                 print("{0}xml_file_name='{1}'".format(tracing, xml_file_name))
-            if os.path.isfile(xml_file_name):
+            if (os.path.isfile(xml_file_name) or
+                    (os.path.isfile(search_store_file_name) and
+                     file_name_base in SearchStore(search_store_file_name).index)):
                 # print("here 2")
                 why = "Already exists"
                 new_button_enable = False
@@ -3669,7 +6668,7 @@ class TablesEditor(QMainWindow):
             assert len(comments) >= 1
             comment = comments[0]
             assert isinstance(comment, EnumerationComment)
-            comment.lines = text.split('\n')
+            comment.lines_set(text.split('\n'))
             comment.position = position
 
         # Wrap up any requested *tracing*:
@@ -3814,6 +6813,7 @@ class TablesEditor(QMainWindow):
                     filter_at = filters[current_row_index]
                     filters[current_row_index + 1] = filter_at
                     filters[current_row_index] = filter_after
+                    current_search.dirty_mark()
 
                     # Force the *filters_table* to be updated:
                     tables_editor.filters_update(tracing=next_tracing)
@@ -3824,6 +6824,92 @@ class TablesEditor(QMainWindow):
         if trace_signals:
             print("<=TablesEditor.filters_down_button_clicked()\n")
 
+    # TablesEditor.filters_explain_clicked():
+    def filters_explain_clicked(self):
+        # Perform any requested signal tracing:
+        tables_editor = self
+        trace_signals = tables_editor.trace_signals
+        next_tracing = " " if trace_signals else None
+        if trace_signals:
+            print("=>TablesEditor.filters_explain_clicked()")
+
+        # Explain the *query* of *current_search* against the current CSV file rows:
+        current_search = tables_editor.current_search
+        query = None if current_search is None else current_search.query
+        if query is None:
+            lines = ["No query"]
+        elif not tables_editor.results_rows_load(tracing=next_tracing):
+            lines = ["No '{0}' file".format(tables_editor.results_csv_file_name)]
+        else:
+            lines = query.explain(tables_editor.results_query_indexes_get())
+        main_window = tables_editor.main_window
+        main_window.filters_query_line.setToolTip("\n".join(lines))
+        main_window.statusbar.showMessage("; ".join([line.strip() for line in lines]))
+        if trace_signals:
+            for line in lines:
+                print(" " + line)
+
+        # Wrap up any requested signal tracing:
+        if trace_signals:
+            print("<=TablesEditor.filters_explain_clicked()\n")
+
+    # TablesEditor.filters_query_changed():
+    def filters_query_changed(self):
+        # Perform any requested signal tracing:
+        tables_editor = self
+        trace_signals = tables_editor.trace_signals
+        next_tracing = " " if trace_signals else None
+        if trace_signals:
+            print("=>TablesEditor.filters_query_changed()")
+
+        # Compile the query text into *current_search* reporting any errors in the status bar:
+        main_window = tables_editor.main_window
+        current_search = tables_editor.current_search
+        if current_search is not None:
+            text = main_window.filters_query_line.text()
+            query = current_search.query
+            if text != ("" if query is None else query.text):
+                try:
+                    current_search.query_set(text)
+                except ValueError as error:
+                    main_window.statusbar.showMessage(str(error))
+                else:
+                    tables_editor.results_count_show(tracing=next_tracing)
+
+        # Wrap up any requested signal tracing:
+        if trace_signals:
+            print("<=TablesEditor.filters_query_changed()\n")
+
+    # TablesEditor.filters_table_item_changed()
+    def filters_table_item_changed(self, item):
+        # Verify argument types:
+        assert isinstance(item, QTableWidgetItem)
+
+        # Ignore the item changes caused by *TablesEditor.filters_update*() filling in the table:
+        tables_editor = self
+        filter = item.data(Qt.UserRole)
+        if not tables_editor.in_signal and isinstance(filter, Filter):
+            # Perform any requested signal tracing:
+            trace_signals = tables_editor.trace_signals
+            next_tracing = " " if trace_signals else None
+            if trace_signals:
+                print("=>TablesEditor.filters_table_item_changed('{0}')".
+                      format(filter.parameter.name))
+
+            # A confirmed edit of the [Select] cell or a toggle of the [Use] check box runs
+            # the exact count right away:
+            if item is filter.select_item:
+                filter.select_set(item.text())
+            elif item is filter.use_item:
+                filter.use_set(item.checkState() == Qt.CheckState.Checked)
+            tables_editor.results_count_timer.stop()
+            tables_editor.results_count_show(tracing=next_tracing)
+
+            # Wrap up any requested signal tracing:
+            if trace_signals:
+                print("<=TablesEditor.filters_table_item_changed('{0}')\n".
+                      format(filter.parameter.name))
+
     # TablesEditor.filters_unload()
     def filters_unload(self, tracing=None):
         # Verify argument types:
@@ -3846,13 +6932,13 @@ class TablesEditor(QMainWindow):
                     check_state = use_item.checkState()
                     if check_state == Qt.CheckState.Checked:
                         use = True
-                filter.use = use
+                filter.use_set(use)
 
                 select = ""
                 select_item = filter.select_item
                 if select_item is not None:
                     select = select_item.text()
-                filter.select = select
+                filter.select_set(select)
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
@@ -3899,6 +6985,7 @@ class TablesEditor(QMainWindow):
                     filter_at = filters[current_row_index]
                     filters[current_row_index - 1] = filter_at
                     filters[current_row_index] = filter_before
+                    current_search.dirty_mark()
 
                     # Force the *filters_table* to be updated:
                     tables_editor.filters_update(tracing=next_tracing)
@@ -3922,8 +7009,13 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}=>TablesEditor.filters_update()".format(tracing))
 
-        # Empty out *filters_table* widget:
+        # Filling in *filters_table* fires *itemChanged* for every item, so those signals are
+        # ignored by *TablesEditor.filters_table_item_changed*() until the table is full:
         tables_editor = self
+        in_signal = tables_editor.in_signal
+        tables_editor.in_signal = True
+
+        # Empty out *filters_table* widget:
         main_window = tables_editor.main_window
         filters_table = main_window.filters_table
         filters_table.clearContents()
@@ -4006,6 +7098,14 @@ class TablesEditor(QMainWindow):
             #    filters_down.setEnabled(False)
             #    filters_up.setEnabled(False)
 
+        tables_editor.in_signal = in_signal
+
+        # Show the *query* text of *current_search* (if any):
+        query = None if current_search is None else current_search.query
+        filters_query_line = main_window.filters_query_line
+        filters_query_line.setText("" if query is None else query.text)
+        filters_query_line.setEnabled(current_search is not None)
+
         # Remember to unload the filters before changing from the [Filters] tab:
         tables_editor.tab_unload = TablesEditor.filters_unload
 
@@ -4013,6 +7113,31 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}<=TablesEditor.filters_update()".format(tracing))
 
+    # TablesEditor.filter_select_edited()
+    def filter_select_edited(self, filter, text):
+        # Verify argument types:
+        assert isinstance(filter, Filter)
+        assert isinstance(text, str)
+
+        # Perform any requested signal tracing:
+        tables_editor = self
+        trace_signals = tables_editor.trace_signals
+        next_tracing = " " if trace_signals else None
+        if trace_signals:
+            print("=>TablesEditor.filter_select_edited('{0}', '{1}')".
+                  format(filter.parameter.name, text))
+
+        # Track the partially typed *text* in *filter*, show an estimate immediately, and
+        # (re)start the timer for the exact count:
+        filter.select_set(text)
+        tables_editor.results_count_estimate_show(tracing=next_tracing)
+        tables_editor.results_count_timer.start()
+
+        # Wrap up any requested signal tracing:
+        if trace_signals:
+            print("<=TablesEditor.filter_select_edited('{0}', '{1}')\n".
+                  format(filter.parameter.name, text))
+
     # TablesEditor.filter_use_clicked()
     def filter_use_clicked(self, use_item, filter, row, column):
         # Verify argument types:
@@ -4039,10 +7164,10 @@ class TablesEditor(QMainWindow):
             print("check-state=", check_state)
             if check_state == Qt.CheckState.Checked:
                 result = "checked"
-                filter.use = True
+                filter.use_set(True)
             elif check_state == Qt.CheckState.Unchecked:
                 result = "unchecked"
-                filter.use = False
+                filter.use_set(False)
             elif check_state == Qt.CheckState.PartiallyChecked:
                 result = "partially checked"
             else:
@@ -4115,6 +7240,7 @@ class TablesEditor(QMainWindow):
                         parameter = Parameter(name=scrunched_name, type=name, csv=header,
                                               csv_index=column_index, comments=comments)
                         parameters.append(parameter)
+                        current_table.dirty_mark()
 
             tables_editor.update(tracing=next_tracing)
 
@@ -4158,6 +7284,28 @@ class TablesEditor(QMainWindow):
                 print("<=TablesEditor.import_csv_file_line_changed('{0}')\n".format(text))
             tables_editor.in_signal = False
 
+    # TablesEditor.items_dirty_mark():
+    def items_dirty_mark(self, combo_edit_name):
+        """ Mark the object that owns the items list of the *ComboEdit* named *combo_edit_name*
+            dirty after an item has been added to or removed from the list.
+        """
+        # Verify argument types:
+        assert isinstance(combo_edit_name, str)
+
+        # Dispatch on *combo_edit_name*.  The list of *tables* is not saved anywhere, so adding
+        # or removing a *table* does not dirty anything other than a new *table* itself:
+        tables_editor = self
+        if combo_edit_name == "enumerations":
+            current_parameter = tables_editor.current_parameter
+            if current_parameter is not None:
+                current_parameter.dirty_mark()
+        elif combo_edit_name == "parameters":
+            current_table = tables_editor.current_table
+            if current_table is not None:
+                current_table.dirty_mark()
+        elif combo_edit_name == "searches":
+            tables_editor.searches_dirty = True
+
     # TablesEditor.parameter_default_changed():
     def parameter_csv_changed(self, new_csv):
         # Verify argument types:
@@ -4178,8 +7326,9 @@ class TablesEditor(QMainWindow):
             # Stuff *new_csv* into *current_parameter* (if possible):
             tables_editor.current_parameter()
             current_parameter = tables_editor.current_parameter
-            if current_parameter is not None:
+            if current_parameter is not None and current_parameter.csv != new_csv:
                 current_parameter.csv = new_csv
+                current_parameter.dirty_mark()
 
             tables_editor.update(tracing=next_tracing)
             # Wrap up any requested signal tracing:
@@ -4201,8 +7350,9 @@ class TablesEditor(QMainWindow):
 
         # Stuff *new_default* into *current_parameter* (if possible):
         current_parameter = tables_editor.current_parameter
-        if current_parameter is not None:
+        if current_parameter is not None and current_parameter.default != new_default:
             current_parameter.default = new_default
+            current_parameter.dirty_mark()
 
         # Wrap up any requested tracing:
         if trace_level >= 1:
@@ -4259,7 +7409,7 @@ class TablesEditor(QMainWindow):
             assert len(comments) >= 1
             comment = comments[0]
             assert isinstance(comment, ParameterComment)
-            comment.lines = text.split('\n')
+            comment.lines_set(text.split('\n'))
             comment.position = position
 
         if tracing is not None:
@@ -4302,7 +7452,9 @@ class TablesEditor(QMainWindow):
             assert len(parameter_comments) >= 1
             parameter_comment = parameter_comments[0]
             assert isinstance(parameter_comment, ParameterComment)
-            parameter_comment.long_heading = new_long_heading
+            if parameter_comment.long_heading != new_long_heading:
+                parameter_comment.long_heading = new_long_heading
+                parameter_comment.dirty_mark()
 
             # Update the user interface:
             tables_editor.update(tracing=next_tracing)
@@ -4492,7 +7644,9 @@ class TablesEditor(QMainWindow):
             main_window = tables_editor.main_window
             parameter_optional_check = main_window.parameter_optional_check
             optional = parameter_optional_check.isChecked()
-            current_parameter.optional = optional
+            if current_parameter.optional != optional:
+                current_parameter.optional = optional
+                current_parameter.dirty_mark()
 
         # Wrap up any requested *tracing*:
         if trace_level >= 1:
@@ -4521,7 +7675,9 @@ class TablesEditor(QMainWindow):
             assert len(parameter_comments) >= 1
             parameter_comment = parameter_comments[0]
             assert isinstance(parameter_comment, ParameterComment)
-            parameter_comment.short_heading = new_short_heading
+            if parameter_comment.short_heading != new_short_heading:
+                parameter_comment.short_heading = new_short_heading
+                parameter_comment.dirty_mark()
 
             # Update the user interface:
             tables_editor.update(tracing=next_tracing)
@@ -4580,7 +7736,9 @@ class TablesEditor(QMainWindow):
                 main_window = tables_editor.main_window
                 parameters_type_combo = main_window.parameters_type_combo
                 type = parameters_type_combo.currentText().lower()
-                current_parameter.type = type
+                if current_parameter.type != type:
+                    current_parameter.type = type
+                    current_parameter.dirty_mark()
 
             # Wrap-up any requested *signal_tracing*:
             if trace_signals:
@@ -4682,69 +7840,405 @@ class TablesEditor(QMainWindow):
     def quit_button_clicked(self):
         tables_editor = self
         print("TablesEditor.quit_button_clicked() called")
+
+        # Warn about any tables whose content differs from what was loaded or last saved:
+        for table in tables_editor.tables_changed_get():
+            print("Table '{0}' has unsaved changes".format(table.name))
+
+        # Remember the collections tree (in the file it was loaded from) for the next time the
+        # editor starts.  A snapshot that can not be written is reported by *snapshot_update*()
+        # and does not stop the quit:
+        model = tables_editor.model
+        if model is not None:
+            model.snapshot_timer.stop()
+            model.snapshot_update()
+
         application = tables_editor.application
         application.quit()
 
-    # TablesEditor.results_update():
-    def results_update(self, tracing=None):
+    # TablesEditor.results_cache_directory_get():
+    @staticmethod
+    def results_cache_directory_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/results_cache"
+
+    # TablesEditor.results_count_estimate_show():
+    def results_count_estimate_show(self, tracing=None):
         # Verify argument types:
         assert isinstance(tracing, str) or tracing is None
 
         # Perform any requested *tracing*:
         next_tracing = None if tracing is None else tracing + " "
         if tracing is not None:
-            print("{0}=>TablesEditor.results_update()".format(tracing))
+            print("{0}=>TablesEditor.results_count_estimate_show()".format(tracing))
 
+        # Only the *query* and the used filters of *current_search* matter:
         tables_editor = self
-        main_window = tables_editor.main_window
-        results_table = main_window.results_table
-        results_table.clearContents()
+        current_search = tables_editor.current_search
+        message = ""
+        if current_search is None:
+            pass
+        elif not tables_editor.results_rows_load(tracing=next_tracing):
+            message = "No '{0}' file".format(tables_editor.results_csv_file_name)
+        else:
+            rows_size = max(len(tables_editor.results_rows) - 1, 0)
+            sample_size = len(tables_editor.results_sample_row_ids)
+            try:
+                matches = tables_editor.results_sample_matches_count(current_search)
+            except re.error as error:
+                message = "Invalid regular expression: {0}".format(error)
+            else:
+                # Scale up to the whole table using a 95% confidence interval for the
+                # proportion (with the finite population correction):
+                if sample_size == 0:
+                    message = "0 matches"
+                elif sample_size >= rows_size:
+                    message = "{0} matches".format(matches)
+                elif matches == 0:
+                    # The normal interval collapses when nothing matches, so the
+                    # "rule of three" upper bound is shown instead:
+                    message = "Probably fewer than {0} matches (from {1} sampled rows)".format(
+                      round(3.0 * rows_size / sample_size), sample_size)
+                else:
+                    proportion = matches / sample_size
+                    standard_error = (
+                      (proportion * (1.0 - proportion) / sample_size) ** 0.5 *
+                      ((rows_size - sample_size) / (rows_size - 1)) ** 0.5)
+                    message = "About {0} ± {1} matches (from {2} sampled rows)".format(
+                      round(proportion * rows_size),
+                      round(1.96 * standard_error * rows_size), sample_size)
+        tables_editor.main_window.statusbar.showMessage(message)
 
-        tables_editor.current_update(tracing=next_tracing)
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TablesEditor.results_count_estimate_show()=>'{1}'".
+                  format(tracing, message))
+
+    # TablesEditor.results_count_show():
+    def results_count_show(self, is_preview=False, tracing=None):
+        # Verify argument types:
+        assert isinstance(is_preview, bool)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        next_tracing = None if tracing is None else tracing + " "
+        if tracing is not None:
+            print("{0}=>TablesEditor.results_count_show()".format(tracing))
+
+        # Run the exact query for *current_search*.  This also populates the results cache,
+        # except for a preview of a partially typed [Select] pattern:
+        tables_editor = self
         current_search = tables_editor.current_search
-        if current_search is not None:
-            current_search.filters_refresh(tracing=next_tracing)
-            filters = current_search.filters
+        message = ""
+        if current_search is None:
+            pass
+        elif not tables_editor.results_rows_load(tracing=next_tracing):
+            message = "No '{0}' file".format(tables_editor.results_csv_file_name)
+        else:
+            try:
+                row_ids = tables_editor.results_row_ids_get(current_search,
+                                                            cache_store=not is_preview,
+                                                            tracing=next_tracing)
+            except re.error as error:
+                message = "Invalid regular expression: {0}".format(error)
+            else:
+                message = "{0} matches".format(len(row_ids))
+        tables_editor.main_window.statusbar.showMessage(message)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TablesEditor.results_count_show()=>'{1}'".format(tracing, message))
+
+    # TablesEditor.results_header_clicked():
+    def results_header_clicked(self, column):
+        # Verify argument types:
+        assert isinstance(column, int)
+
+        # Perform any requested signal tracing:
+        tables_editor = self
+        trace_signals = tables_editor.trace_signals
+        next_tracing = " " if trace_signals else None
+        if trace_signals:
+            print("=>TablesEditor.results_header_clicked({0})".format(column))
+
+        # Clicking on the primary sort column reverses its order; clicking on any other column
+        # makes it the primary sort column with the previous sort columns used to break ties.
+        # Only the most recent few sort columns are retained:
+        results_sort_columns = tables_editor.results_sort_columns
+        if len(results_sort_columns) >= 1 and results_sort_columns[0][0] == column:
+            results_sort_columns[0] = (column, not results_sort_columns[0][1])
+        else:
+            results_sort_columns[:] = [(column, True)] + [
+              sort_column for sort_column in results_sort_columns if sort_column[0] != column]
+            del results_sort_columns[3:]
+
+        # Show the new order and permute the rows to match:
+        column, ascending = results_sort_columns[0]
+        results_header = tables_editor.main_window.results_table.horizontalHeader()
+        results_header.setSortIndicator(column,
+                                        Qt.AscendingOrder if ascending else Qt.DescendingOrder)
+        tables_editor.results_table_fill(tracing=next_tracing)
+
+        # Wrap up any requested signal tracing:
+        if trace_signals:
+            print("<=TablesEditor.results_header_clicked({0})\n".format(column))
+
+    # TablesEditor.results_query_indexes_get():
+    def results_query_indexes_get(self):
+        # The *QueryIndexes* are discarded by *TablesEditor.results_rows_load*() whenever
+        # the CSV file is reread:
+        tables_editor = self
+        results_query_indexes = tables_editor.results_query_indexes
+        if results_query_indexes is None:
+            results_query_indexes = QueryIndexes(tables_editor.results_rows)
+            tables_editor.results_query_indexes = results_query_indexes
+        return results_query_indexes
+
+    # TablesEditor.results_row_ids_get():
+    def results_row_ids_get(self, search, cache_store=True, tracing=None):
+        # Verify argument types:
+        assert isinstance(search, Search)
+        assert isinstance(cache_store, bool)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        next_tracing = None if tracing is None else tracing + " "
+        if tracing is not None:
+            print("{0}=>TablesEditor.results_row_ids_get('{1}')".format(tracing, search.name))
 
+        # Try the *results_cache* first:
+        tables_editor = self
+        results_cache = tables_editor.results_cache
+        key = results_cache.key_get(search.filter_signature_get(),
+                                    tables_editor.results_csv_file_name)
+        results_row_ids = results_cache.lookup(key, tracing=next_tracing)
+        if results_row_ids is None:
             # Compile *reg_ex* for each *filter* in *filters* that is marked for *use*:
+            filters = search.filters
             for filter_index, filter in enumerate(filters):
                 reg_ex = None
                 if filter.use:
                     reg_ex = re.compile(filter.select + "$")
                 filter.reg_ex = reg_ex
 
-            with open("download.csv", newline="") as csv_file:
+            # The *query* (if any) narrows down the candidate rows using the query indexes:
+            rows = tables_editor.results_rows
+            query = search.query
+            if query is None:
+                row_indices = range(1, len(rows))
+            else:
+                query_indexes = tables_editor.results_query_indexes_get()
+                row_indices = QueryIndexes.bitmap2row_ids(query.execute(query_indexes))
+
+            # Collect the *results_row_ids* of each matching row (skipping the header row):
+            used_filters = [(filter_index, filter.reg_ex)
+                            for filter_index, filter in enumerate(filters) if filter.use]
+            results_row_ids = list()
+            for row_index in row_indices:
+                row = rows[row_index]
+                for filter_index, reg_ex in used_filters:
+                    if reg_ex.match(row[filter_index]) is None:
+                        break
+                else:
+                    results_row_ids.append(row_index)
+            if cache_store:
+                results_cache.store(key, results_row_ids, tracing=next_tracing)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TablesEditor.results_row_ids_get('{1}')=>{2} rows".
+                  format(tracing, search.name, len(results_row_ids)))
+        return results_row_ids
+
+    # TablesEditor.results_rows_load():
+    def results_rows_load(self, tracing=None):
+        """ Make sure that *results_rows* holds the rows of the results CSV file and return
+            *True*, or return *False* if there is no results CSV file.
+        """
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # There are no results to show until a CSV file has been downloaded:
+        tables_editor = self
+        csv_file_name = tables_editor.results_csv_file_name
+        try:
+            csv_mtime = os.stat(csv_file_name).st_mtime_ns
+        except FileNotFoundError:
+            return False
+
+        # Reread *results_rows* only when the CSV file has changed, since the cached sort keys
+        # are indexed by row:
+        if tables_editor.results_csv_mtime != csv_mtime:
+            if tracing is not None:
+                print("{0}Reading '{1}'".format(tracing, csv_file_name))
+            with open(csv_file_name, newline="") as csv_file:
                 csv_reader = csv.reader(csv_file, delimiter=',', quotechar='"')
                 rows = list(csv_reader)
-                table_row_index = 0
-                for row_index, row in enumerate(rows):
-                    if row_index == 0:
-                        results_table.setColumnCount(len(row))
-                        results_table.setRowCount(len(rows))
-                        headers = [filter.parameter.name for filter in filters]
-                        results_table.setHorizontalHeaderLabels(headers)
-                    else:
-                        match = True
-                        for filter_index, filter in enumerate(filters):
-                            value = row[filter_index]
-                            if filter.use and filter.reg_ex.match(value) is None:
-                                match = False
-                                break
-                        if match:
-                            for filter_index, filter in enumerate(filters):
-                                parameter = filter.parameter
-                                datum = row[parameter.csv_index]
-                                assert isinstance(datum, str), "datum='{0}'".format(datum)
-                                if tracing is not None and row_index == 1:
-                                    print("{0}[{1},{2}='{3}']:'{4}'".format(
-                                      tracing, row_index, filter_index, parameter.name, datum))
-                                if filter_index == 0:
-                                    results_table.setRowCount(table_row_index + 1)
-
-                                datum_item = QTableWidgetItem(datum)
-                                results_table.setItem(table_row_index, filter_index, datum_item)
-                            table_row_index += 1
-            results_table.resizeRowsToContents()
+            tables_editor.results_rows = rows
+            tables_editor.results_csv_mtime = csv_mtime
+            tables_editor.results_query_indexes = None
+            tables_editor.results_sort_keys_table = dict()
+
+            # Precompute the random *results_sample_row_ids* used to estimate result counts.
+            # A fixed seed keeps the estimates stable from one keystroke to the next:
+            row_ids = range(1, len(rows))
+            sample_size = min(TablesEditor.RESULTS_SAMPLE_SIZE, len(row_ids))
+            results_sample_row_ids = random.Random(len(rows)).sample(row_ids, sample_size)
+            results_sample_row_ids.sort()
+            tables_editor.results_sample_row_ids = results_sample_row_ids
+        return True
+
+    # TablesEditor.results_sample_matches_count():
+    def results_sample_matches_count(self, search):
+        """ Return the number of rows in *results_sample_row_ids* that match both the *query*
+            and the used filters of *search*, exactly like *results_row_ids_get*() does.
+            An *re.error* is raised if a filter does not compile.
+        """
+        # Verify argument types:
+        assert isinstance(search, Search)
+
+        # Compile the used filters without disturbing the *reg_ex* of any *filter*:
+        tables_editor = self
+        used_filters = [(filter_index, re.compile(filter.select + "$"))
+                        for filter_index, filter in enumerate(search.filters) if filter.use]
+
+        # The *query* (if any) is answered from the query indexes for the whole table, so only
+        # the sampled rows that it matches are tested against the filters:
+        rows = tables_editor.results_rows
+        sample_row_ids = tables_editor.results_sample_row_ids
+        query = search.query
+        if query is not None:
+            query_indexes = tables_editor.results_query_indexes_get()
+            query_row_ids = set(QueryIndexes.bitmap2row_ids(query.execute(query_indexes)))
+            sample_row_ids = [row_id for row_id in sample_row_ids if row_id in query_row_ids]
+
+        # Count the sampled rows that every used filter matches:
+        matches = 0
+        for row_id in sample_row_ids:
+            row = rows[row_id]
+            for filter_index, reg_ex in used_filters:
+                if reg_ex.match(row[filter_index]) is None:
+                    break
+            else:
+                matches += 1
+        return matches
+
+    # TablesEditor.results_show():
+    def results_show(self, search, tracing=None):
+        # Verify argument types:
+        assert isinstance(search, Search)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        next_tracing = None if tracing is None else tracing + " "
+        if tracing is not None:
+            print("{0}=>TablesEditor.results_show('{1}')".format(tracing, search.name))
+
+        # The sort order of one search does not carry over to the next one:
+        tables_editor = self
+        results_table = tables_editor.main_window.results_table
+        if tables_editor.results_search is not search:
+            tables_editor.results_search = search
+            tables_editor.results_sort_columns = list()
+            results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+
+        # Nothing is shown until there is a CSV file to show:
+        if tables_editor.results_rows_load(tracing=next_tracing):
+            # Set up the column headers:
+            rows = tables_editor.results_rows
+            results_table.setColumnCount(len(rows[0]) if len(rows) >= 1 else 0)
+            headers = [filter.parameter.name for filter in search.filters]
+            results_table.setHorizontalHeaderLabels(headers)
+
+            # Sort and display the matching rows:
+            tables_editor.results_row_ids = tables_editor.results_row_ids_get(
+              search, tracing=next_tracing)
+            tables_editor.results_table_fill(tracing=next_tracing)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TablesEditor.results_show('{1}')".format(tracing, search.name))
+
+    # TablesEditor.results_sort_keys_get():
+    def results_sort_keys_get(self, parameter):
+        # Verify argument types:
+        assert isinstance(parameter, Parameter)
+
+        # The sort keys for a column are computed once for the entire CSV file and reused
+        # until either the CSV file or the column type changes:
+        tables_editor = self
+        csv_file_name = tables_editor.results_csv_file_name
+        csv_index = parameter.csv_index
+        key = (csv_file_name, os.stat(csv_file_name).st_mtime_ns, csv_index, parameter.type)
+        results_sort_keys_table = tables_editor.results_sort_keys_table
+        sort_keys = results_sort_keys_table.get(key)
+        if sort_keys is None:
+            values = [row[csv_index] if 0 <= csv_index < len(row) else ""
+                      for row in tables_editor.results_rows]
+            sort_keys = parameter.sort_keys_get(values)
+            results_sort_keys_table[key] = sort_keys
+        return sort_keys
+
+    # TablesEditor.results_table_fill():
+    def results_table_fill(self, tracing=None):
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        if tracing is not None:
+            print("{0}=>TablesEditor.results_table_fill()".format(tracing))
+
+        # Grab some values from *tables_editor* (i.e. *self*):
+        tables_editor = self
+        results_table = tables_editor.main_window.results_table
+        results_rows = tables_editor.results_rows
+        results_row_ids = tables_editor.results_row_ids
+        results_sort_columns = tables_editor.results_sort_columns
+        current_search = tables_editor.current_search
+        filters = list() if current_search is None else current_search.filters
+
+        # Perform a stable multi-column sort by sorting on the least significant column first.
+        # Each sort is only a permutation of *results_row_ids* using precomputed sort keys:
+        for column, ascending in reversed(results_sort_columns):
+            if column < len(filters) and len(results_row_ids) >= 2:
+                sort_keys = tables_editor.results_sort_keys_get(filters[column].parameter)
+                results_row_ids.sort(key=sort_keys.__getitem__, reverse=not ascending)
+
+        # Now load *results_table* in the sorted order:
+        results_table.clearContents()
+        results_table.setRowCount(len(results_row_ids))
+        csv_indices = [filter.parameter.csv_index for filter in filters]
+        for table_row_index, row_id in enumerate(results_row_ids):
+            row = results_rows[row_id]
+            for filter_index, csv_index in enumerate(csv_indices):
+                datum = row[csv_index]
+                assert isinstance(datum, str), "datum='{0}'".format(datum)
+                results_table.setItem(table_row_index, filter_index, QTableWidgetItem(datum))
+        results_table.resizeRowsToContents()
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TablesEditor.results_table_fill()".format(tracing))
+
+    # TablesEditor.results_update():
+    def results_update(self, tracing=None):
+        # Verify argument types:
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        next_tracing = None if tracing is None else tracing + " "
+        if tracing is not None:
+            print("{0}=>TablesEditor.results_update()".format(tracing))
+
+        tables_editor = self
+        main_window = tables_editor.main_window
+        results_table = main_window.results_table
+        results_table.clearContents()
+
+        tables_editor.current_update(tracing=next_tracing)
+        current_search = tables_editor.current_search
+        if current_search is not None:
+            current_search.filters_refresh(tracing=next_tracing)
+            tables_editor.results_show(current_search, tracing=next_tracing)
 
         # Wrap up any requested *tracing*:
         if tracing is not None:
@@ -4799,22 +8293,20 @@ class TablesEditor(QMainWindow):
             print("=>TablesEditor.save_button_clicked()")
         current_tables = tables_editor.current_tables
 
-        # Save each *table* in *current_tables*:
+        # Save each *table* in *current_tables*.  *Table.save*() skips any *table* that has not
+        # changed since it was loaded or last saved.  Keep the *catalog* in step:
+        catalog = tables_editor.catalog_get()
+        saved_fingerprints = tables_editor.saved_fingerprints
         for table in current_tables:
-            table.save(tracing=next_tracing)
+            if table.save(tracing=next_tracing) and catalog is not None:
+                catalog.table_update(table.file_name, table)
+            saved_fingerprints[table.file_name] = table.fingerprint_get()
 
+        # Save the *searches*, but only if one of them has changed or one was added or removed:
         searches = tables_editor.searches
-        xml_lines = list()
-        xml_lines.append('<?xml version="1.0"?>')
-        xml_lines.append('<Searches>')
-        for search in searches:
-            search.xml_lines_append(xml_lines, "  ")
-        xml_lines.append('</Searches>')
-        xml_lines.append("")
-        xml_text = '\n'.join(xml_lines)
-        searches_xml_file_name = "/tmp/searches.xml"
-        with open(searches_xml_file_name, "w") as searches_xml_file:
-            searches_xml_file.write(xml_text)
+        if tables_editor.searches_dirty or any(search.is_dirty() for search in searches):
+            searches_xml_file_name = "/tmp/searches.xml"
+            tables_editor.searches_file_save(searches_xml_file_name, tracing=next_tracing)
 
         # Wrap up any requested signal tracing:
         if trace_signals:
@@ -4905,7 +8397,7 @@ class TablesEditor(QMainWindow):
             assert len(comments) >= 1
             comment = comments[0]
             assert isinstance(comment, SearchComment)
-            comment.lines = text.split('\n')
+            comment.lines_set(text.split('\n'))
             comment.position = position
 
         # Wrap up any requested *tracing*:
@@ -4924,29 +8416,31 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}=>TablesEditor.searches_file_save('{1}')".format(tracing, file_name))
 
-        xml_lines = list()
-        xml_lines.append('<?xml version="1.0"?>')
-        xml_lines.append('<Searches>')
-
-        # Sweep through each *search* in *searches* and append the results to *xml_lines*:
+        # Stream the *searches* out to *file_name* (unless nothing changed) and mark everything
+        # clean:
         tables_editor = self
         searches = tables_editor.searches
+        file_stream_replace(file_name, partial(tables_editor.searches_file_write,
+                                               tracing=next_tracing))
         for search in searches:
-            search.xml_lines_append(xml_lines, "  ", tracing=next_tracing)
-
-        # Wrap up *xml_lines* and generate *xml_text*:
-        xml_lines.append('</Searches>')
-        xml_lines.append("")
-        xml_text = '\n'.join(xml_lines)
-
-        # Write out *xml_text* to *file_name*:
-        with open(file_name, "w") as xml_file:
-            xml_file.write(xml_text)
+            search.dirty_clear()
+        tables_editor.searches_dirty = False
 
         # Wrqp up any requested *tracing*:
         if tracing is not None:
             print("{0}<=TablesEditor.searches_file_save('{1}')".format(tracing, file_name))
 
+    # TablesEditor.searches_file_write():
+    def searches_file_write(self, xml_file, tracing=None):
+        # Stream each *search* in *searches* into *xml_file*:
+        tables_editor = self
+        xml_writer = XMLWriter(xml_file)
+        xml_writer.header_write()
+        xml_writer.element_start("", "Searches")
+        for search in tables_editor.searches:
+            search.xml_write(xml_writer, "  ", tracing=tracing)
+        xml_writer.element_end("", "Searches")
+
     # TablesEditor.searches_file_load():
     def searches_file_load(self, xml_file_name, tracing=None):
         # Verify argument types:
@@ -5148,6 +8642,11 @@ class TablesEditor(QMainWindow):
                 print("<=TablesEditor.tab_changed(*, {0})\n".format(new_index))
             tables_editor.in_signal = False
 
+    @staticmethod
+    # TablesEditor.table_cache_directory_get():
+    def table_cache_directory_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/table_cache"
+
     # TablesEditor.table_comment_get():
     def table_comment_get(self, table, tracing=None):
         # Verify argument types:
@@ -5195,7 +8694,7 @@ class TablesEditor(QMainWindow):
             assert len(comments) >= 1
             comment = comments[0]
             assert isinstance(comment, TableComment)
-            comment.lines = text.split('\n')
+            comment.lines_set(text.split('\n'))
             comment.position = position
 
         # Wrap up any requested *tracing*:
@@ -5263,6 +8762,18 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}=>TablesEditor.table_setup(*)".format(tracing))
 
+    # TablesEditor.tables_changed_get():
+    def tables_changed_get(self):
+        """ Return the list of current tables whose contents differ from when they were loaded
+            or last saved.
+        """
+        # Comparing fingerprints is much cheaper than keeping (and comparing against) a deep copy
+        # of every table:
+        tables_editor = self
+        saved_fingerprints = tables_editor.saved_fingerprints
+        return [table for table in tables_editor.current_tables
+                if table.fingerprint_get() != saved_fingerprints.get(table.file_name)]
+
     # TablesEditor.tables_update():
     def tables_update(self, table=None, tracing=None):
         # Verify argument types:
@@ -5288,6 +8799,11 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}<=TablesEditor.tables_update()".format(tracing))
 
+    # TablesEditor.trigram_index_file_name_get():
+    @staticmethod
+    def trigram_index_file_name_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/trigrams.index"
+
     # TablesEditor.update():
     def update(self, tracing=None):
         # Verify argument types:
@@ -5318,6 +8834,16 @@ class TablesEditor(QMainWindow):
         if tracing is not None:
             print("{0}<=TablesEditor.update()".format(tracing))
 
+    @staticmethod
+    # TablesEditor.tree_snapshot_file_name_get():
+    def tree_snapshot_file_name_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/tree_snapshot.json"
+
+    @staticmethod
+    # TablesEditor.validation_cache_file_name_get():
+    def validation_cache_file_name_get():
+        return "/home/wayne/public_html/projects/digikey_csvs/validation_cache.json"
+
     # TablesEditor.search_update():
     def xxx_search_update(self, tracing=None):
         # Verify argument types:
@@ -5408,30 +8934,224 @@ class TablesEditor(QMainWindow):
                 criteria_item.setData(Qt.UserRole, parameter)
                 search_table.setItem(parameter_index, 2, criteria_item)
 
-        # Update the *search_combo_edit*:
-        tables_editor.search_combo_edit.gui_update(tracing=next_tracing)
+        # Update the *search_combo_edit*:
+        tables_editor.search_combo_edit.gui_update(tracing=next_tracing)
+
+        if tracing is not None:
+            print("{0}<=TablesEditor.search_update(*)".format(tracing))
+
+
+class TitleIndex:
+    """ A *TitleIndex* object finds the tables and directories whose titles contain some text.
+
+    Titles are normalized (case folded, with punctuation turned into single spaces), so that
+    "chip res" finds "Chip Resistors - Surface Mount".  Every word of the find text must occur
+    in a title.  Since find text is usually typed a character at a time, a find that extends the
+    previous one only rechecks the previous matches.  Titles can be added as the tree grows.
+    """
+
+    # The words of a title:
+    WORD_RE = re.compile(r"\w+")
+
+    # TitleIndex.__init__():
+    def __init__(self, titles):
+        # Verify argument types:
+        assert isinstance(titles, list)
+
+        # Sort the *titles* and normalize each one once:
+        titles = sorted(titles, key=lambda title: (title[1], title[0]))
+        normalized_titles = [TitleIndex.text_normalize(title) for path, title, is_table in titles]
+
+        # Load up *title_index* (i.e. *self*).  *sort_keys* parallels *titles* for *bisect*:
+        title_index = self
+        title_index.last_matches = list(range(len(titles)))
+        title_index.last_text = ""
+        title_index.normalized_titles = normalized_titles
+        title_index.paths = set([path for path, title, is_table in titles])
+        title_index.sort_keys = [(title, path) for path, title, is_table in titles]
+        title_index.titles = titles
+
+    # TitleIndex.find():
+    def find(self, text):
+        """ Return the (*path*, *title*, *is_table*) tuples whose title contains every word of
+            *text* sorted by title.
+        """
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        # Only the previous matches need to be checked when *text* extends the previous text:
+        title_index = self
+        text = TitleIndex.text_normalize(text)
+        last_text = title_index.last_text
+        candidates = (title_index.last_matches if text.startswith(last_text) else
+                      range(len(title_index.titles)))
+        words = text.split()
+        normalized_titles = title_index.normalized_titles
+        matches = [index for index in candidates
+                   if all(word in normalized_titles[index] for word in words)]
+        title_index.last_matches = matches
+        title_index.last_text = text
+        titles = title_index.titles
+        return [titles[index] for index in matches]
+
+    # TitleIndex.titles_add():
+    def titles_add(self, titles):
+        """ Add each (*path*, *title*, *is_table*) tuple in *titles* whose *path* is not
+            already in *title_index* (i.e. *self*).
+        """
+        # Verify argument types:
+        assert isinstance(titles, list)
+
+        # Insert each new title into its sorted position:
+        title_index = self
+        paths = title_index.paths
+        sort_keys = title_index.sort_keys
+        index_titles = title_index.titles
+        normalized_titles = title_index.normalized_titles
+        is_added = False
+        for path, title, is_table in titles:
+            if path not in paths:
+                paths.add(path)
+                sort_key = (title, path)
+                position = bisect.bisect(sort_keys, sort_key)
+                sort_keys.insert(position, sort_key)
+                index_titles.insert(position, (path, title, is_table))
+                normalized_titles.insert(position, TitleIndex.text_normalize(title))
+                is_added = True
+
+        # The previous matches are indices that have now moved, so the next find starts over:
+        if is_added:
+            title_index.last_matches = list(range(len(index_titles)))
+            title_index.last_text = ""
 
-        if tracing is not None:
-            print("{0}<=TablesEditor.search_update(*)".format(tracing))
+    @staticmethod
+    # TitleIndex.text_normalize():
+    def text_normalize(text):
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        # Case fold *text* and reduce each run of punctuation and white space to a single space:
+        return " ".join(TitleIndex.WORD_RE.findall(text.casefold()))
+
+
+class TreeFetch:
+    """ A *TreeFetch* object tracks the children of one node that are being loaded in the
+    background for *TreeModel.fetchMore*().
+    """
+
+    # TreeFetch.__init__():
+    def __init__(self, node, placeholder, future=None, nodes=None, is_restored=False):
+        # Verify argument types:
+        assert isinstance(node, Node)
+        assert isinstance(placeholder, Placeholder)
+        assert isinstance(future, concurrent.futures.Future) or future is None
+        assert isinstance(nodes, list) or nodes is None
+        assert (future is None) != (nodes is None)
+        assert isinstance(is_restored, bool)
+
+        # Load up *tree_fetch* (i.e. *self*).  *nodes* is filled in from *future* once the
+        # background work is done and *nodes_index* counts the *nodes* inserted so far.
+        # *is_restored* is *True* when *nodes* came from a tree snapshot:
+        tree_fetch = self
+        tree_fetch.future = future
+        tree_fetch.is_restored = is_restored
+        tree_fetch.node = node
+        tree_fetch.nodes = nodes
+        tree_fetch.nodes_index = 0
+        tree_fetch.placeholder = placeholder
 
 
 class TreeModel(QAbstractItemModel):
 
     FLAG_DEFAULT = Qt.ItemIsEnabled | Qt.ItemIsSelectable
 
+    # The number of nodes inserted into the tree per *fetch_timer* tick and the number of
+    # milliseconds between ticks (i.e. about one frame):
+    FETCH_BATCH_SIZE = 100
+    FETCH_INTERVAL = 16
+
+    # File system changes are collected for *WATCH_DELAY* milliseconds and then at most
+    # *WATCH_BATCH_SIZE* changed directories are brought up to date per *watch_timer* tick:
+    WATCH_BATCH_SIZE = 10
+    WATCH_DELAY = 250
+
+    # The format version of the files written by *snapshot_save*().  The snapshot is written
+    # again *SNAPSHOT_SAVE_DELAY* milliseconds after the last directory scan:
+    SNAPSHOT_VERSION = 2
+    SNAPSHOT_SAVE_DELAY = 5000
+
+    # The prefetcher waits until there has been no user activity for *PREFETCH_IDLE_DELAY*
+    # milliseconds and then does one directory or table every *PREFETCH_INTERVAL* milliseconds.
+    # At most *PREFETCH_QUEUE_LIMIT* pending items and *PREFETCH_NODES_LIMIT* prefetched nodes
+    # are kept:
+    PREFETCH_IDLE_DELAY = 500
+    PREFETCH_INTERVAL = 50
+    PREFETCH_NODES_LIMIT = 5000
+    PREFETCH_QUEUE_LIMIT = 1000
+
     # FIXME: *TreeModel* should not have a directory!!!
     # TreeModel.__init__():
-    def __init__(self, root_node):
+    def __init__(self, root_node, catalog_file_name=None):
         # Verify argument types:
         assert isinstance(root_node, Node)
+        assert isinstance(catalog_file_name, str) or catalog_file_name is None
 
         # Initialize the parent *QAbstraceItemModel*:
         super().__init__()
 
         # Stuff *root_node* into *tree_model* (i.e. *self*):
         tree_model = self
+        tree_model.catalog = None  # Opened by *catalog_get*()
+        tree_model.catalog_file_name = catalog_file_name
         tree_model.headers = {0: "Type", 1: "Name"}
         tree_model.root_node = root_node
+        tree_model.table_cache = TableCache(TablesEditor.table_cache_directory_get())
+
+        # *fetchMore*() reads directories and search files on *fetch_executor* and
+        # *fetch_timer* moves the results into the tree a batch at a time:
+        fetch_timer = QTimer()
+        fetch_timer.setInterval(TreeModel.FETCH_INTERVAL)
+        fetch_timer.timeout.connect(tree_model.fetches_poll)
+        tree_model.fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        tree_model.fetch_timer = fetch_timer
+        tree_model.fetches = list()
+        tree_model.title_index = None
+
+        # *snapshot_timer* writes the tree snapshot back to *snapshot_file_name* (see
+        # *snapshot_load*()) once directory scans have settled down:
+        snapshot_timer = QTimer()
+        snapshot_timer.setSingleShot(True)
+        snapshot_timer.setInterval(TreeModel.SNAPSHOT_SAVE_DELAY)
+        snapshot_timer.timeout.connect(tree_model.snapshot_update)
+        tree_model.snapshot_directories = dict()
+        tree_model.snapshot_file_name = None
+        tree_model.snapshot_timer = snapshot_timer
+
+        # While the user is idle, *prefetch_timer* reads the directories and tables that are
+        # likely to be expanded or clicked next (see *prefetch_poll*()):
+        prefetch_timer = QTimer()
+        prefetch_timer.setInterval(TreeModel.PREFETCH_INTERVAL)
+        prefetch_timer.timeout.connect(tree_model.prefetch_poll)
+        tree_model.prefetch_future = None
+        tree_model.prefetch_queue = list()
+        tree_model.prefetch_timer = prefetch_timer
+        tree_model.prefetched_nodes_count = 0
+        tree_model.prefetched_table = dict()
+        tree_model.user_active_time = 0.0
+
+        # Once the children of a node have been fetched, its directory is watched by *watcher*
+        # so that changes made by other programs show up in the tree:
+        watcher = QFileSystemWatcher()
+        watcher.directoryChanged.connect(tree_model.watch_changed)
+        watcher.fileChanged.connect(tree_model.watch_changed)
+        watch_timer = QTimer()
+        watch_timer.setSingleShot(True)
+        watch_timer.timeout.connect(tree_model.watch_update)
+        tree_model.table_mtimes = dict()
+        tree_model.watch_paths = set()
+        tree_model.watch_timer = watch_timer
+        tree_model.watched_nodes = dict()
+        tree_model.watcher = watcher
 
         # Populate the top level of *root_node*:
         # file_names = sorted(os.listdir(path))
@@ -5496,19 +9216,14 @@ class TreeModel(QAbstractItemModel):
         assert isinstance(parent_node, Node)
 
         # Make sure *child_node* is actual one of the children of *parent_node*:
-        children_nodes = parent_node.children
-        for sub_node_index, sub_node in enumerate(children_nodes):
-            if sub_node is child_node:
-                # We have a match and now e can carefully delete *child_node* from the
-                # *children_nodes* of *parent_node*:
-                print("match")
-                tree_model.beginRemoveRows(parent_model_index, sub_node_index, sub_node_index)
-                del children_nodes[sub_node_index]
-                tree_model.endRemoveRows()
-                break
-        else:
-            assert False, ("Child '{0}' is not in parent '{1}'".
-                           format(child_node.name, parent_node.name))
+        assert child_node.parent is parent_node, ("Child '{0}' is not in parent '{1}'".
+                                                  format(child_node.name, parent_node.name))
+
+        # Now we can carefully delete *child_node* from the children of *parent_node*:
+        row = child_node.row()
+        tree_model.beginRemoveRows(parent_model_index, row, row)
+        parent_node.remove(child_node)
+        tree_model.endRemoveRows()
 
     # called if canFetchMore returns True, then dynamically inserts nodes required for
     # directory contents
@@ -5519,94 +9234,424 @@ class TreeModel(QAbstractItemModel):
 
         print("=>TreeModel.fetchMore()")
         tree_model = self
+        tree_model.user_activity_note()
+        catalog = tree_model.catalog_get()
         parent_node = tree_model.getNode(model_index)
-        # print("fetchMore: parent_node.name='{0}' len(parent_node.children)={1}".
-        #      format(parent_node.name, len(parent_node.children)))
-        nodes = []
+        parent_node.is_traversed = True
+
+        # Show a *placeholder* row right away:
+        placeholder = Placeholder()
+        tree_model.insertNodes(parent_node.child_count(), [placeholder], model_index)
+
+        # Start reading the children of *parent_node*.  *fetches_poll*() inserts them later on:
+        fetch_executor = tree_model.fetch_executor
         if isinstance(parent_node, Table):
             # To improve readability, use *table* variable instead of less generic *parent_node*:
             table = parent_node
-            searches = table.children
-            # print("1:len(searches)={0}".format(len(searches)))
+            future = fetch_executor.submit(TreeModel.search_trees_read,
+                                           table.search_directory_get())
+            tree_fetch = TreeFetch(table, placeholder, future=future)
+        elif tree_model.prefetched_nodes_get(parent_node) is not None:
+            # The prefetcher has already read the directory and it has not changed since:
+            nodes = tree_model.prefetched_nodes_get(parent_node)
+            tree_model.prefetched_nodes_remove(parent_node.path)
+            tree_fetch = TreeFetch(parent_node, placeholder, nodes=nodes)
+        elif parent_node.path in tree_model.snapshot_directories:
+            # The children of *parent_node* were recorded when the editor last exited.  They
+            # are shown right away and checked against the file system afterwards:
+            nodes = tree_model.snapshot_nodes_get(parent_node)
+            tree_fetch = TreeFetch(parent_node, placeholder, nodes=nodes, is_restored=True)
+        elif catalog is not None and catalog.directory_is_indexed(parent_node.path):
+            # The *catalog* already knows the sub-directories and the `<Table>` attributes of
+            # each table in *parent_node*, so neither the directory nor the tables are read.
+            # (*catalog* is an SQLite database that can only be used from this thread.):
+            table_cache = tree_model.table_cache
+            children = list()
+            for path, name in catalog.directories_get(parent_node.path):
+                title = parent_node.file_name2title(name)
+                children.append((name, Directory(name, path, title)))
+            for path, name, title, url, csv_file_name in catalog.tables_get(parent_node.path):
+                # (The catalog records a missing attribute as *None*, which *etree* rejects.):
+                header_tree = etree.Element("Table", name=name, csv_file_name=csv_file_name or "",
+                                            title=title or "", url=url or "")
+                table = Table(file_name=path, header_tree=header_tree, table_cache=table_cache)
+                children.append((os.path.basename(path), table))
+            children.sort(key=lambda child: child[0])
+            nodes = [node for file_name, node in children]
+            tree_fetch = TreeFetch(parent_node, placeholder, nodes=nodes)
+        else:
+            # Build the *Table* and *Directory* nodes from one listing of the directory:
+            future = fetch_executor.submit(parent_node.children_scan, tree_model.table_cache)
+            tree_fetch = TreeFetch(parent_node, placeholder, future=future)
+        tree_model.fetches.append(tree_fetch)
+        tree_model.fetch_timer.start()
+        print("<=TreeModle.fetchMore()\n")
+
+    # TreeModel.fetch_cancel():
+    def fetch_cancel(self, model_index):
+        """ Stop loading the children of the node at *model_index* (which has just been
+            collapsed) and put the node back the way it was before *fetchMore*().
+        """
+        # Verify argument types:
+        assert isinstance(model_index, QModelIndex)
+
+        tree_model = self
+        tree_model.user_activity_note()
+        node = tree_model.getNode(model_index)
+        fetches = tree_model.fetches
+        for tree_fetch in fetches:
+            if tree_fetch.node is node:
+                # Work that has not started yet is dropped and the results of work that has
+                # are ignored:
+                if tree_fetch.future is not None:
+                    tree_fetch.future.cancel()
+                fetches.remove(tree_fetch)
+
+                # Remove every row that this fetch inserted (including the placeholder):
+                placeholder_row = tree_fetch.placeholder.row()
+                start_row = placeholder_row - tree_fetch.nodes_index
+                tree_model.rows_remove(node, start_row, placeholder_row - start_row + 1)
+                node.is_traversed = False
+                break
+
+    # TreeModel.fetch_step():
+    def fetch_step(self, tree_fetch, batch_size):
+        """ Move up to *batch_size* more of the nodes of *tree_fetch* into the tree (waiting for
+            the background work of *tree_fetch* if need be) and return *True* once *tree_fetch*
+            is complete.
+        """
+        # Verify argument types:
+        assert isinstance(tree_fetch, TreeFetch)
+        assert isinstance(batch_size, int) and batch_size >= 1
+
+        tree_model = self
+        fetches = tree_model.fetches
+        node = tree_fetch.node
+        if tree_fetch.nodes is None:
+            # A failed fetch is reported and treated as if nothing was found:
+            try:
+                nodes = tree_fetch.future.result()
+            except Exception as error:
+                print("Unable to read '{0}': {1}".format(node.path, error))
+                nodes = list()
+            if isinstance(node, Table):
+                tree_model.rows_remove(node, tree_fetch.placeholder.row(), 1)
+                tree_model.searches_insert(node, nodes)
+                tree_model.watch(node)
+                fetches.remove(tree_fetch)
+                return True
+            tree_fetch.nodes = nodes
+
+        # Insert the next batch of *nodes* just before the placeholder:
+        nodes = tree_fetch.nodes
+        nodes_index = tree_fetch.nodes_index
+        batch = nodes[nodes_index:nodes_index + batch_size]
+        tree_fetch.nodes_index = nodes_index + len(batch)
+        if len(batch) >= 1:
+            tree_model.title_index_add(batch)
+            tree_model.insertNodes(tree_fetch.placeholder.row(), batch,
+                                   tree_model.model_index_get(node))
+
+        # Remove the placeholder once every node has been inserted:
+        is_complete = tree_fetch.nodes_index >= len(nodes)
+        if is_complete:
+            tree_model.rows_remove(node, tree_fetch.placeholder.row(), 1)
+            tree_model.watch(node)
+            if tree_fetch.is_restored:
+                tree_model.watch_changed(node.path)
+            fetches.remove(tree_fetch)
+            tree_model.prefetch_plan(node)
+            tree_model.snapshot_update_schedule()
+        return is_complete
+
+    # TreeModel.fetch_wait():
+    def fetch_wait(self, node):
+        """ Fetch all of the children of *node* now (rather than in the background.) """
+        # Verify argument types:
+        assert isinstance(node, Node)
+
+        tree_model = self
+        if node.is_dir and not node.is_traversed:
+            tree_model.fetchMore(tree_model.model_index_get(node))
+        for tree_fetch in tree_model.fetches:
+            if tree_fetch.node is node:
+                while not tree_model.fetch_step(tree_fetch, len(node.children) + 1000000):
+                    pass
+                break
+
+    # TreeModel.fetches_poll():
+    def fetches_poll(self):
+        """ Move the next batch of fetched nodes into the tree.  This is called by
+            *fetch_timer* and does a bounded amount of work so that the user interface stays
+            responsive.
+        """
+        tree_model = self
+        fetches = tree_model.fetches
+        for tree_fetch in fetches:
+            if tree_fetch.nodes is not None or tree_fetch.future.done():
+                tree_model.fetch_step(tree_fetch, TreeModel.FETCH_BATCH_SIZE)
+                break
+
+        # Stop *fetch_timer* when there is nothing left to do:
+        if len(fetches) == 0:
+            tree_model.fetch_timer.stop()
+
+    # TreeModel.model_index_get():
+    def model_index_get(self, node):
+        """ Return the *QModelIndex* for *node* in *tree_model* (i.e. *self*). """
+        # Verify argument types:
+        assert isinstance(node, Node)
+
+        tree_model = self
+        model_index = (QModelIndex() if node is tree_model.root_node else
+                       tree_model.createIndex(node.row(), 0, node))
+        return model_index
+
+    # TreeModel.path_reveal():
+    def path_reveal(self, path):
+        """ Return the list of nodes from the top of the tree down to the node for *path* (a
+            table file or directory), fetching just the directories along the way, or an empty
+            list if *path* is not in the tree.
+        """
+        # Verify argument types:
+        assert isinstance(path, str)
+
+        # Find the top level directory that contains *path*:
+        tree_model = self
+        for directory in tree_model.root_node.children:
+            directory_path = directory.path
+            if isinstance(directory, Directory) and path.startswith(directory_path + os.sep):
+                break
+        else:
+            return list()
+
+        # Walk down from *directory* one file name at a time:
+        nodes = [directory]
+        node = directory
+        for file_name in path[len(directory_path) + 1:].split(os.sep):
+            tree_model.fetch_wait(node)
+            for child in node.children:
+                child_path = child.file_name if isinstance(child, Table) else child.path
+                if os.path.basename(child_path) == file_name:
+                    node = child
+                    nodes.append(node)
+                    break
+            else:
+                return list()
+        return nodes
+
+    # TreeModel.prefetch_plan():
+    def prefetch_plan(self, directory):
+        """ Queue up the work that is likely to be needed after *directory* was expanded: its
+            sub-directories and its sibling directories are likely to be expanded next and its
+            tables are likely to be clicked on.
+        """
+        # Verify argument types:
+        assert isinstance(directory, Node)
+
+        # The most recently planned items go first:
+        tree_model = self
+        items = list()
+        siblings = [] if directory.parent is None else directory.parent.children
+        for node in directory.children + siblings:
+            if isinstance(node, Directory) and not node.is_traversed:
+                items.append(("directory", node))
+        for node in directory.children:
+            if isinstance(node, Table):
+                items.append(("table", node))
+        prefetch_queue = tree_model.prefetch_queue
+        prefetch_queue[0:0] = items
+        del prefetch_queue[TreeModel.PREFETCH_QUEUE_LIMIT:]
+        if len(prefetch_queue) >= 1:
+            tree_model.prefetch_timer.start()
+
+    # TreeModel.prefetch_poll():
+    def prefetch_poll(self):
+        """ Do the next piece of prefetching when the user is idle.  This is called by
+            *prefetch_timer* and never has more than one directory or table in progress.
+        """
+        # Do nothing while the user is busy or the previous piece of work is still going:
+        tree_model = self
+        prefetch_future = tree_model.prefetch_future
+        idle_time = (time.monotonic() - tree_model.user_active_time) * 1000.0
+        if (len(tree_model.fetches) >= 1 or idle_time < TreeModel.PREFETCH_IDLE_DELAY or
+                (prefetch_future is not None and not prefetch_future.done())):
+            return
+
+        # Remember the nodes of a prefetched directory (forgetting the oldest ones when there
+        # are too many):
+        if prefetch_future is not None:
+            tree_model.prefetch_future = None
+            try:
+                result = prefetch_future.result()
+            except Exception:
+                result = None
+            if isinstance(result, tuple):
+                path, directory_snapshot, nodes = result
+                prefetched_table = tree_model.prefetched_table
+                prefetched_table[path] = (directory_snapshot, nodes)
+                tree_model.prefetched_nodes_count += len(nodes)
+                tree_model.title_index_add(nodes)
+                while tree_model.prefetched_nodes_count > TreeModel.PREFETCH_NODES_LIMIT:
+                    tree_model.prefetched_nodes_remove(next(iter(prefetched_table)))
+
+        # Start on the next item that still needs doing:
+        catalog = tree_model.catalog_get()
+        prefetch_queue = tree_model.prefetch_queue
+        while len(prefetch_queue) >= 1 and tree_model.prefetch_future is None:
+            kind, node = prefetch_queue.pop(0)
+            if kind == "table":
+                if node.parent is not None and not node.is_loaded():
+                    tree_model.prefetch_future = tree_model.fetch_executor.submit(
+                      tree_model.table_cache.table_warm, node.file_name)
+            else:
+                path = node.path
+                if not (node.is_traversed or path in tree_model.prefetched_table or
+                        path in tree_model.snapshot_directories or
+                        (catalog is not None and catalog.directory_is_indexed(path))):
+                    tree_model.prefetch_future = tree_model.fetch_executor.submit(
+                      TreeModel.directory_prefetch, node, tree_model.table_cache)
+
+        # Stop *prefetch_timer* when there is nothing left to do:
+        if len(prefetch_queue) == 0 and tree_model.prefetch_future is None:
+            tree_model.prefetch_timer.stop()
+
+    # TreeModel.prefetched_nodes_get():
+    def prefetched_nodes_get(self, directory):
+        """ Return the prefetched nodes of *directory* or *None* if there are none or they are
+            out of date.
+        """
+        # Verify argument types:
+        assert isinstance(directory, Node)
+
+        # The prefetched nodes are only current while the directory snapshot they were built
+        # from is:
+        tree_model = self
+        nodes = None
+        prefetched_pair = tree_model.prefetched_table.get(directory.path)
+        if prefetched_pair is not None:
+            directory_snapshot, prefetched_nodes = prefetched_pair
+            if DirectorySnapshot.get(directory.path) is directory_snapshot:
+                nodes = prefetched_nodes
+            else:
+                tree_model.prefetched_nodes_remove(directory.path)
+        return nodes
+
+    # TreeModel.prefetched_nodes_remove():
+    def prefetched_nodes_remove(self, path):
+        # Verify argument types:
+        assert isinstance(path, str)
+
+        tree_model = self
+        directory_snapshot, nodes = tree_model.prefetched_table.pop(path)
+        tree_model.prefetched_nodes_count -= len(nodes)
+
+    # TreeModel.rows_remove():
+    def rows_remove(self, node, row, count):
+        """ Remove *count* children of *node* starting at *row* from *tree_model* (i.e. *self*).
+        """
+        # Verify argument types:
+        assert isinstance(node, Node)
+        assert isinstance(row, int)
+        assert isinstance(count, int) and count >= 1
+
+        tree_model = self
+        tree_model.beginRemoveRows(tree_model.model_index_get(node), row, row + count - 1)
+        node.children_remove(row, count)
+        tree_model.endRemoveRows()
+
+    # TreeModel.searches_insert():
+    def searches_insert(self, table, search_trees):
+        """ Append *Search* objects built from *search_trees* to the children of *table* and
+            make sure that *table* has an `@ALL` search.
+        """
+        # Verify argument types:
+        assert isinstance(table, Table)
+        assert isinstance(search_trees, list)
+
+        # The *Search* initializer appends each new *Search* object to the children of
+        # *table*, so the new searches are built first:
+        tree_model = self
+        searches = table.children
+        old_searches = list(searches)
+        start_row = len(old_searches)
+        for search_tree in search_trees:
+            Search(search_tree=search_tree, table=table)
+
+        # Make sure we have the `@ALL` search in *searches*:
+        if len(searches) == 0:
+            all_search_name = "@ALL"
+            comment = SearchComment(language="EN", lines=list())
+            comments = [comment]
+            Search(name=all_search_name, comments=comments, table=table,
+                   parent_name="", url=table.url, tracing="fetchMore:")
+        searches_count = len(searches) - start_row
+        if searches_count == 0:
+            return
+
+        # Fix up and sort all of the *searches* in *table*:
+        table.fix_up(tracing=" ")
+        sorted_searches = list(searches)
+
+        # Put back the rows that the views already know about, announce the new searches as
+        # rows appended after them, and then move every search into its sorted row:
+        old_search_ids = set([id(search) for search in old_searches])
+        new_searches = [search for search in sorted_searches
+                        if id(search) not in old_search_ids]
+        searches[:] = old_searches
+        table.children_renumber()
+        tree_model.beginInsertRows(tree_model.model_index_get(table),
+                                   start_row, start_row + searches_count - 1)
+        searches.extend(new_searches)
+        table.children_renumber(start_row)
+        tree_model.endInsertRows()
+        tree_model.children_reorder(table, sorted_searches)
+
+    @staticmethod
+    # TreeModel.directory_prefetch():
+    def directory_prefetch(directory, table_cache):
+        """ Return (*path*, *directory_snapshot*, *nodes*) for the children of *directory*.  This
+            is run by *fetch_executor* and does not touch the tree.
+        """
+        # Verify argument types:
+        assert isinstance(directory, Directory)
+        assert isinstance(table_cache, TableCache)
 
+        # Grab the snapshot before the scan, so a change during the scan makes the result stale:
+        directory_snapshot = DirectorySnapshot.get(directory.path)
+        nodes = directory.children_scan(table_cache)
+        return (directory.path, directory_snapshot, nodes)
+
+    @staticmethod
+    # TreeModel.search_trees_read():
+    def search_trees_read(search_directory):
+        """ Return a list of the parsed `<Search>` trees for the table whose searches are in
+            *search_directory*.  This is run by *fetch_executor* and does not touch the tree.
+        """
+        # Verify argument types:
+        assert isinstance(search_directory, str)
+
+        # When the searches of a table are packed, they are all read from a single file:
+        search_trees = list()
+        search_store_file_name = search_directory + SearchStore.SUFFIX
+        if os.path.isfile(search_store_file_name):
+            search_store = SearchStore(search_store_file_name)
+            for search_xml_text in search_store.xml_texts_get().values():
+                search_trees.append(etree.fromstring(search_xml_text))
+        else:
             # Make sure *serach_directory* exists:
-            search_directory = table.search_directory_get()
             if not os.path.isdir(search_directory):
                 os.makedirs(search_directory)
             assert os.path.isdir(search_directory)
 
-            # Read in the `.xml` files from *search_directory* and add to a *searches* list:
-            unsorted_base_names = os.listdir(search_directory)
-            for base_name_index, base_name in enumerate(unsorted_base_names):
-                # print("Base_Name[{0}]:'{1}'".format(base_name_index, base_name))
+            # Read in the `.xml` files from *search_directory*:
+            for base_name in os.listdir(search_directory):
                 if base_name.endswith(".xml"):
-                    # We have an `.xml` file, read the contents into *search_xml_text*:
                     search_xml_file_name = os.path.join(search_directory, base_name)
                     with open(search_xml_file_name) as search_file:
                         search_xml_text = search_file.read()
-
-                    # Convert *Search_xml_text* into *search* and tack onto *searches*:
-                    search_tree = etree.fromstring(search_xml_text)
-                    # Note: The *Search* initializer appends the new *Search* object to the
-                    # *children* list of *table*:
-                    Search(search_tree=search_tree, table=table)
-            # print("2:len(searches)={0}".format(len(searches)))
-
-            # Make sure we have the `@ALL` search in *searches*:
-            if len(searches) == 0:
-                all_search_name = "@ALL"
-                comment = SearchComment(language="EN", lines=list())
-                comments = [comment]
-                # Note: The *Search* initializer appends the new *Search* object to the
-                # *children* list of *table*:
-                Search(name=all_search_name, comments=comments, table=table,
-                       parent_name="", url=parent_node.url, tracing="fetchMore:")
-
-            # Fix up and sort all of the *searches* in *table*:
-            table.fix_up(tracing=" ")
-        else:
-            sorted_file_names = sorted(os.listdir(parent_node.path))
-            for file_name_index, file_name in enumerate(sorted_file_names):
-                # print("File_Name[{0}]:'{1}'".format(file_name_index, file_name))
-                file_path = os.path.join(parent_node.path, file_name)
-                node = None
-                if file_path.endswith(".xml"):
-                    with open(file_path) as table_read_file:
-                        table_input_text = table_read_file.read()
-                        table_tree = etree.fromstring(table_input_text)
-                    table = Table(file_name=file_path, table_tree=table_tree)
-                    # print("table_input_text")
-                    # print(table_input_text)
-                    # print("table='{0}'".format(type(table)))
-                    # print("table.title='{0}'".format(table.title))
-                    # Fix make sure *table* is in *tables*:
-                    # tables.append(table)
-                    node = table
-                elif os.path.isdir(file_path):
-                    slash_index = file_path.rfind(file_path)
-                    if file_name[0] != '.' and (slash_index >= 0 and
-                                                file_path[slash_index+1:] != '.'):
-                        title = parent_node.file_name2title(file_name)
-                        # Note: Adding *parent_node* to Directory causes the top level of
-                        # the *Collection* object to be entered twice.  Very strange!!!
-                        node = Directory(file_name, file_path, title)
-                if node is not None:
-                    nodes.append(node)
-
-        # for node_index, node in enumerate(nodes):
-        #    print("Node[{0}]: name='{1}'".format(node_index, node.name))
-
-        tree_model.insertNodes(0, nodes, model_index)
-        if isinstance(parent_node, Table):
-            searches_table = table.searches_table
-            for node in nodes:
-                assert isinstance(node, Search)
-                node_name = node.name
-                assert node_name not in searches_table
-                searches_table[node_name] = node
-
-        parent_node.is_traversed = True
-        print("<=TreeModle.fetchMore()\n")
+                    search_trees.append(etree.fromstring(search_xml_text))
+        return search_trees
 
     # takes a model index and returns the related Python node
     # TreeModel.getNode():
@@ -5663,6 +9708,20 @@ class TreeModel(QAbstractItemModel):
         assert isinstance(parent_model_index, QModelIndex)
         return index
 
+    # TreeModel.catalog_get():
+    def catalog_get(self):
+        """ Return the *Catalog* for *tree_model* (i.e. *self*), opening it the first time, or
+            *None* if there is no catalog file.
+        """
+        # The catalog file is created by `--catalog-sync`, so keep checking until it shows up:
+        tree_model = self
+        catalog = tree_model.catalog
+        catalog_file_name = tree_model.catalog_file_name
+        if catalog is None and catalog_file_name is not None:
+            catalog = Catalog.existing_open(catalog_file_name)
+            tree_model.catalog = catalog
+        return catalog
+
     # TreeModel.children_update():
     def children_update(self, parent_model_index, tracing=None):
         # Verify argument types:
@@ -5691,6 +9750,35 @@ class TreeModel(QAbstractItemModel):
         if tracing is not None:
             print("{0}<=TreeModel.children_update(*,*)".format(tracing))
 
+    # TreeModel.children_reorder():
+    def children_reorder(self, node, children):
+        """ Change the order of the children of *node* to *children* (which holds the same
+            nodes) and move any persistent model indices along with their nodes.
+        """
+        # Verify argument types:
+        assert isinstance(node, Node)
+        assert isinstance(children, list)
+
+        # Nothing is announced when the order does not actually change:
+        tree_model = self
+        node_children = node.children
+        assert len(children) == len(node_children)
+        if all([child is node_child for child, node_child in zip(children, node_children)]):
+            return
+
+        # Warn the views before anything moves:
+        tree_model.layoutAboutToBeChanged.emit()
+        old_model_indices = tree_model.persistentIndexList()
+        index_nodes = [tree_model.getNode(old_model_index) for old_model_index in old_model_indices]
+        node_children[:] = children
+        node.children_renumber()
+        new_model_indices = list()
+        for old_model_index, index_node in zip(old_model_indices, index_nodes):
+            new_model_indices.append(tree_model.createIndex(index_node.row(),
+                                                            old_model_index.column(), index_node))
+        tree_model.changePersistentIndexList(old_model_indices, new_model_indices)
+        tree_model.layoutChanged.emit()
+
     # TreeModel.insertNodes():
     def insertNodes(self, position, nodes, parent_model_index=QModelIndex()):
         # Verify argument types:
@@ -5705,8 +9793,7 @@ class TreeModel(QAbstractItemModel):
 
         tree_model.beginInsertRows(parent_model_index, position, position + len(nodes) - 1)
 
-        for child in reversed(nodes):
-            node.insert_child(position, child)
+        node.children_insert(position, nodes)
 
         tree_model.endInsertRows()
 
@@ -5720,9 +9807,7 @@ class TreeModel(QAbstractItemModel):
         tree_model = self
         node = tree_model.getNode(model_index)
 
-        parent = node.parent
-        parent_model_index = (QModelIndex() if parent is tree_model.root_node else
-                              tree_model.createIndex(parent.row(), 0, parent))
+        parent_model_index = tree_model.model_index_get(node.parent)
         assert isinstance(model_index, QModelIndex)
         return parent_model_index
 
@@ -5735,42 +9820,822 @@ class TreeModel(QAbstractItemModel):
         node = tree_model.getNode(parent)
         return node.child_count()
 
+    # TreeModel.directory_update():
+    def directory_update(self, directory):
+        """ Bring the children of *directory* up to date with its directory.  Only the rows of
+            entries that were added, removed or (for tables) modified are touched.
+        """
+        # Verify argument types:
+        assert isinstance(directory, Directory)
+
+        # Grab the current *entries* of *directory*.  A directory that is gone is removed by
+        # the update of its parent directory:
+        tree_model = self
+        directory_snapshot = DirectorySnapshot.get(directory.path)
+        if directory_snapshot is None:
+            return
+        tree_model.snapshot_update_schedule()
+        entries = [(file_name, is_dir) for file_name, is_dir in directory_snapshot.entries
+                   if file_name.endswith(".xml") or (is_dir and not file_name.startswith('.'))]
+        entry_names = set([file_name for file_name, is_dir in entries])
+
+        def child_name_get(child):
+            return os.path.basename(child.file_name if isinstance(child, Table) else child.path)
+
+        # Remove the rows of entries that are gone (except for tables with unsaved changes):
+        children = directory.children
+        for row in range(len(children) - 1, -1, -1):
+            child = children[row]
+            is_unsaved = isinstance(child, Table) and child.is_dirty()
+            if child_name_get(child) not in entry_names and not is_unsaved:
+                tree_model.rows_remove(directory, row, 1)
+                tree_model.title_index = None
+
+        # The children of *directory* are in the same (sorted) order as *entries*, so new
+        # entries are inserted and modified tables are refreshed in a single merge pass:
+        table_cache = tree_model.table_cache
+        table_mtimes = tree_model.table_mtimes
+        row = 0
+        for file_name, is_dir in entries:
+            while row < len(children) and child_name_get(children[row]) not in entry_names:
+                row += 1
+            if row < len(children) and child_name_get(children[row]) == file_name:
+                child = children[row]
+                if isinstance(child, Table):
+                    tree_model.table_update(child, table_mtimes.get(child.file_name))
+                elif (isinstance(child, Directory) and child.is_traversed and
+                      len(child.children) == 0):
+                    # A directory restored from the snapshot as empty may have been filled
+                    # in since:
+                    child_snapshot = DirectorySnapshot.get(child.path)
+                    if child_snapshot is not None and len(child_snapshot.entries) >= 1:
+                        child.is_traversed = False
+            else:
+                node = directory.entry_node_create(file_name, is_dir, table_cache)
+                if node is None:
+                    continue
+                tree_model.insertNodes(row, [node], tree_model.model_index_get(directory))
+                tree_model.title_index = None
+                if isinstance(node, Table):
+                    tree_model.table_update(node, None)
+            row += 1
+
+    # TreeModel.searches_update():
+    def searches_update(self, table):
+        """ Bring the *Search* children of *table* up to date with its search files. """
+        # Verify argument types:
+        assert isinstance(table, Table)
+
+        # Figure out which of *searches* are gone.  A search with unsaved changes is kept, and
+        # so is the parent of any search that is kept:
+        tree_model = self
+        search_trees = TreeModel.search_trees_read(table.search_directory_get())
+        search_names = set([search_tree.get("name") for search_tree in search_trees])
+        searches = table.children
+        gone_searches = set([search for search in searches
+                             if search.name not in search_names and not search.is_dirty()])
+        kept_parents_found = True
+        while kept_parents_found:
+            kept_parents = set([search.search_parent for search in searches
+                                if search not in gone_searches]) & gone_searches
+            kept_parents_found = len(kept_parents) >= 1
+            gone_searches -= kept_parents
+
+        # Remove the gone searches and append the new ones:
+        for row in range(len(searches) - 1, -1, -1):
+            if searches[row] in gone_searches:
+                tree_model.rows_remove(table, row, 1)
+        old_names = set([search.name for search in searches])
+        new_search_trees = [search_tree for search_tree in search_trees
+                            if search_tree.get("name") not in old_names]
+        tree_model.searches_insert(table, new_search_trees)
+
+    # TreeModel.snapshot_load():
+    def snapshot_load(self, snapshot_file_name):
+        """ Load the children of the directories that were fetched when *snapshot_save*() wrote
+            *snapshot_file_name*.  *fetchMore*() uses them to fill in a directory without
+            reading the directory or any of its tables and then has *watch_update*() check
+            the directory against the file system.
+        """
+        # Verify argument types:
+        assert isinstance(snapshot_file_name, str)
+
+        # A missing or damaged snapshot is quietly ignored.  Either way, the snapshot is
+        # written back to *snapshot_file_name*:
+        tree_model = self
+        tree_model.snapshot_file_name = snapshot_file_name
+        try:
+            with open(snapshot_file_name) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            if snapshot.get("version") == TreeModel.SNAPSHOT_VERSION:
+                tree_model.snapshot_directories = snapshot["directories"]
+        except (OSError, ValueError):
+            pass
+
+    # TreeModel.snapshot_nodes_get():
+    def snapshot_nodes_get(self, directory):
+        """ Return the list of *Table* and *Directory* nodes that the snapshot recorded for
+            *directory*.  Each snapshot directory is only used once.
+        """
+        # Verify argument types:
+        assert isinstance(directory, Directory)
+
+        tree_model = self
+        table_cache = tree_model.table_cache
+        table_mtimes = tree_model.table_mtimes
+        nodes = list()
+        for child_row in tree_model.snapshot_directories.pop(directory.path):
+            if child_row[0] == 'D':
+                # The directory itself is not read until it is expanded:
+                type_letter, name, path, title, is_dir, is_traversed = child_row
+                nodes.append(Directory(name, path, title,
+                                       is_dir=is_dir, is_traversed=is_traversed))
+            else:
+                type_letter, file_name, name, title, url, csv_file_name, mtime_ns = child_row
+                # (A missing attribute is recorded as *None*, which *etree* rejects.):
+                header_tree = etree.Element("Table", name=name, csv_file_name=csv_file_name or "",
+                                            title=title or "", url=url or "")
+                nodes.append(Table(file_name=file_name, header_tree=header_tree,
+                                   table_cache=table_cache))
+                table_mtimes[file_name] = mtime_ns
+        return nodes
+
+    # TreeModel.snapshot_save():
+    def snapshot_save(self, snapshot_file_name):
+        """ Write the names, titles and paths of the children of every fetched directory in
+            *tree_model* (i.e. *self*) to *snapshot_file_name* for *snapshot_load*().
+        """
+        # Verify argument types:
+        assert isinstance(snapshot_file_name, str)
+
+        # The snapshot directories that were not needed this time are kept.  The rest are
+        # collected from every completely fetched directory in the tree:
+        tree_model = self
+        table_mtimes = tree_model.table_mtimes
+        fetching_nodes = set([id(tree_fetch.node) for tree_fetch in tree_model.fetches])
+        directories_table = dict(tree_model.snapshot_directories)
+        pending_nodes = list(tree_model.root_node.children)
+        while len(pending_nodes) >= 1:
+            directory = pending_nodes.pop()
+            if (not isinstance(directory, Directory) or not directory.is_traversed or
+                    id(directory) in fetching_nodes):
+                continue
+            child_rows = list()
+            for child in directory.children:
+                if isinstance(child, Directory):
+                    # Only an empty directory is recorded as traversed, since the children
+                    # of the others are fetched (or restored) again:
+                    is_traversed = child.is_traversed and len(child.children) == 0
+                    child_rows.append(('D', child.name, child.path, child.title,
+                                       child.is_dir, is_traversed))
+                    pending_nodes.append(child)
+                elif isinstance(child, Table):
+                    child_rows.append(('T', child.file_name, child.name, child.title, child.url,
+                                       child.csv_file_name, table_mtimes.get(child.file_name)))
+            directories_table[directory.path] = child_rows
+
+        # Write out *snapshot_file_name* (if it changed):
+        snapshot = {"version": TreeModel.SNAPSHOT_VERSION, "directories": directories_table}
+        os.makedirs(os.path.dirname(snapshot_file_name), exist_ok=True)
+        file_text_replace(snapshot_file_name, json.dumps(snapshot, separators=(",", ":")))
+
+    # TreeModel.snapshot_update():
+    def snapshot_update(self):
+        """ Write the tree snapshot back to the file that *snapshot_load*() read. """
+        tree_model = self
+        snapshot_file_name = tree_model.snapshot_file_name
+        if snapshot_file_name is not None:
+            try:
+                tree_model.snapshot_save(snapshot_file_name)
+            except OSError as error:
+                print("Unable to save '{0}': {1}".format(snapshot_file_name, error))
+
+    # TreeModel.snapshot_update_schedule():
+    def snapshot_update_schedule(self):
+        """ Have *snapshot_update*() run once the directory scans settle down. """
+        tree_model = self
+        if tree_model.snapshot_file_name is not None:
+            tree_model.snapshot_timer.start()
+
+    # TreeModel.table_update():
+    def table_update(self, table, old_mtime_ns):
+        """ Reread the `<Table>` attributes of *table* if its file has changed since it had
+            the modification time *old_mtime_ns* and update its row.
+        """
+        # Verify argument types:
+        assert isinstance(table, Table)
+        assert isinstance(old_mtime_ns, int) or old_mtime_ns is None
+
+        # A loaded *table* with unsaved changes is left alone, and the *comments* and
+        # *parameters* of a loaded *table* are kept since the editor may be showing them:
+        tree_model = self
+        file_name = table.file_name
+        try:
+            mtime_ns = os.stat(file_name).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        tree_model.table_mtimes[file_name] = mtime_ns
+        if old_mtime_ns is not None and mtime_ns != old_mtime_ns and not table.is_dirty():
+            # This runs from a timer, so a file that another program is still writing must not
+            # raise an exception into the event loop.  Instead, *table* is left alone and its
+            # old modification time is kept so that the next watcher event tries again.
+            # (*Table.header_tree_get*() asserts when the file stops before its `<Table>`):
+            try:
+                attributes_table = Table.header_tree_get(file_name).attrib
+                csv_file_name = attributes_table["csv_file_name"]
+                name = attributes_table["name"]
+                title = attributes_table["title"]
+                url = attributes_table["url"]
+            except (AssertionError, KeyError, OSError, etree.XMLSyntaxError):
+                tree_model.table_mtimes[file_name] = old_mtime_ns
+                return
+            table.csv_file_name = csv_file_name
+            table.name = name
+            table.title = title
+            table.url = url
+            tree_model.title_index = None
+            row = table.row()
+            tree_model.dataChanged.emit(tree_model.createIndex(row, 0, table),
+                                        tree_model.createIndex(row, 1, table))
+
+    # TreeModel.title_index_get():
+    def title_index_get(self):
+        """ Return the *TitleIndex* of every table and directory that *tree_model* (i.e. *self*)
+            knows of, whether or not it has been fetched yet.
+        """
+        # The *title_index* is built from the *catalog*, the tree snapshot and the nodes that
+        # are already in the tree (in that order, so that the most recent title wins):
+        tree_model = self
+        title_index = tree_model.title_index
+        if title_index is None:
+            root_node = tree_model.root_node
+            titles_table = dict()
+            catalog = tree_model.catalog_get()
+            if catalog is not None:
+                for path, title, is_table in catalog.titles_get():
+                    if not is_table:
+                        title = root_node.file_name2title(title)
+                    titles_table[path] = (title, is_table)
+            for child_rows in tree_model.snapshot_directories.values():
+                for child_row in child_rows:
+                    if child_row[0] == 'D':
+                        titles_table[child_row[2]] = (child_row[3], False)
+                    else:
+                        titles_table[child_row[1]] = (child_row[3], True)
+            pending_nodes = list(root_node.children)
+            for directory_snapshot, nodes in tree_model.prefetched_table.values():
+                pending_nodes.extend(nodes)
+            while len(pending_nodes) >= 1:
+                node = pending_nodes.pop()
+                if isinstance(node, Table):
+                    titles_table[node.file_name] = (node.title, True)
+                elif isinstance(node, Directory):
+                    titles_table[node.path] = (node.title_get(), False)
+                    pending_nodes.extend(node.children)
+            title_index = TitleIndex([(path, title, is_table)
+                                      for path, (title, is_table) in titles_table.items()])
+            tree_model.title_index = title_index
+        return title_index
+
+    # TreeModel.title_index_add():
+    def title_index_add(self, nodes):
+        """ Add the titles of the tables and directories in *nodes* to the *title_index* of
+            *tree_model* (i.e. *self*), so that a quick find also finds nodes that show up after
+            the index was built.
+        """
+        # Verify argument types:
+        assert isinstance(nodes, list)
+
+        # A *title_index* that has not been built yet will pick up *nodes* when it is:
+        tree_model = self
+        title_index = tree_model.title_index
+        if title_index is not None:
+            titles = list()
+            for node in nodes:
+                if isinstance(node, Table):
+                    titles.append((node.file_name, node.title, True))
+                elif isinstance(node, Directory):
+                    titles.append((node.path, node.title_get(), False))
+            title_index.titles_add(titles)
+
+    # TreeModel.user_activity_note():
+    def user_activity_note(self):
+        """ Note that the user just did something, which holds off prefetching for a while. """
+        tree_model = self
+        tree_model.user_active_time = time.monotonic()
+
+    # TreeModel.watch():
+    def watch(self, node):
+        """ Start watching the directory (or search files) behind the children of *node*. """
+        # Verify argument types:
+        assert isinstance(node, Node)
+
+        tree_model = self
+        if isinstance(node, Table):
+            search_directory = node.search_directory_get()
+            paths = [search_directory, search_directory + SearchStore.SUFFIX]
+        else:
+            # (The modification times of the tables restored by *snapshot_nodes_get*() are kept,
+            # so that *watch_update*() can tell which of them changed while the editor was not
+            # running.):
+            paths = [node.path]
+            table_mtimes = tree_model.table_mtimes
+            for child in node.children:
+                if isinstance(child, Table) and child.file_name not in table_mtimes:
+                    tree_model.table_update(child, None)
+        watched_nodes = tree_model.watched_nodes
+        watcher = tree_model.watcher
+        for path in paths:
+            if os.path.exists(path):
+                watched_nodes[path] = node
+                watcher.addPath(path)
+
+    # TreeModel.watch_changed():
+    def watch_changed(self, path):
+        """ Remember that *path* has changed and (re)start the *watch_timer*, so that a burst
+            of changes is handled all at once.
+        """
+        # Verify argument types:
+        assert isinstance(path, str)
+
+        tree_model = self
+        tree_model.watch_paths.add(path)
+        tree_model.watch_timer.start(TreeModel.WATCH_DELAY)
+
+    # TreeModel.watch_update():
+    def watch_update(self):
+        """ Update the nodes of the next few changed paths. """
+        tree_model = self
+        watch_paths = tree_model.watch_paths
+        watched_nodes = tree_model.watched_nodes
+        watcher = tree_model.watcher
+        for index in range(min(len(watch_paths), TreeModel.WATCH_BATCH_SIZE)):
+            path = watch_paths.pop()
+            node = watched_nodes.get(path)
+            if node is None:
+                continue
+
+            # Stop watching nodes that are no longer in the tree.  (Removing a node from its
+            # parent clears its parent, so a detached node is found by walking up to the root.):
+            root_node = node
+            while root_node.parent is not None:
+                root_node = root_node.parent
+            if root_node is not tree_model.root_node:
+                del watched_nodes[path]
+                watcher.removePath(path)
+                continue
+
+            # A file that was replaced (rather than rewritten) is no longer watched:
+            if os.path.exists(path) and path not in watcher.files() + watcher.directories():
+                watcher.addPath(path)
+            if isinstance(node, Table):
+                tree_model.searches_update(node)
+            else:
+                tree_model.directory_update(node)
+
+        # Come back soon for any paths that are left:
+        if len(watch_paths) >= 1:
+            tree_model.watch_timer.start(TreeModel.FETCH_INTERVAL)
+
+
+class TrigramIndex:
+    """ A *TrigramIndex* object is a memory mapped substring index over the string parameters
+    of every CSV file in a collection.
+
+    The index file is written once by *TrigramIndex.build*() and is laid out as follows:
+    * A fixed size header (see *HEADER*) containing section offsets and counts.
+    * A JSON encoded list of the tables that were indexed.
+    * A *DOCUMENT* record for each non-empty string value (table, row, column, value location.)
+    * A pool of UTF-8 encoded values.
+    * A sorted array of trigram *KEY*'s.
+    * A *POSTING* record (offset, count) for each trigram key.
+    * The postings themselves, which are sorted document indices.
+    """
+
+    # The trailing padding ensures that every character position in a value starts a trigram,
+    # which allows one and two character queries to be answered with a key prefix scan:
+    PADDING = "\x03\x03"
+
+    MAGIC = b"TTTRIGRM"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIIQQQQQQQ")
+    DOCUMENT = struct.Struct("<IIIII")
+    KEY = struct.Struct(">III")
+    POSTING = struct.Struct("<II")
+
+    # TrigramIndex.__init__():
+    def __init__(self, index_file_name):
+        # Verify argument types:
+        assert isinstance(index_file_name, str)
+
+        # Memory map *index_file_name* and make sure that it really is a trigram index file:
+        index_file = open(index_file_name, "rb")
+        index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, documents_count, keys_count, tables_offset, tables_size,
+         documents_offset, values_offset, keys_offset, postings_offset,
+         document_indices_offset) = TrigramIndex.HEADER.unpack_from(index_map, 0)
+        assert magic == TrigramIndex.MAGIC, "'{0}' is not a trigram index".format(index_file_name)
+        assert version == TrigramIndex.VERSION, (
+          "'{0}' has version {1} (not {2})".format(index_file_name, version, TrigramIndex.VERSION))
+
+        # The tables list is small, so it is decoded right away:
+        tables_json = index_map[tables_offset:tables_offset + tables_size].decode("utf-8")
+        tables = json.loads(tables_json)
+
+        # Load up *trigram_index* (i.e. *self*):
+        trigram_index = self
+        trigram_index.document_indices_offset = document_indices_offset
+        trigram_index.documents_count = documents_count
+        trigram_index.documents_offset = documents_offset
+        trigram_index.index_file = index_file
+        trigram_index.index_file_name = index_file_name
+        trigram_index.index_map = index_map
+        trigram_index.keys_count = keys_count
+        trigram_index.keys_offset = keys_offset
+        trigram_index.postings_offset = postings_offset
+        trigram_index.tables = tables
+        trigram_index.values_offset = values_offset
+
+    # TrigramIndex.build():
+    @staticmethod
+    def build(tables, csv_directory, index_file_name, tracing=None):
+        # Verify argument types:
+        assert isinstance(tables, list)
+        assert isinstance(csv_directory, str)
+        assert isinstance(index_file_name, str)
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        if tracing is not None:
+            print("{0}=>TrigramIndex.build(*, '{1}', '{2}')".
+                  format(tracing, csv_directory, index_file_name))
+
+        # Sweep through *tables* and create a *document* for each non-empty string value.
+        # Each trigram in a value gets the document index appended to its postings array:
+        tables_list = list()
+        documents = list()
+        values = bytearray()
+        postings_table = dict()
+        key_pack = TrigramIndex.KEY.pack
+        padding = TrigramIndex.PADDING
+        for table_index, table in enumerate(tables):
+            assert isinstance(table, Table)
+
+            # Only the `String` parameters that are bound to a CSV column are indexed:
+            columns = list()
+            for parameter in table.parameters:
+                if parameter.type.lower() == "string" and parameter.csv_index >= 0:
+                    columns.append((parameter.csv_index, parameter.name))
+            columns_table = {column_index: name for column_index, name in columns}
+            tables_list.append({"name": table.name, "file_name": table.file_name,
+                                "csv_file_name": table.csv_file_name, "columns": columns_table})
+
+            # Skip over any table whose CSV file is not available:
+            full_csv_file_name = os.path.join(csv_directory, table.csv_file_name)
+            if len(columns) == 0 or not os.path.isfile(full_csv_file_name):
+                continue
+
+            # Read the *rows* in and index each string value (the header row is skipped):
+            with open(full_csv_file_name, newline="") as csv_file:
+                csv_reader = csv.reader(csv_file, delimiter=',', quotechar='"')
+                for row_index, row in enumerate(csv_reader):
+                    if row_index == 0:
+                        continue
+                    row_size = len(row)
+                    for column_index, parameter_name in columns:
+                        value = row[column_index] if column_index < row_size else ""
+                        if value == "":
+                            continue
+
+                        # Append a new *document* and stuff the *value* into the *values* pool:
+                        document_index = len(documents)
+                        encoded_value = value.encode("utf-8")
+                        documents.append((table_index, row_index - 1, column_index,
+                                          len(values), len(encoded_value)))
+                        values += encoded_value
+
+                        # Now append *document_index* to the postings of each unique trigram:
+                        padded_value = value.lower() + padding
+                        trigrams = {padded_value[index:index + 3]
+                                    for index in range(len(padded_value) - 2)}
+                        for trigram in trigrams:
+                            key = key_pack(ord(trigram[0]), ord(trigram[1]), ord(trigram[2]))
+                            document_indices = postings_table.get(key)
+                            if document_indices is None:
+                                document_indices = array('I')
+                                postings_table[key] = document_indices
+                            document_indices.append(document_index)
+
+        # Lay out each of the sections; postings are aligned so that they can be cast in place:
+        tables_bytes = json.dumps(tables_list).encode("utf-8")
+        keys = sorted(postings_table.keys())
+        header_size = TrigramIndex.HEADER.size
+        tables_offset = header_size
+        documents_offset = tables_offset + len(tables_bytes)
+        values_offset = documents_offset + len(documents) * TrigramIndex.DOCUMENT.size
+        keys_offset = values_offset + len(values)
+        postings_offset = keys_offset + len(keys) * TrigramIndex.KEY.size
+        document_indices_offset = postings_offset + len(keys) * TrigramIndex.POSTING.size
+        alignment_padding = (-document_indices_offset) % 8
+        document_indices_offset += alignment_padding
+
+        # Write everything out to a temporary file and then atomically rename it into place
+        # so that concurrent readers never see a partially written index:
+        temporary_file_name = index_file_name + ".tmp"
+        with open(temporary_file_name, "wb") as index_file:
+            index_file.write(TrigramIndex.HEADER.pack(
+              TrigramIndex.MAGIC, TrigramIndex.VERSION, len(documents), len(keys),
+              tables_offset, len(tables_bytes), documents_offset, values_offset, keys_offset,
+              postings_offset, document_indices_offset))
+            index_file.write(tables_bytes)
+            document_pack = TrigramIndex.DOCUMENT.pack
+            for document in documents:
+                index_file.write(document_pack(*document))
+            index_file.write(values)
+            for key in keys:
+                index_file.write(key)
+            posting_pack = TrigramIndex.POSTING.pack
+            postings_count = 0
+            for key in keys:
+                document_indices_size = len(postings_table[key])
+                index_file.write(posting_pack(postings_count, document_indices_size))
+                postings_count += document_indices_size
+            index_file.write(bytes(alignment_padding))
+            for key in keys:
+                postings_table[key].tofile(index_file)
+        os.replace(temporary_file_name, index_file_name)
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TrigramIndex.build(*, '{1}', '{2}')=>{3} documents, {4} trigrams".
+                  format(tracing, csv_directory, index_file_name, len(documents), len(keys)))
+
+    # TrigramIndex.close():
+    def close(self):
+        # Release the memory map and the underlying file:
+        trigram_index = self
+        trigram_index.index_map.close()
+        trigram_index.index_file.close()
+
+    # TrigramIndex.document_get():
+    def document_get(self, document_index):
+        # Verify argument types:
+        assert isinstance(document_index, int)
+
+        # Unpack the *document* record and decode its *value* from the values pool:
+        trigram_index = self
+        index_map = trigram_index.index_map
+        document_offset = (trigram_index.documents_offset +
+                           document_index * TrigramIndex.DOCUMENT.size)
+        table_index, row_index, column_index, value_offset, value_size = (
+          TrigramIndex.DOCUMENT.unpack_from(index_map, document_offset))
+        value_start = trigram_index.values_offset + value_offset
+        value = index_map[value_start:value_start + value_size].decode("utf-8")
+        return table_index, row_index, column_index, value
+
+    # TrigramIndex.key_find():
+    def key_find(self, key):
+        # Verify argument types:
+        assert isinstance(key, bytes)
+
+        # Binary search the sorted trigram keys for the first one that is >= *key*:
+        trigram_index = self
+        index_map = trigram_index.index_map
+        keys_offset = trigram_index.keys_offset
+        key_size = TrigramIndex.KEY.size
+        low = 0
+        high = trigram_index.keys_count
+        while low < high:
+            middle = (low + high) // 2
+            middle_offset = keys_offset + middle * key_size
+            if index_map[middle_offset:middle_offset + key_size] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # TrigramIndex.postings_get():
+    def postings_get(self, key_index):
+        # Verify argument types:
+        assert isinstance(key_index, int)
+
+        # Return the document indices for *key_index* as a zero copy view into the memory map:
+        trigram_index = self
+        posting_offset = trigram_index.postings_offset + key_index * TrigramIndex.POSTING.size
+        first, count = TrigramIndex.POSTING.unpack_from(trigram_index.index_map, posting_offset)
+        start = trigram_index.document_indices_offset + first * 4
+        with memoryview(trigram_index.index_map) as index_view:
+            document_indices = index_view[start:start + count * 4].cast('I').tolist()
+        return document_indices
+
+    # TrigramIndex.search():
+    def search(self, text, limit=25, tracing=None):
+        # Verify argument types:
+        assert isinstance(text, str)
+        assert isinstance(limit, int) and limit > 0
+        assert isinstance(tracing, str) or tracing is None
+
+        # Perform any requested *tracing*:
+        if tracing is not None:
+            print("{0}=>TrigramIndex.search('{1}', {2})".format(tracing, text, limit))
+
+        # Grab some values from *trigram_index* (i.e. *self*):
+        trigram_index = self
+        keys_count = trigram_index.keys_count
+        key_pack = TrigramIndex.KEY.pack
+        key_size = TrigramIndex.KEY.size
+        index_map = trigram_index.index_map
+        keys_offset = trigram_index.keys_offset
+        query = text.lower()
+        query_size = len(query)
+
+        # Collect a *postings_list* of document index lists; a document must be in all of them
+        # to be a candidate:
+        postings_list = list()
+        if query_size >= 3:
+            # Every trigram of *query* must be present, so any missing trigram means no matches:
+            for index in range(query_size - 2):
+                key = key_pack(ord(query[index]), ord(query[index + 1]), ord(query[index + 2]))
+                key_index = trigram_index.key_find(key)
+                key_offset = keys_offset + key_index * key_size
+                if (key_index >= keys_count or
+                   index_map[key_offset:key_offset + key_size] != key):
+                    postings_list = list()
+                    break
+                postings_list.append(trigram_index.postings_get(key_index))
+        elif query_size >= 1:
+            # Short queries are answered by merging every trigram that starts with *query*:
+            code_points = [ord(character) for character in query] + [0, 0]
+            low_key = key_pack(code_points[0], code_points[1], 0)
+            if query_size == 1:
+                high_key = key_pack(code_points[0] + 1, 0, 0)
+            else:
+                high_key = key_pack(code_points[0], code_points[1] + 1, 0)
+            document_indices = set()
+            for key_index in range(trigram_index.key_find(low_key),
+                                   trigram_index.key_find(high_key)):
+                document_indices.update(trigram_index.postings_get(key_index))
+            postings_list.append(sorted(document_indices))
+
+        # Intersect the postings starting with the shortest one:
+        candidates = set()
+        if len(postings_list) >= 1:
+            postings_list.sort(key=len)
+            candidates = set(postings_list[0])
+            for document_indices in postings_list[1:]:
+                if len(candidates) == 0:
+                    break
+                candidates.intersection_update(document_indices)
+
+        # Verify each candidate (trigrams can match out of order) and rank the survivors so that
+        # exact matches come first, followed by prefix matches, followed by shorter values.
+        # Very short queries can match most of the catalog, so rather than sorting every match,
+        # only the best *limit* of them are kept in a bounded heap:
+        tables = trigram_index.tables
+        matches_count = 0
+
+        def ranked_matches_generate():
+            nonlocal matches_count
+            for document_index in candidates:
+                table_index, row_index, column_index, value = (
+                  trigram_index.document_get(document_index))
+                lower_value = value.lower()
+                position = lower_value.find(query)
+                if position >= 0:
+                    matches_count += 1
+                    rank = 0 if lower_value == query else (1 if position == 0 else 2)
+                    yield (rank, len(value), document_index,
+                           table_index, row_index, column_index, value)
+
+        ranked_matches = heapq.nsmallest(limit, ranked_matches_generate())
+
+        # Convert the best *ranked_matches* into (*table_file_name*, *row_index*,
+        # *parameter_name*, *value*) tuples:
+        matches = list()
+        for ranked_match in ranked_matches:
+            table_index, row_index, column_index, value = ranked_match[3:]
+            table_information = tables[table_index]
+            parameter_name = table_information["columns"][str(column_index)]
+            matches.append((table_information["file_name"], row_index, parameter_name, value))
+
+        # Wrap up any requested *tracing*:
+        if tracing is not None:
+            print("{0}<=TrigramIndex.search('{1}', {2})=>{3} of {4} matches".
+                  format(tracing, text, limit, len(matches), matches_count))
+        return matches
+
 
 class Units:
+
+    # *BASE_UNITS*, *DERIVED_UNITS*, and *PREFIXES* are shared by the regular expression used
+    # for column type detection and by the magnitude parser:
+    BASE_UNITS = (
+      "s(ecs?)?", "seconds?", "m(eters?)?", "g(rams?)?", "[Aa](mps?)?", "[Kk](elvin)?",
+      "mol(es?)?", "cd", "candelas?")
+    DERIVED_UNITS = ("rad", "sr", "[Hh]z", "[Hh]ertz", "[Nn](ewtons?)?", "Pa(scals?)?",
+                     "J(oules?)?", "W(atts?)?", "°C", "V(olts?)?", "F(arads?)?", "Ω",
+                     "O(hms?)?", "S", "Wb", "T(eslas?)?", "H", "degC", "lm", "lx", "Bq",
+                     "Gy", "Sv", "kat")
+    PREFIXES = (
+      ("Y", 1e24),
+      ("Z", 1e21),
+      ("E", 1e18),
+      ("P", 1e15),
+      ("T", 1e12),
+      ("G", 1e9),
+      ("M", 1e6),
+      ("k", 1e3),
+      ("h", 1e2),
+      ("da", 1e1),
+      ("c", 1e-2),
+      ("u", 1e-6),
+      ("n", 1e-9),
+      ("p", 1e-12),
+      ("f", 1e-15),
+      ("a", 1e-18),
+      ("z", 1e-21),
+      ("y", 1e-24)
+    )
+
+    # The magnitude parser also accepts milli, the micro sign, and the common upper case kilo
+    # (e.g. "4.7KOhm") which are not part of the column type detection regular expression:
+    MAGNITUDE_PREFIXES = PREFIXES + (("m", 1e-3), ("µ", 1e-6), ("K", 1e3))
+
+    # *MAGNITUDE_RES* is filled in by the first call to *Units.magnitude_get*():
+    MAGNITUDE_RES = None
+
     def __init__(self):
         pass
 
+    # Units.magnitude_get():
+    @staticmethod
+    def magnitude_get(text):
+        """ Return the magnitude of *text* as a *float* (e.g. "4.7 kOhms" => 4700.0,
+            "1/10W" => 0.1, "100mA" => 0.1, "10k" => 10000.0), or *None* if *text* does not
+            start with a number.
+        """
+        # Verify argument types:
+        assert isinstance(text, str)
+
+        # Compile the regular expressions the first time through:
+        magnitude_res = Units.MAGNITUDE_RES
+        if magnitude_res is None:
+            number_re = re.compile("[ \t]*([-+±]?)[ \t]*"
+                                   "(([0-9]+)/([0-9]+)|"
+                                   "([0-9]+\\.?[0-9]*|\\.[0-9]+)([eE][-+]?[0-9]+)?)"
+                                   "[ \t]*")
+            units_re_text = "(" + "|".join(Units.BASE_UNITS + Units.DERIVED_UNITS) + ")"
+            prefixes = Units.MAGNITUDE_PREFIXES
+            prefixes_re_text = "(" + "|".join([prefix for prefix, multiplier in prefixes]) + ")"
+            unit_re = re.compile(units_re_text + "(?![A-Za-z])")
+            prefixed_unit_re = re.compile(prefixes_re_text + units_re_text + "(?![A-Za-z])")
+            multipliers_table = {prefix: multiplier for prefix, multiplier in prefixes}
+            prefix_re = re.compile(prefixes_re_text + "(?![A-Za-z])")
+            magnitude_res = (number_re, unit_re, prefixed_unit_re, prefix_re, multipliers_table)
+            Units.MAGNITUDE_RES = magnitude_res
+        number_re, unit_re, prefixed_unit_re, prefix_re, multipliers_table = magnitude_res
+
+        # Extract the leading *magnitude* (if any):
+        magnitude = None
+        number_match = number_re.match(text)
+        if number_match is not None:
+            sign, number_text, numerator, denominator = number_match.group(1, 2, 3, 4)
+            if numerator is not None:
+                denominator_value = float(denominator)
+                magnitude = (float(numerator) / denominator_value
+                             if denominator_value != 0.0 else None)
+            else:
+                magnitude = float(number_text)
+
+            # An unprefixed unit is tried first so that "Pa" is Pascals rather than peta-amps
+            # and "mA" is milli-amps rather than meters followed by junk.  A prefix with no
+            # unit is a plain multiplier (e.g. "10k", "1M", "100p"), where a lone "k" or "K" is
+            # taken to be kilo rather than Kelvin:
+            if magnitude is not None:
+                rest = text[number_match.end():]
+                prefix_match = prefix_re.match(rest)
+                unit_match = unit_re.match(rest)
+                if prefix_match is not None and (unit_match is None or
+                                                 prefix_match.group(1) in ('k', 'K')):
+                    magnitude *= multipliers_table[prefix_match.group(1)]
+                elif unit_match is None:
+                    prefixed_unit_match = prefixed_unit_re.match(rest)
+                    if prefixed_unit_match is not None:
+                        magnitude *= multipliers_table[prefixed_unit_match.group(1)]
+                if sign == '-':
+                    magnitude = -magnitude
+
+                # Round off the binary noise from scaling (e.g. "100n" versus ".1u") so that
+                # equal magnitudes compare equal:
+                magnitude = float("{0:.12g}".format(magnitude))
+        return magnitude
+
+    # Units.si_units_re_text_get():
     @staticmethod
     def si_units_re_text_get():
-        base_units = (
-          "s(ecs?)?", "seconds?", "m(eters?)?", "g(rams?)?", "[Aa](mps?)?", "[Kk](elvin)?",
-          "mol(es?)?", "cd", "candelas?")
-        derived_units = ("rad", "sr", "[Hh]z", "[Hh]ertz", "[Nn](ewtons?)?", "Pa(scals?)?",
-                         "J(oules?)?", "W(atts?)?", "°C", "V(olts?)?", "F(arads?)?", "Ω",
-                         "O(hms?)?", "S", "Wb", "T(eslas?)?", "H", "degC", "lm", "lx", "Bq",
-                         "Gy", "Sv", "kat")
-        all_units = base_units + derived_units
+        all_units = Units.BASE_UNITS + Units.DERIVED_UNITS
         all_units_re_text = "(" + "|".join(all_units) + ")"
-        prefixes = (
-          ("Y", 1e24),
-          ("Z", 1e21),
-          ("E", 1e18),
-          ("P", 1e15),
-          ("T", 1e12),
-          ("G", 1e9),
-          ("M", 1e6),
-          ("k", 1e3),
-          ("h", 1e2),
-          ("da", 1e1),
-          ("c", 1e-2),
-          ("u", 1e-6),
-          ("n", 1e-9),
-          ("p", 1e-12),
-          ("f", 1e-15),
-          ("a", 1e-18),
-          ("z", 1e-21),
-          ("y", 1e-24)
-        )
+        prefixes = Units.PREFIXES
         single_letter_prefixes = [prefix[0] for prefix in prefixes if len(prefix[0]) == 1]
         single_letter_re_text = "[" + "".join(single_letter_prefixes) + "]"
         multi_letter_prefixes = [prefix[0] for prefix in prefixes if len(prefix[0]) >= 2]
@@ -5782,6 +10647,84 @@ class Units:
         return si_units_re_text
 
 
+class XMLWriter:
+    """ An *XMLWriter* object incrementally writes indented XML elements to an output file.
+    All attribute and text escaping is done here and nowhere else.
+    """
+
+    # XMLWriter.__init__():
+    def __init__(self, output_file):
+        # Load up *xml_writer* (i.e. *self*).  *output_file* is anything with a *write* method:
+        xml_writer = self
+        xml_writer.output_file = output_file
+        xml_writer.write = output_file.write
+
+    # XMLWriter.attribute_escape():
+    @staticmethod
+    def attribute_escape(value):
+        # Convert *value* to text and escape the characters that can not occur as is in a
+        # double quoted attribute value:
+        text = str(value)
+        if '&' in text:
+            text = text.replace('&', "&amp;")
+        if '<' in text:
+            text = text.replace('<', "&lt;")
+        if '>' in text:
+            text = text.replace('>', "&gt;")
+        if '"' in text:
+            text = text.replace('"', "&quot;")
+        return text
+
+    # XMLWriter.attributes_text_get():
+    @staticmethod
+    def attributes_text_get(attributes):
+        # Verify argument types:
+        assert isinstance(attributes, tuple)
+
+        # Format each (*name*, *value*) pair in *attributes* skipping *None* values:
+        attribute_escape = XMLWriter.attribute_escape
+        return "".join([' {0}="{1}"'.format(name, attribute_escape(value))
+                        for name, value in attributes if value is not None])
+
+    # XMLWriter.element_empty():
+    def element_empty(self, indent, tag, attributes=()):
+        # Write out `<TAG ATTRIBUTES.../>`:
+        xml_writer = self
+        xml_writer.write("{0}<{1}{2}/>\n".format(
+          indent, tag, XMLWriter.attributes_text_get(attributes)))
+
+    # XMLWriter.element_end():
+    def element_end(self, indent, tag):
+        # Write out `</TAG>`:
+        xml_writer = self
+        xml_writer.write("{0}</{1}>\n".format(indent, tag))
+
+    # XMLWriter.element_start():
+    def element_start(self, indent, tag, attributes=(), tail=""):
+        # Write out `<TAG ATTRIBUTES...TAIL>`.  *tail* is only needed to reproduce the historical
+        # spacing of the `<Table ...>` element:
+        xml_writer = self
+        xml_writer.write("{0}<{1}{2}{3}>\n".format(
+          indent, tag, XMLWriter.attributes_text_get(attributes), tail))
+
+    # XMLWriter.header_write():
+    def header_write(self):
+        xml_writer = self
+        xml_writer.write('<?xml version="1.0"?>\n')
+
+    # XMLWriter.text_line():
+    def text_line(self, indent, text):
+        # Write out one line of element content:
+        xml_writer = self
+        if '&' in text:
+            text = text.replace('&', "&amp;")
+        if '<' in text:
+            text = text.replace('<', "&lt;")
+        if '>' in text:
+            text = text.replace('>', "&gt;")
+        xml_writer.write("{0}{1}\n".format(indent, text))
+
+
 # class XXXAttribute:
 #    def __init__(self, name, type, default, optional, documentations, enumerates):
 #        # Verify argument types:
@@ -6130,32 +11073,100 @@ def main():
     # Deal with command line *arguments*:
     arguments = sys.argv[1:]
     # print("arguments=", arguments)
-    if True:
-        # Read in each *table_file_name* in *arguments* and append result to *tables*:
-        tables = list()
-        for table_file_name in arguments:
-            # Verify that *table_file_name* exists and has a `.xml` suffix:
-            assert os.path.isfile(table_file_name), "'{0}' does not exist".format(table_file_name)
-            assert table_file_name.endswith(".xml"), (
-              "'{0}' does not have a .xml suffix".format(table_file_name))
-
-            # Read in *table_file_name* as a *table* and append to *tables* list:
-            with open(table_file_name) as table_read_file:
-                table_input_text = table_read_file.read()
-            table_tree = etree.fromstring(table_input_text)
-            table = Table(file_name=table_file_name, table_tree=table_tree, csv_file_name="")
-            tables.append(table)
-
+    if len(arguments) >= 1 and arguments[0] == "--find":
+        # Look up each text fragment in the catalog wide *trigram_index* and print the matches:
+        trigram_index = TrigramIndex(TablesEditor.trigram_index_file_name_get())
+        for fragment in arguments[1:]:
+            matches = trigram_index.search(fragment)
+            for table_file_name, row_index, parameter_name, value in matches:
+                print("{0}[{1}]:{2}='{3}'".
+                      format(table_file_name, row_index, parameter_name, value))
+        trigram_index.close()
+    elif len(arguments) >= 4 and arguments[0] == "--query":
+        # Run a query against a table and its CSV file without the GUI:
+        table_file_name, csv_file_name = arguments[1:3]
+        table_tree = etree.parse(table_file_name).getroot()
+        table = Table(file_name=table_file_name, table_tree=table_tree, csv_file_name="")
+        with open(csv_file_name, newline="") as csv_file:
+            rows = list(csv.reader(csv_file, delimiter=',', quotechar='"'))
+        query_indexes = QueryIndexes(rows)
+        query = Query(text=" ".join(arguments[3:]), table=table)
+        for line in query.explain(query_indexes):
+            print(line)
+        for row_id in QueryIndexes.bitmap2row_ids(query.execute(query_indexes)):
+            print("[{0}]:{1}".format(row_id, ",".join(rows[row_id])))
+    elif len(arguments) == 1 and arguments[0] == "--catalog-sync":
+        # Bring the catalog up to date with the tables and searches on disk:
+        catalog = Catalog(TablesEditor.catalog_file_name_get())
+        catalog.directory_sync("/home/wayne/public_html/projects/digikey_tables", tracing="")
+        catalog.searches_sync(TablesEditor.search_root_directory_get(), tracing="")
+        catalog.close()
+    elif len(arguments) >= 2 and arguments[0] == "--catalog-find":
+        # List every table that has each of the parameter names in *arguments*:
+        catalog = Catalog(TablesEditor.catalog_file_name_get())
+        for parameter_name in arguments[1:]:
+            for table_file_name, table_name in catalog.parameter_tables_find(parameter_name):
+                print("{0}:{1}:{2}".format(parameter_name, table_name, table_file_name))
+        catalog.close()
+    elif len(arguments) == 1 and arguments[0] in ("--searches-pack", "--searches-unpack"):
+        # Convert every search directory below the search root into a single *SearchStore*
+        # file (or back again).  The old layout is only removed once the new one is written:
+        is_pack = arguments[0] == "--searches-pack"
+        search_root_directory = TablesEditor.search_root_directory_get()
+        for directory_path, sub_directory_names, base_names in os.walk(search_root_directory):
+            if is_pack and any([base_name.endswith(".xml") for base_name in base_names]):
+                search_store = SearchStore(directory_path + SearchStore.SUFFIX)
+                search_file_names = search_store.directory_import(directory_path)
+                for search_file_name in search_file_names:
+                    os.remove(search_file_name)
+                print("{0}: {1} searches packed".format(directory_path, len(search_file_names)))
+            elif not is_pack:
+                for base_name in base_names:
+                    if base_name.endswith(SearchStore.SUFFIX):
+                        search_store_file_name = os.path.join(directory_path, base_name)
+                        search_store = SearchStore(search_store_file_name)
+                        search_directory = search_store_file_name[:-len(SearchStore.SUFFIX)]
+                        search_count = search_store.directory_export(search_directory)
+                        os.remove(search_store_file_name)
+                        print("{0}: {1} searches unpacked".format(search_directory, search_count))
+    elif len(arguments) >= 1 and arguments[0] == "--validate":
+        # Check every table and search file below the given directories (or the usual ones)
+        # against the schema that sits next to this program:
+        directories = arguments[1:]
+        if len(directories) == 0:
+            directories = ["/home/wayne/public_html/projects/digikey_tables",
+                           TablesEditor.search_root_directory_get()]
+        schema_file_name = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        "tables_editor.xsd")
+        schema_validator = SchemaValidator(schema_file_name,
+                                           TablesEditor.validation_cache_file_name_get())
+        errors = schema_validator.directories_validate(directories, tracing="")
+        for error in errors:
+            print(error)
+        if len(errors) >= 1:
+            return 1
+    elif len(arguments) >= 1 and arguments[0] == "--purge-cache":
+        # Empty out the materialized search results cache:
+        results_cache = ResultsCache(TablesEditor.results_cache_directory_get())
+        removed_count = results_cache.purge()
+        print("{0} cached search results removed".format(removed_count))
+    else:
+        # `--debug` asks for a copy of each table to be written into the `/tmp` directory:
+        debug = "--debug" in arguments
+        table_file_names = [argument for argument in arguments if argument != "--debug"]
+
+        # Read in each *table_file_name* in *table_file_names* (in parallel) into *tables*:
+        tables = Table.files_load(table_file_names)
+        for table in tables:
             # ui_text = table.to_ui_string()
             # with open("/tmp/test.ui", "w") as ui_file:
             #    ui_file.write(ui_text)
 
             # For debugging only, write *table* out to the `/tmp` directory:
-            debug = False
-            debug = True
             if debug:
                 table_write_text = table.to_xml_string()
-                with open("/tmp/" + table_file_name, "w") as table_write_file:
+                with open(os.path.join("/tmp", os.path.basename(table.file_name)),
+                          "w") as table_write_file:
                     table_write_file.write(table_write_text)
 
         # Now create the *tables_editor* graphical user interface (GUI) and run it:
@@ -6201,7 +11212,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 # https://stackoverflow.com/questions/5226091/checkboxes-in-a-combobox-using-pyqt?rq=1
 # https://stackoverflow.com/questions/24961383/how-to-see-the-value-of-pyside-qtcore-qt-itemflag